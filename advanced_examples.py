@@ -6,6 +6,10 @@
 """
 
 from casper_checker import CasperChecker, CarModel
+from special_checker import SpecialChecker, SpecialCarModel
+from inventory_frame import InventoryFrame
+from top_k import TopK
+from request_payload import build_params
 
 
 def example_1_all_models():
@@ -39,9 +43,9 @@ def example_2_specific_model():
         cars = checker.get_car_list(CarModel.CASPER_ELECTRIC_2026)
         for i, car in enumerate(cars[:3], 1):
             print(f"\n[{i}]")
-            print(f"  트림: {car['carTrimName']}")
-            print(f"  색상: {car['exteriorColorName']}")
-            print(f"  가격: {int(car['finalAmount']):,}원")
+            print(f"  트림: {car.trim}")
+            print(f"  색상: {car.color}")
+            print(f"  가격: {car.price:,}원")
 
 
 def example_3_compare_models():
@@ -75,27 +79,10 @@ def example_4_color_filter():
     checker = CasperChecker()
     
     # 커스텀 파라미터로 색상 필터링
-    params = {
-        "carCode": "AX05",  # 2026 캐스퍼 일렉트릭
-        "subsidyRegion": "2800",
-        "exhbNo": "R0003",
-        "sortCode": "10",
-        "deliveryAreaCode": "J",
-        "deliveryLocalAreaCode": "J1",
-        "carBodyCode": "",
-        "carEngineCode": "",
-        "carTrimCode": "",
-        "exteriorColorCode": "SAW",  # 아틀라스 화이트
-        "interiorColorCode": [],
-        "deliveryCenterCode": "",
-        "wpaScnCd": "",
-        "optionFilter": "",
-        "minSalePrice": "35877000",
-        "maxSalePrice": "37306000",
-        "choiceOptYn": "Y",
-        "pageNo": 1,
-        "pageSize": 18
-    }
+    params = build_params(
+        "R0003", CarModel.CASPER_ELECTRIC_2026,
+        exteriorColorCode="SAW"  # 아틀라스 화이트
+    )
     
     count = checker.get_car_count(custom_params=params)
     print(f"\n아틀라스 화이트 2026 캐스퍼 일렉트릭: {count}대")
@@ -113,41 +100,41 @@ def example_5_price_comparison():
     print("-" * 60)
     
     for model in CarModel:
-        cars = checker.get_car_list(model)
-        if cars:
-            min_price = min(int(car['finalAmount']) for car in cars)
-            print(f"{model.value['name']:<25} {len(cars):<10} {min_price:>12,}원")
+        frame = InventoryFrame.from_cars(checker.get_car_list(model))
+        min_price = frame.min("price")
+        if min_price is not None:
+            print(f"{model.value['name']:<25} {len(frame):<10} {min_price:>12,}원")
         else:
             print(f"{model.value['name']:<25} {'0':<10} {'재고없음':<15}")
 
 
 def example_6_best_discount():
-    """예제 6: 전체 모델 중 최대 할인 차량"""
+    """예제 6: 전체 기획전 중 최대 할인 차량"""
     print("\n" + "="*60)
     print("예제 6: 전체 중 최대 할인 차량 찾기")
     print("="*60)
     
     checker = CasperChecker()
+    special = SpecialChecker()
     
-    all_cars = []
+    # 모든 차량을 모으지 않고 페이지 단위로 흘려보내며 상위 3대만 유지
+    best = TopK(3, key="discount_rate")
     for model in CarModel:
-        cars = checker.get_car_list(model)
-        all_cars.extend(cars)
+        best.extend(checker.iter_cars(model), tag="리퍼브")
+    for model in SpecialCarModel:
+        best.extend(special.iter_cars(model), tag="특별기획전")
     
-    if not all_cars:
+    if not len(best):
         print("\n현재 재고가 없습니다.")
         return
     
-    # 할인율 기준 정렬
-    all_cars.sort(key=lambda x: float(x['discountRate']), reverse=True)
-    
-    print("\n🏆 TOP 3 할인 차량:")
-    for i, car in enumerate(all_cars[:3], 1):
-        print(f"\n[{i}위]")
-        print(f"  모델: {car['carName']}")
-        print(f"  색상: {car['exteriorColorName']}")
-        print(f"  할인: {int(car['discountPrice']):,}원 ({car['discountRate']}%)")
-        print(f"  최종: {int(car['finalAmount']):,}원")
+    print(f"\n🏆 TOP 3 할인 차량 (전체 {best.seen}대 중):")
+    for i, (car, exhibition) in enumerate(best.entries(), 1):
+        print(f"\n[{i}위] {exhibition}")
+        print(f"  모델: {car.car_name}")
+        print(f"  색상: {car.color}")
+        print(f"  할인: {car.discount or 0:,}원 ({car.discount_rate}%)")
+        print(f"  최종: {car.price or 0:,}원")
 
 
 def example_7_delivery_center():
@@ -158,27 +145,21 @@ def example_7_delivery_center():
     
     checker = CasperChecker()
     
-    all_cars = []
+    frame = InventoryFrame()
     for model in CarModel:
-        cars = checker.get_car_list(model)
-        all_cars.extend(cars)
+        frame.extend(checker.get_car_list(model))
     
-    if not all_cars:
+    if not len(frame):
         print("\n현재 재고가 없습니다.")
         return
     
     # 출고센터별 그룹화
-    centers = {}
-    for car in all_cars:
-        center = car['deliveryCenterName']
-        if center not in centers:
-            centers[center] = []
-        centers[center].append(car)
+    centers = frame.counts("center")
     
     print(f"\n{'출고센터':<15} {'재고':<10}")
     print("-" * 30)
-    for center, cars in sorted(centers.items()):
-        print(f"{center:<15} {len(cars):<10}")
+    for center, count in sorted(centers.items(), key=lambda x: x[0] or ""):
+        print(f"{center or '-':<15} {count:<10}")
 
 
 def main():
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+차량 레코드
+
+API 응답의 차량 정보(dict)를 받자마자 한 번만 변환해 두는 가벼운 레코드입니다.
+
+- 가격/할인 금액은 int, 할인율은 float 으로 미리 파싱
+- 생산일(prdnDt)은 date 로 파싱
+- 색상/트림/출고센터 같은 반복되는 문자열은 intern 하여 공유
+- __slots__ 사용으로 차량당 메모리 절약
+
+기존 코드와의 호환을 위해 car['finalAmount'], car.get('deliveryCenterName')
+처럼 API 키로도 읽을 수 있습니다. (가격 필드는 숫자로 반환)
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import date
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+
+# API 키 → 속성 이름 (문자열, intern 대상)
+CATEGORICAL_FIELDS = {
+    "carCode": "car_code",
+    "carName": "car_name",
+    "carTrimName": "trim",
+    "exteriorColorCode": "color_code",
+    "exteriorColorName": "color",
+    "interiorColorName": "interior",
+    "deliveryCenterCode": "center_code",
+    "deliveryCenterName": "center",
+}
+
+# API 키 → 속성 이름 (정수 금액)
+AMOUNT_FIELDS = {
+    "carPrice": "car_price",
+    "finalAmount": "price",
+    "discountPrice": "discount",
+}
+
+_FIELDS = dict(
+    CATEGORICAL_FIELDS,
+    carProductionNumber="car_production_number",
+    discountRate="discount_rate",
+    prdnDt="prdn_dt",
+    **AMOUNT_FIELDS
+)
+
+
+def parse_amount(value: Any) -> Optional[int]:
+    """금액 문자열을 정수로 변환합니다. ("36000000.0" → 36000000, 실패 시 None)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate(value: Any) -> Optional[float]:
+    """할인율을 float 으로 변환합니다. (실패 시 None)"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """생산일 문자열(YYYYMMDD 또는 YYYY-MM-DD)을 date 로 변환합니다. (실패 시 None)"""
+    if not value:
+        return None
+    digits = str(value).replace("-", "")[:8]
+    try:
+        return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+    except ValueError:
+        return None
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Car(Mapping):
+    """
+    파싱된 차량 레코드
+
+    Examples:
+        >>> car = Car.from_api(response_car)
+        >>> car.price, car.discount, car.discount_rate, car.production_date
+        (25000000, 1500000, 5.7, datetime.date(2025, 3, 15))
+        >>> car['finalAmount']          # 기존 방식도 동작
+        25000000
+    """
+
+    __slots__ = tuple(_FIELDS.values()) + ("production_date", "extra")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+        if self.extra is None:
+            self.extra = {}
+
+    @classmethod
+    def from_api(cls, data: Mapping, keep_extra: bool = True) -> "Car":
+        """
+        API 응답의 차량 정보로 Car 를 만듭니다.
+
+        Args:
+            data: API 응답 차량 정보
+            keep_extra: 변환 대상이 아닌 나머지 필드(옵션, 할인 사유 등)도 보관할지 여부
+        """
+        if isinstance(data, Car):
+            return data
+
+        car = cls.__new__(cls)
+        for key, name in CATEGORICAL_FIELDS.items():
+            setattr(car, name, _intern(data.get(key)))
+        for key, name in AMOUNT_FIELDS.items():
+            setattr(car, name, parse_amount(data.get(key)))
+        car.car_production_number = data.get("carProductionNumber")
+        car.discount_rate = parse_rate(data.get("discountRate"))
+        car.prdn_dt = data.get("prdnDt")
+        car.production_date = parse_date(car.prdn_dt)
+        car.extra = {k: v for k, v in data.items() if k not in _FIELDS} if keep_extra else {}
+        return car
+
+    # --- API 키로 읽기 (Mapping) ---
+
+    def __getitem__(self, key: str) -> Any:
+        name = _FIELDS.get(key)
+        if name is not None:
+            value = getattr(self, name)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key, name in _FIELDS.items():
+            if getattr(self, name) is not None:
+                yield key
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 키 형식의 dict 로 변환합니다. (JSON 저장용)"""
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return (f"Car({self.car_production_number!r}, {self.color!r}, {self.trim!r}, "
+                f"price={self.price!r}, discount={self.discount!r}, center={self.center!r})")
+
+
+def parse_cars(items: Iterable[Mapping], keep_extra: bool = True) -> List[Car]:
+    """API 응답 차량 리스트를 Car 리스트로 변환합니다."""
+    return [Car.from_api(item, keep_extra) for item in items]
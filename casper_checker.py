@@ -5,9 +5,15 @@ Hyundai Casper 재고 확인 스크립트
 
 import requests
 import json
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from enum import Enum
 
+from sweep_planner import get_latency_history
+from car import Car, parse_cars
+from query_cache import get_query_cache
+from request_payload import build_params, encode_params
+
 
 class CarModel(Enum):
     """캐스퍼 차량 모델"""
@@ -61,6 +67,12 @@ class CasperChecker:
             "ep-channel": "wpc",
             "service-type": "product"
         }
+        # 공유 조회 캐시 (None이면 항상 서버에 요청)
+        self.query_cache = get_query_cache()
+    
+    def default_params(self, model: Optional[CarModel] = None) -> Dict[str, Any]:
+        """모델의 기본 검색 파라미터를 만듭니다. (model이 없으면 전체 모델)"""
+        return build_params("R0003", model)
     
     def check_inventory(
         self, 
@@ -82,69 +94,40 @@ class CasperChecker:
             model = CarModel.CASPER_ELECTRIC_2026
         
         # 기본 파라미터 구성
-        if custom_params is None:
-            if model:
-                model_data = model.value
-                params = {
-                    "carCode": model_data["carCode"],
-                    "subsidyRegion": model_data["subsidyRegion"],
-                    "exhbNo": "R0003",
-                    "sortCode": "10",
-                    "deliveryAreaCode": "J",
-                    "deliveryLocalAreaCode": "J1",
-                    "carBodyCode": "",
-                    "carEngineCode": "",
-                    "carTrimCode": "",
-                    "exteriorColorCode": "",
-                    "interiorColorCode": [],
-                    "deliveryCenterCode": "",
-                    "wpaScnCd": "",
-                    "optionFilter": "",
-                    "minSalePrice": model_data["minSalePrice"],
-                    "maxSalePrice": model_data["maxSalePrice"],
-                    "choiceOptYn": "Y",
-                    "pageNo": 1,
-                    "pageSize": 18
-                }
-            else:
-                # 완전 기본값 (모든 모델 검색)
-                params = {
-                    "carCode": "",
-                    "subsidyRegion": "",
-                    "exhbNo": "R0003",
-                    "sortCode": "10",
-                    "deliveryAreaCode": "J",
-                    "deliveryLocalAreaCode": "J1",
-                    "carBodyCode": "",
-                    "carEngineCode": "",
-                    "carTrimCode": "",
-                    "exteriorColorCode": "",
-                    "interiorColorCode": [],
-                    "deliveryCenterCode": "",
-                    "wpaScnCd": "",
-                    "optionFilter": "",
-                    "minSalePrice": "",
-                    "maxSalePrice": "",
-                    "choiceOptYn": "Y",
-                    "pageNo": 1,
-                    "pageSize": 18
+        params = custom_params if custom_params is not None else self.default_params(model)
+    
+        if self.query_cache is not None:
+            cached = self.query_cache.lookup(self.base_url, params)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "status_code": 200,
+                    "data": cached,
+                    "model": model.value["name"] if model else "전체",
+                    "cached": True
                 }
-        else:
-            params = custom_params
         
         try:
+            started = time.monotonic()
             response = requests.post(
                 self.base_url,
                 headers=self.headers,
-                json=params,
+                data=encode_params(params),
                 timeout=10
             )
             response.raise_for_status()
+            get_latency_history().record(
+                time.monotonic() - started, len(response.content), "R0003"
+            )
             
+            data = response.json()
+            if self.query_cache is not None:
+                self.query_cache.store(self.base_url, params, data)
+    
             return {
                 "success": True,
                 "status_code": response.status_code,
-                "data": response.json(),
+                "data": data,
                 "model": model.value["name"] if model else "전체"
             }
             
@@ -213,10 +196,62 @@ class CasperChecker:
         if result["success"]:
             response_data = result["data"]
             if "data" in response_data and "discountsearchcars" in response_data["data"]:
-                return response_data["data"]["discountsearchcars"]
+                return parse_cars(response_data["data"]["discountsearchcars"])
         
         return []
     
+    def get_count_and_cars(
+        self,
+        model: Optional[CarModel] = None,
+        custom_params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Optional[int], list]:
+        """
+        한 번의 요청으로 재고 개수와 차량 리스트를 함께 반환합니다.
+        
+        Returns:
+            (재고 개수, 차량 정보 리스트) 튜플. 요청 실패 시 None, []
+        """
+        result = self.check_inventory(model, custom_params)
+        
+        if result["success"]:
+            response_data = result["data"].get("data") or {}
+            cars = response_data.get("discountsearchcars") or []
+            return response_data.get("totalCount", len(cars)), parse_cars(cars)
+        
+        return None, []
+    
+    def iter_cars(
+        self,
+        model: Optional[CarModel] = None,
+        custom_params: Optional[Dict[str, Any]] = None,
+        max_pages: Optional[int] = None
+    ) -> Iterator[Car]:
+        """
+        모든 페이지의 재고 차량을 한 페이지씩 받아 차례로 돌려줍니다.
+    
+        리스트로 모으지 않으므로 top_k.TopK 같은 스트림 집계에 바로 넘길 수 있습니다.
+    
+        Args:
+            model: 모델 (custom_params가 없을 때 기본 파라미터 구성에 사용)
+            custom_params: 검색 파라미터 (pageNo는 자동으로 증가)
+            max_pages: 최대 페이지 수 (없으면 totalCount까지)
+        """
+        if model is None and custom_params is None:
+            model = CarModel.CASPER_ELECTRIC_2026
+        params = dict(custom_params if custom_params is not None else self.default_params(model))
+        first = page = int(params.get("pageNo") or 1)
+        fetched = 0
+    
+        while max_pages is None or page - first < max_pages:
+            total, cars = self.get_count_and_cars(model, dict(params, pageNo=page))
+            if not cars:
+                return
+            yield from cars
+            fetched += len(cars)
+            if total is None or fetched >= total:
+                return
+            page += 1
+    
     def check_all_models(self) -> Dict[str, Any]:
         """
         모든 모델의 재고를 한번에 확인합니다.
@@ -263,43 +298,44 @@ class CasperChecker:
             ...     "포항시"
             ... )
         """
+        params = self.region_params(model, sido_name, sigun_name, **kwargs)
+        if params is None:
+            return []
+        
+        return self.get_car_list(custom_params=params)
+    
+    def region_params(
+        self,
+        model: CarModel,
+        sido_name: str,
+        sigun_name: Optional[str] = None,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        지역명으로 조회 파라미터를 만듭니다.
+        
+        Returns:
+            조회 파라미터, 알 수 없는 지역이면 None
+        """
         try:
             from region_helper import get_codes
             area_code, local_code = get_codes(sido_name, sigun_name)
         except (ImportError, ValueError) as e:
             print(f"❌ 지역 코드 조회 실패: {e}")
             print("fetch_regions.py를 먼저 실행하세요.")
-            return []
-        
-        model_data = model.value
+            return None
         
         # 기본 파라미터 생성
-        params = {
-            "carCode": model_data["carCode"],
-            "subsidyRegion": model_data["subsidyRegion"],
-            "exhbNo": "R0003",
-            "sortCode": "10",
-            "deliveryAreaCode": area_code,
-            "deliveryLocalAreaCode": local_code,
-            "carBodyCode": "",
-            "carEngineCode": "",
-            "carTrimCode": "",
-            "exteriorColorCode": "",
-            "interiorColorCode": [],
-            "deliveryCenterCode": "",
-            "wpaScnCd": "",
-            "optionFilter": "",
-            "minSalePrice": model_data["minSalePrice"],
-            "maxSalePrice": model_data["maxSalePrice"],
-            "choiceOptYn": "Y",
-            "pageNo": 1,
-            "pageSize": 18
-        }
+        params = build_params(
+            "R0003", model,
+            deliveryAreaCode=area_code,
+            deliveryLocalAreaCode=local_code
+        )
         
         # 추가 옵션 적용
         params.update(kwargs)
         
-        return self.get_car_list(custom_params=params)
+        return params
     
     def get_region_count(
         self,
@@ -325,6 +361,7 @@ class CasperChecker:
         """
         차량 정보를 보기 좋게 출력합니다.
         """
+        car = Car.from_api(car)
         print(f"\n{'='*60}")
         print(f"🚗 {car['carName']} - {car['saleModelName']}")
         print(f"{'='*60}")
@@ -333,9 +370,9 @@ class CasperChecker:
         print(f"내장색: {car['interiorColorName']}")
         print(f"미션: {car['carMissionName']}")
         print(f"\n💰 가격 정보:")
-        print(f"  차량 가격: {int(float(car['carPrice'])):,}원")
-        print(f"  할인 금액: {int(float(car['discountPrice'])):,}원 ({car['discountRate']}%)")
-        print(f"  최종 금액: {int(float(car['finalAmount'])):,}원")
+        print(f"  차량 가격: {car.car_price or 0:,}원")
+        print(f"  할인 금액: {car.discount or 0:,}원 ({car.discount_rate}%)")
+        print(f"  최종 금액: {car.price or 0:,}원")
         print(f"  배송비: {int(float(car['totalDeiveryPrice'])):,}원")
         print(f"\n📦 옵션:")
         if car.get('carChoiceOption'):
@@ -345,7 +382,7 @@ class CasperChecker:
             print(f"  {car.get('optionSummary', '없음')}")
         print(f"\n📍 출고 정보:")
         print(f"  출고센터: {car['deliveryCenterName']}")
-        print(f"  생산일: {car['prdnDt'][:4]}-{car['prdnDt'][4:6]}-{car['prdnDt'][6:]}")
+        print(f"  생산일: {car.production_date or car.prdn_dt}")
         print(f"  차대번호: {car['carProductionNumber']}")
         print(f"\n💡 할인 사유: {car['discountReasonSubstance']}")
         print(f"{'='*60}\n")
@@ -382,9 +419,9 @@ def main():
             
             cars = checker.get_car_list(model)
             for i, car in enumerate(cars[:3], 1):  # 처음 3대만 표시
-                print(f"\n  [{i}] {car['exteriorColorName']} | {car['carTrimName']}")
-                print(f"      가격: {int(float(car['finalAmount'])):,}원 (할인 {int(float(car['discountPrice'])):,}원)")
-                print(f"      출고: {car['deliveryCenterName']}")
+                print(f"\n  [{i}] {car.color} | {car.trim}")
+                print(f"      가격: {car.price:,}원 (할인 {car.discount:,}원)")
+                print(f"      출고: {car.center}")
             
             if count > 3:
                 print(f"\n  ... 외 {count - 3}대 더 있음")
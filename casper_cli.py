@@ -21,6 +21,7 @@ def main():
   %(prog)s --all                    # 모든 모델 상세 정보
   %(prog)s --color SAW              # 아틀라스 화이트만
   %(prog)s --model AX05 --detail    # 상세 정보 포함
+  %(prog)s --region 포항            # 지역 재고 (지역명, 초성 ㅍㅎ, 오타 허용)
 
 모델 코드:
   AX05: 2026 캐스퍼 일렉트릭
@@ -58,6 +59,11 @@ def main():
         help='출고센터 코드로 필터링 (예: Z11)'
     )
     
+    parser.add_argument(
+        '--region', '-r',
+        help='지역명으로 조회 (예: 포항, ㅍㅎ, 경기 수원)'
+    )
+    
     parser.add_argument(
         '--count', '-n',
         action='store_true',
@@ -81,32 +87,56 @@ def main():
     if args.color or args.center:
         model_code = args.model if args.model else "AX05"
         model = model_map[model_code]
-        model_data = model.value
-        
-        custom_params = {
-            "carCode": model_data["carCode"],
-            "subsidyRegion": model_data["subsidyRegion"],
-            "exhbNo": "R0003",
-            "sortCode": "10",
-            "deliveryAreaCode": "J",
-            "deliveryLocalAreaCode": "J1",
-            "carBodyCode": "",
-            "carEngineCode": "",
-            "carTrimCode": "",
-            "exteriorColorCode": args.color if args.color else "",
-            "interiorColorCode": [],
-            "deliveryCenterCode": args.center if args.center else "",
-            "wpaScnCd": "",
-            "optionFilter": "",
-            "minSalePrice": model_data["minSalePrice"],
-            "maxSalePrice": model_data["maxSalePrice"],
-            "choiceOptYn": "Y",
-            "pageNo": 1,
-            "pageSize": 18
-        }
+        custom_params = dict(
+            checker.default_params(model),
+            exteriorColorCode=args.color or "",
+            deliveryCenterCode=args.center or ""
+        )
     
     # 실행
-    if args.all:
+    if args.region:
+        # 지역 재고 조회 (지역명/초성 자동완성)
+        from region_helper import suggest
+        candidates = suggest(args.region, 5)
+        if not candidates:
+            print(f"⚠️  '{args.region}'에 해당하는 지역이 없습니다.")
+            sys.exit(1)
+        tied = [r for r in candidates if r['score'] == candidates[0]['score']]
+        region = tied[0]
+        if len(tied) > 1:
+            # 점수가 같은 후보 (예: "고성" → 강원/경남 고성군): 골라서 진행
+            print(f"'{args.region}' 후보가 여러 개입니다. (시도명을 앞에 붙이면 바로 선택, 예: 강원 고성)")
+            for i, r in enumerate(tied, 1):
+                print(f"  {i}. {r['sido']} {r['sigun']}")
+            if not sys.stdin.isatty():
+                sys.exit(1)
+            try:
+                idx = int(input(f"번호 선택 (1-{len(tied)}): ").strip()) - 1
+            except (ValueError, EOFError, KeyboardInterrupt):
+                idx = -1
+            if idx < 0 or idx >= len(tied):
+                print("잘못된 선택입니다.")
+                sys.exit(1)
+            region = tied[idx]
+        model = model_map[args.model or "AX05"]
+        filters = {}
+        if args.color:
+            filters['exteriorColorCode'] = args.color
+        if args.center:
+            filters['deliveryCenterCode'] = args.center
+        cars = checker.search_by_region(model, region['sido'], region['sigun'], **filters)
+        
+        if args.count:
+            print(len(cars))
+        else:
+            print(f"[{model.value['name']}] {region['sido']} {region['sigun']} - {len(cars)}대")
+            for i, car in enumerate(cars, 1):
+                if args.detail:
+                    checker.print_car_info(car)
+                else:
+                    print(f"{i}. {car.color} | {car.price:,}원 | {car.center}")
+    
+    elif args.all:
         # 모든 모델 상세 정보
         print("="*70)
         print("🚗 전체 캐스퍼 모델 재고 현황")
@@ -119,7 +149,7 @@ def main():
             if count > 0 and args.detail:
                 cars = checker.get_car_list(model)
                 for car in cars[:3]:
-                    print(f"  • {car['exteriorColorName']} | {int(car['finalAmount']):,}원")
+                    print(f"  • {car.color} | {car.price:,}원")
     
     elif args.model:
         # 특정 모델 조회
@@ -142,7 +172,7 @@ def main():
                     checker.print_car_info(car)
             elif count > 0:
                 for i, car in enumerate(cars, 1):
-                    print(f"{i}. {car['exteriorColorName']} | {int(car['finalAmount']):,}원 | {car['deliveryCenterName']}")
+                    print(f"{i}. {car.color} | {car.price:,}원 | {car.center}")
     
     else:
         # 기본: 전체 모델 요약
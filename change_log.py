@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+재고 변동 이벤트 로그 (append-only)
+
+스냅샷 파일을 매번 저장하는 대신 입고/출고/가격 변경 이벤트만 한 줄씩
+압축 세그먼트 파일에 추가합니다. 세그먼트가 커지면 새 세그먼트로 넘어가며,
+각 이벤트는 전역 오프셋(0부터 증가)을 가지므로 다른 프로그램이
+오프셋 기준으로 이어서 읽을 수 있습니다.
+
+디렉터리 구조:
+    change_log/
+        00000000000000000000.jsonl.gz   # 오프셋 0부터 시작하는 세그먼트
+        00000000000000004096.jsonl.gz
+        ...
+"""
+
+import os
+import gzip
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from inventory_diff import EVENT_ADDED, EVENT_REMOVED, EVENT_CHANGED
+
+
+# 로그에 기록되는 이벤트 종류
+CAR_ADDED = "car_added"
+CAR_REMOVED = "car_removed"
+PRICE_CHANGED = "price_changed"
+CENTER_CHANGED = "center_changed"
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def to_log_events(
+    events: List[Dict[str, Any]],
+    exhibition_no: str,
+    region: Optional[str] = None,
+    timestamp: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    inventory_diff 이벤트를 로그 레코드로 변환합니다.
+
+    Args:
+        events: diff 이벤트 리스트
+        exhibition_no: 기획전 번호
+        region: 지역 (없으면 차량 정보의 sido/sigun 사용)
+        timestamp: 기록 시각 (ISO 형식, 기본 현재)
+
+    Returns:
+        [{"type": "car_added", "ts": ..., "exhbNo": ..., "region": ...,
+          "carProductionNumber": ..., "carCode": ..., "price": ...}, ...]
+    """
+    ts = timestamp or datetime.now().isoformat(timespec="seconds")
+    records = []
+
+    for event in events:
+        car = event.get("car", {})
+        where = region
+        if where is None and car.get("sido"):
+            where = f"{car['sido']} {car.get('sigun', '')}".strip()
+        base = {
+            "ts": ts,
+            "exhbNo": exhibition_no,
+            "region": where,
+            "carProductionNumber": event["carProductionNumber"],
+            "carCode": car.get("carCode"),
+        }
+
+        if event["type"] == EVENT_ADDED:
+            records.append(dict(base, type=CAR_ADDED, price=car.get("finalAmount"),
+                                color=car.get("exteriorColorName"), trim=car.get("carTrimName"),
+                                center=car.get("deliveryCenterName")))
+        elif event["type"] == EVENT_REMOVED:
+            records.append(dict(base, type=CAR_REMOVED, price=car.get("finalAmount")))
+        elif event["type"] == EVENT_CHANGED:
+            changes = event.get("changes", {})
+            if "price" in changes or "discount" in changes:
+                record = dict(base, type=PRICE_CHANGED)
+                if "price" in changes:
+                    record["old"], record["new"] = changes["price"]
+                if "discount" in changes:
+                    record["discount_old"], record["discount_new"] = changes["discount"]
+                records.append(record)
+            if "center" in changes:
+                old, new = changes["center"]
+                records.append(dict(base, type=CENTER_CHANGED, old=old, new=new))
+
+    return records
+
+
+class ChangeLog:
+    """
+    오프셋 기반 append-only 이벤트 로그
+
+    Examples:
+        >>> log = ChangeLog("change_log")
+        >>> log.append_events(events, exhibition_no="R0003")
+        >>> for offset, record in log.read(from_offset=0):
+        ...     print(offset, record["type"])
+    """
+
+    def __init__(self, directory: str = "change_log", segment_records: int = 4096):
+        """
+        Args:
+            directory: 로그 디렉터리
+            segment_records: 세그먼트 1개에 담을 최대 이벤트 수
+        """
+        self.directory = directory
+        self.segment_records = segment_records
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._next_offset = self._recover_next_offset()
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """(시작 오프셋, 경로) 리스트를 오프셋 순으로 반환합니다."""
+        result = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX):
+                try:
+                    base = int(name[:-len(SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                result.append((base, os.path.join(self.directory, name)))
+        return sorted(result)
+
+    @staticmethod
+    def _read_segment(path: str) -> Iterator[Dict[str, Any]]:
+        """세그먼트의 레코드를 읽습니다. 비정상 종료로 잘린 마지막 줄은 무시합니다."""
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+        except (EOFError, OSError):
+            return
+
+    def _recover_next_offset(self) -> int:
+        segments = self.segments()
+        if not segments:
+            return 0
+        base, path = segments[-1]
+        return base + sum(1 for _ in self._read_segment(path))
+
+    @property
+    def next_offset(self) -> int:
+        """다음에 기록될 이벤트의 오프셋"""
+        return self._next_offset
+
+    def _segment_path(self, base: int) -> str:
+        return os.path.join(self.directory, f"{base:020d}{SEGMENT_SUFFIX}")
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """
+        레코드를 로그에 추가합니다.
+
+        gzip 멤버를 이어 붙이는 방식이라 기존 내용을 다시 쓰지 않습니다.
+
+        Returns:
+            첫 레코드의 오프셋 (레코드가 없으면 현재 next_offset)
+        """
+        with self._lock:
+            first = self._next_offset
+            pending = list(records)
+            while pending:
+                segments = self.segments()
+                if segments and self._next_offset - segments[-1][0] < self.segment_records:
+                    base = segments[-1][0]
+                else:
+                    base = self._next_offset
+                room = self.segment_records - (self._next_offset - base)
+                chunk, pending = pending[:room], pending[room:]
+
+                lines = "".join(
+                    json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+                    for record in chunk
+                )
+                with gzip.open(self._segment_path(base), 'at', encoding='utf-8') as f:
+                    f.write(lines)
+                self._next_offset += len(chunk)
+            return first
+
+    def append_events(
+        self,
+        events: List[Dict[str, Any]],
+        exhibition_no: str,
+        region: Optional[str] = None
+    ) -> int:
+        """diff 이벤트를 변환하여 추가합니다. (to_log_events 참고)"""
+        return self.append(to_log_events(events, exhibition_no, region))
+
+    def read(self, from_offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        from_offset 이후의 (오프셋, 레코드)를 순서대로 읽습니다.
+
+        필요 없는 세그먼트는 열지 않습니다.
+        """
+        segments = self.segments()
+        for i, (base, path) in enumerate(segments):
+            end = segments[i + 1][0] if i + 1 < len(segments) else None
+            if end is not None and end <= from_offset:
+                continue
+            for offset, record in enumerate(self._read_segment(path), base):
+                if offset >= from_offset:
+                    yield offset, record
+
+    def tail(self, from_offset: Optional[int] = None, poll: float = 1.0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        새 레코드를 계속 기다리며 읽습니다. (tail -f)
+
+        Args:
+            from_offset: 시작 오프셋 (None이면 현재 끝부터)
+            poll: 새 레코드 확인 주기 (초)
+        """
+        offset = self._recover_next_offset() if from_offset is None else from_offset
+        while True:
+            for offset_read, record in self.read(offset):
+                yield offset_read, record
+                offset = offset_read + 1
+            time.sleep(poll)
+
+
+def main():
+    """로그 내용을 출력하거나 tail 합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='재고 변동 이벤트 로그 조회')
+    parser.add_argument('--dir', default='change_log', help='로그 디렉터리')
+    parser.add_argument('--from', dest='from_offset', type=int, default=0, help='시작 오프셋')
+    parser.add_argument('--follow', '-f', action='store_true', help='새 이벤트를 계속 출력')
+    args = parser.parse_args()
+
+    log = ChangeLog(args.dir)
+    reader = log.tail(args.from_offset) if args.follow else log.read(args.from_offset)
+    try:
+        for offset, record in reader:
+            print(f"{offset:>8} {json.dumps(record, ensure_ascii=False)}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,59 @@
 현대 캐스퍼 배송지 정보 수집 스크립트
 
 전국의 모든 시도 및 시군구 정보를 수집합니다.
+
+17개 시도 요청은 몇 개씩 동시에 보내되 요청 시작 간격(기본 0.3초, 초당 약 3건)을
+지켜 서버 부담을 제한합니다. 더 빠른 수집(--fast, 초당 약 50건)은 직접 선택할 때만 사용합니다.
+수집 결과가 기존 데이터와 내용 해시까지 같으면 파일을 다시 쓰지 않으므로
+정기 갱신을 돌려도 파일(과 이를 감시하는 프로세스)이 흔들리지 않습니다.
+
+사용법:
+    python fetch_regions.py                # 수집 후 바뀐 경우에만 저장
+    python fetch_regions.py --force        # 바뀌지 않았어도 저장
+    python fetch_regions.py --fast         # 간격을 줄여 빠르게 수집 (서버 부담 큼)
 """
 
-import requests
+import os
+import sys
 import json
-from typing import Dict, List, Any
 import time
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+
+from region_index import RegionIndex
+from region_table import (
+    RegionTable, CONSTANTS_FILE, JSON_FILE, TABLE_FILE,
+    load_region_table, notify_changed, save_table
+)
+
+
+# 기본 요청 간격/동시 요청 수 (이전 순차 수집과 같은 초당 약 3건)
+DEFAULT_DELAY = 0.3
+DEFAULT_WORKERS = 4
+
+# --fast: 17개 시도를 거의 한꺼번에 요청 (초당 약 50건)
+FAST_DELAY = 0.02
+FAST_WORKERS = 17
+
+
+class _RateLimiter:
+    """요청 시작 간격을 min_interval 초 이상으로 유지 (여러 스레드 공용)"""
+    
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
 
 
 class RegionFetcher:
@@ -51,6 +98,8 @@ class RegionFetcher:
             "sec-fetch-site": "same-origin",
         }
         self.region_data = {}
+        self.failed: List[str] = []
+        self._index = None  # search_sigun 용 색인 (수집 후 처음 검색할 때 생성)
     
     def fetch_sigun(self, region_code: str) -> List[Dict[str, Any]]:
         """
@@ -60,7 +109,7 @@ class RegionFetcher:
             region_code: 시도 코드 (예: 'B', 'N')
         
         Returns:
-            시군구 리스트
+            시군구 리스트 (실패하면 빈 리스트, 시도 코드는 self.failed 에 기록)
         """
         params = {"commonCode": region_code}
         
@@ -78,18 +127,27 @@ class RegionFetcher:
                 return data.get("data", [])
             else:
                 print(f"⚠️  {region_code} 응답 오류: {data.get('rspStatus', {}).get('rspMessage')}")
+                self.failed.append(region_code)
                 return []
                 
         except Exception as e:
             print(f"❌ {region_code} 요청 실패: {e}")
+            self.failed.append(region_code)
             return []
     
-    def fetch_all_regions(self, delay: float = 0.5) -> Dict[str, Any]:
+    def fetch_all_regions(
+        self,
+        delay: float = DEFAULT_DELAY,
+        max_workers: int = DEFAULT_WORKERS
+    ) -> Dict[str, Any]:
         """
-        모든 시도의 시군구 정보를 수집합니다.
+        모든 시도의 시군구 정보를 동시에 수집합니다.
+        
+        요청에 실패한 시도는 기존 데이터(region_table)가 있으면 그대로 유지합니다.
         
         Args:
-            delay: 각 요청 사이의 지연 시간 (초)
+            delay: 요청 시작 사이의 최소 간격 (초, 빠른 수집은 FAST_DELAY)
+            max_workers: 동시에 보낼 최대 요청 수 (빠른 수집은 FAST_WORKERS)
         
         Returns:
             전체 지역 데이터 딕셔너리
@@ -97,15 +155,30 @@ class RegionFetcher:
         print("🔍 전국 배송지 정보 수집 중...\n")
         print("="*70)
         
-        for i, region in enumerate(self.REGIONS, 1):
+        self.failed = []
+        limiter = _RateLimiter(delay)
+        
+        def fetch(region):
+            limiter.wait()
+            return self.fetch_sigun(region["code"])
+        
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, self.REGIONS))
+        elapsed = time.monotonic() - started
+        
+        previous = self.load_existing()
+        self.region_data = {}
+        for i, (region, sigun_list) in enumerate(zip(self.REGIONS, results), 1):
             region_name = region["name"]
             region_code = region["code"]
             
-            print(f"[{i:2d}/17] {region_name:<6} (코드: {region_code}) ", end="", flush=True)
-            
-            sigun_list = self.fetch_sigun(region_code)
+            print(f"[{i:2d}/17] {region_name:<6} (코드: {region_code}) ", end="")
             
-            if len(sigun_list) > 1:
+            if region_code in self.failed and region_name in previous:
+                print("⚠️  요청 실패 - 기존 데이터 유지")
+                self.region_data[region_name] = previous[region_name]
+            elif len(sigun_list) > 1:
                 # 시군구가 여러 개 있음
                 print(f"✅ {len(sigun_list)}개 시군구")
                 self.region_data[region_name] = {
@@ -131,16 +204,63 @@ class RegionFetcher:
                     "sigun_list": [],
                     "count": 0
                 }
-            
-            # 요청 간 지연
-            if i < len(self.REGIONS):
-                time.sleep(delay)
+        
+        self._index = None
         
         print("="*70)
-        print("\n✅ 수집 완료!\n")
+        print(f"\n✅ 수집 완료! ({elapsed:.1f}초)\n")
         
         return self.region_data
     
+    def load_existing(self) -> Dict[str, Any]:
+        """현재 저장된 지역 데이터 (없으면 빈 딕셔너리)"""
+        table = load_region_table()
+        return table.region_data if table else {}
+    
+    def changed_regions(self) -> List[str]:
+        """
+        저장된 데이터와 비교하여 달라진 시도 목록을 반환합니다.
+        
+        Returns:
+            달라진(추가/변경/삭제된) 시도명 리스트
+        """
+        previous = self.load_existing()
+        names = list(self.region_data) + [name for name in previous if name not in self.region_data]
+        return [name for name in names if previous.get(name) != self.region_data.get(name)]
+    
+    def save_if_changed(self, force: bool = False) -> bool:
+        """
+        수집 결과가 저장된 데이터와 다를 때만 모든 출력 파일을 저장하고 변경을 알립니다.
+        
+        Args:
+            force: 바뀌지 않았어도 저장
+        
+        Returns:
+            저장했으면 True
+        """
+        if not self.region_data:
+            print("저장할 데이터가 없습니다.")
+            return False
+        
+        table = RegionTable.from_region_data(self.region_data)
+        existing = load_region_table()
+        outputs = (JSON_FILE, CONSTANTS_FILE, TABLE_FILE)
+        missing = [path for path in outputs if not os.path.exists(path)]
+        
+        if not force and not missing and existing and existing.content_hash() == table.content_hash():
+            print(f"\n✅ 지역 데이터 변경 없음 (해시 {table.content_hash()[:12]}) - 파일을 다시 쓰지 않습니다.")
+            return False
+        
+        changed = self.changed_regions()
+        if changed:
+            print(f"\n🔄 변경된 시도: {', '.join(changed)}")
+        
+        self.save_to_json(JSON_FILE)
+        self.save_to_python(CONSTANTS_FILE)
+        self.save_to_table(TABLE_FILE)
+        notify_changed(table)
+        return True
+    
     def print_summary(self):
         """수집 결과 요약 출력"""
         if not self.region_data:
@@ -182,7 +302,7 @@ class RegionFetcher:
                 else:
                     print(f"  데이터 없음")
     
-    def save_to_json(self, filename: str = "region_data.json"):
+    def save_to_json(self, filename: str = JSON_FILE):
         """JSON 파일로 저장"""
         if not self.region_data:
             print("저장할 데이터가 없습니다.")
@@ -193,7 +313,7 @@ class RegionFetcher:
         
         print(f"\n💾 데이터 저장 완료: {filename}")
     
-    def save_to_python(self, filename: str = "region_constants.py"):
+    def save_to_python(self, filename: str = CONSTANTS_FILE):
         """Python 상수로 저장"""
         if not self.region_data:
             print("저장할 데이터가 없습니다.")
@@ -234,47 +354,59 @@ class RegionFetcher:
         
         print(f"\n💾 Python 상수 저장 완료: {filename}")
     
+    def save_to_table(self, filename: str = TABLE_FILE):
+        """지역 테이블(marshal)로 저장 (region_helper 가 빠르게 읽는 형식)"""
+        if not self.region_data:
+            print("저장할 데이터가 없습니다.")
+            return
+        
+        save_table(RegionTable.from_region_data(self.region_data), filename)
+        
+        print(f"\n💾 지역 테이블 저장 완료: {filename}")
+    
     def get_region_by_name(self, region_name: str) -> Dict[str, Any]:
         """지역명으로 정보 조회"""
         return self.region_data.get(region_name, {})
     
     def search_sigun(self, sigun_name: str) -> List[Dict[str, Any]]:
         """시군구명으로 검색"""
-        results = []
-        for region_name, info in self.region_data.items():
-            for sigun in info.get("sigun_list", []):
-                if sigun_name in sigun["codeName"]:
-                    results.append({
-                        "sido": region_name,
-                        "sido_code": info["code"],
-                        "sigun": sigun["codeName"],
-                        "sigun_code": sigun["code"]
-                    })
-        return results
+        if self._index is None:
+            self._index = RegionIndex(self.region_data)
+        return self._index.search(sigun_name)
 
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='전국 배송지 정보 수집')
+    parser.add_argument('--delay', type=float, help=f'요청 시작 간 최소 간격 (초, 기본 {DEFAULT_DELAY})')
+    parser.add_argument('--workers', type=int, help=f'동시 요청 수 (기본 {DEFAULT_WORKERS})')
+    parser.add_argument('--fast', action='store_true',
+                        help=f'간격 {FAST_DELAY}초, 동시 {FAST_WORKERS}개로 빠르게 수집 (서버 부담 큼)')
+    parser.add_argument('--force', action='store_true', help='변경이 없어도 파일 저장')
+    args = parser.parse_args()
+    
     fetcher = RegionFetcher()
     
     # 1. 데이터 수집
-    fetcher.fetch_all_regions(delay=0.3)
+    delay = args.delay if args.delay is not None else (FAST_DELAY if args.fast else DEFAULT_DELAY)
+    workers = args.workers or (FAST_WORKERS if args.fast else DEFAULT_WORKERS)
+    fetcher.fetch_all_regions(delay=delay, max_workers=workers)
     
     # 2. 요약 출력
     fetcher.print_summary()
     
-    # 3. 상세 정보 출력
-    print("\n상세 정보를 보시겠습니까? (y/n): ", end="")
-    try:
-        choice = input().strip().lower()
-        if choice == 'y':
-            fetcher.print_detail()
-    except:
-        pass
+    # 3. 상세 정보 출력 (대화형 실행일 때만)
+    if sys.stdin.isatty():
+        print("\n상세 정보를 보시겠습니까? (y/n): ", end="")
+        try:
+            choice = input().strip().lower()
+            if choice == 'y':
+                fetcher.print_detail()
+        except:
+            pass
     
-    # 4. 파일 저장
-    fetcher.save_to_json("region_data.json")
-    fetcher.save_to_python("region_constants.py")
+    # 4. 파일 저장 (바뀐 경우에만)
+    fetcher.save_if_changed(force=args.force)
     
     # 5. 검색 예시
     print("\n" + "="*70)
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+재고 이력 저장소 (SQLite)
+
+전국 검색(스윕) 결과를 SQLite 데이터베이스에 쌓아 두고 다시 조회합니다.
+
+테이블:
+    sweeps        스윕 1회 (시각, 기획전, 모델, 총 대수)
+    cars          차량 (차대번호 기준, 처음/마지막 확인 시각)
+    observations  스윕별 차량 관측 (지역, 가격, 할인, 출고센터)
+
+같은 차량의 가격 변화나 특정 출고센터의 재고 추이를 JSON 파일을
+뒤지지 않고 색인으로 바로 조회할 수 있습니다.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at    TEXT    NOT NULL,
+    exhibition_no TEXT    NOT NULL,
+    model_code    TEXT    NOT NULL,
+    model_name    TEXT,
+    total_count   INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS cars (
+    car_production_number TEXT PRIMARY KEY,
+    exhibition_no         TEXT,
+    car_code              TEXT,
+    trim                  TEXT,
+    color                 TEXT,
+    interior              TEXT,
+    center_code           TEXT,
+    center_name           TEXT,
+    production_date       TEXT,
+    first_seen            TEXT NOT NULL,
+    last_seen             TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS observations (
+    sweep_id              INTEGER NOT NULL REFERENCES sweeps(id),
+    car_production_number TEXT    NOT NULL REFERENCES cars(car_production_number),
+    observed_at           TEXT    NOT NULL,
+    sido                  TEXT    NOT NULL DEFAULT '',
+    sigun                 TEXT    NOT NULL DEFAULT '',
+    price                 INTEGER,
+    discount              INTEGER,
+    discount_rate         REAL,
+    center_name           TEXT,
+    PRIMARY KEY (sweep_id, car_production_number, sido, sigun)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_sweeps_time     ON sweeps (started_at);
+CREATE INDEX IF NOT EXISTS idx_sweeps_model    ON sweeps (exhibition_no, model_code, started_at);
+CREATE INDEX IF NOT EXISTS idx_cars_model      ON cars (car_code);
+CREATE INDEX IF NOT EXISTS idx_cars_exhibition ON cars (exhibition_no);
+CREATE INDEX IF NOT EXISTS idx_cars_center     ON cars (center_name);
+CREATE INDEX IF NOT EXISTS idx_obs_car_time    ON observations (car_production_number, observed_at);
+CREATE INDEX IF NOT EXISTS idx_obs_time        ON observations (observed_at);
+CREATE INDEX IF NOT EXISTS idx_obs_center_time ON observations (center_name, observed_at);
+"""
+
+# 차량 정보 upsert: 처음 확인 시각은 유지하고 나머지는 최신 값으로 갱신
+UPSERT_CAR = """
+INSERT INTO cars (
+    car_production_number, exhibition_no, car_code, trim, color, interior,
+    center_code, center_name, production_date, first_seen, last_seen
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (car_production_number) DO UPDATE SET
+    exhibition_no   = excluded.exhibition_no,
+    car_code        = excluded.car_code,
+    trim            = excluded.trim,
+    color           = excluded.color,
+    interior        = excluded.interior,
+    center_code     = excluded.center_code,
+    center_name     = excluded.center_name,
+    production_date = excluded.production_date,
+    last_seen       = MAX(cars.last_seen, excluded.last_seen)
+"""
+
+INSERT_OBSERVATION = """
+INSERT OR REPLACE INTO observations (
+    sweep_id, car_production_number, observed_at, sido, sigun,
+    price, discount, discount_rate, center_name
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _car_row(car: Dict[str, Any], exhibition_no: str, seen_at: str) -> tuple:
+    return (
+        car.get("carProductionNumber"),
+        exhibition_no,
+        car.get("carCode"),
+        car.get("carTrimName"),
+        car.get("exteriorColorName"),
+        car.get("interiorColorName"),
+        car.get("deliveryCenterCode"),
+        car.get("deliveryCenterName"),
+        car.get("prdnDt"),
+        seen_at,
+        seen_at,
+    )
+
+
+class HistoryStore:
+    """
+    SQLite 기반 재고 이력 저장소
+
+    Examples:
+        >>> store = HistoryStore("inventory_history.db")
+        >>> sweep_id = store.record_sweep(results, "R0003", "AX05", "캐스퍼 일렉트릭")
+        >>> store.price_history("MSLAX05...")
+        >>> store.observations(model_code="AX05", since="2026-01-01")
+    """
+
+    def __init__(self, path: str = "inventory_history.db", batch_size: int = 500):
+        """
+        Args:
+            path: 데이터베이스 파일 경로 (":memory:" 가능)
+            batch_size: 한 번에 executemany 할 행 수
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        self.conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _executemany(self, sql: str, rows: Iterable[tuple]):
+        """행을 batch_size 단위로 나눠 실행합니다. (트랜잭션 안에서 호출)"""
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.conn.executemany(sql, batch)
+                batch = []
+        if batch:
+            self.conn.executemany(sql, batch)
+
+    def upsert_cars(self, cars: Iterable[Dict[str, Any]], exhibition_no: str, seen_at: Optional[str] = None) -> int:
+        """
+        차량 정보를 추가하거나 갱신합니다.
+
+        Args:
+            cars: API 응답 차량 리스트
+            exhibition_no: 기획전 번호
+            seen_at: 확인 시각 (ISO 형식, 기본 현재)
+
+        Returns:
+            처리한 차량 수
+        """
+        seen_at = seen_at or datetime.now().isoformat(timespec="seconds")
+        rows = [_car_row(car, exhibition_no, seen_at) for car in cars if car.get("carProductionNumber")]
+        with self._lock, self.conn:
+            self._executemany(UPSERT_CAR, rows)
+        return len(rows)
+
+    def record_sweep(
+        self,
+        results: Dict[str, Dict[str, List[Dict[str, Any]]]],
+        exhibition_no: str,
+        model_code: str,
+        model_name: Optional[str] = None,
+        started_at: Optional[str] = None
+    ) -> int:
+        """
+        전국 검색 결과 1회를 하나의 트랜잭션으로 기록합니다.
+
+        Args:
+            results: {시도: {시군구: [차량, ...]}} (check_all_regions 결과)
+            exhibition_no: 기획전 번호
+            model_code: 모델 코드
+            model_name: 모델 이름
+            started_at: 스윕 시각 (ISO 형식, 기본 현재)
+
+        Returns:
+            sweep id
+        """
+        started_at = started_at or datetime.now().isoformat(timespec="seconds")
+
+        cars: Dict[str, tuple] = {}
+        observations: List[tuple] = []
+        for sido, sigun_dict in results.items():
+            for sigun, region_cars in (sigun_dict or {}).items():
+                for car in region_cars:
+                    number = car.get("carProductionNumber")
+                    if not number:
+                        continue
+                    cars.setdefault(number, _car_row(car, exhibition_no, started_at))
+                    observations.append((
+                        number, started_at, sido or "", sigun or "",
+                        _to_int(car.get("finalAmount")),
+                        _to_int(car.get("discountPrice")),
+                        _to_float(car.get("discountRate")),
+                        car.get("deliveryCenterName"),
+                    ))
+
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO sweeps (started_at, exhibition_no, model_code, model_name, total_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (started_at, exhibition_no, model_code, model_name, len(cars))
+            )
+            sweep_id = cursor.lastrowid
+            self._executemany(UPSERT_CAR, cars.values())
+            self._executemany(INSERT_OBSERVATION, ((sweep_id,) + row for row in observations))
+        return sweep_id
+
+    def sweeps(
+        self,
+        model_code: Optional[str] = None,
+        exhibition_no: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        스윕 목록을 최신순으로 조회합니다.
+
+        Args:
+            model_code: 모델 코드
+            exhibition_no: 기획전 번호
+            since: 시작 시각 (ISO 형식, 포함)
+            until: 종료 시각 (ISO 형식, 미포함)
+            limit: 최대 개수
+        """
+        where, params = [], []
+        if exhibition_no:
+            where.append("exhibition_no = ?")
+            params.append(exhibition_no)
+        if model_code:
+            where.append("model_code = ?")
+            params.append(model_code)
+        if since:
+            where.append("started_at >= ?")
+            params.append(since)
+        if until:
+            where.append("started_at < ?")
+            params.append(until)
+
+        sql = "SELECT * FROM sweeps"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def observations(
+        self,
+        model_code: Optional[str] = None,
+        exhibition_no: Optional[str] = None,
+        center: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        관측 기록을 차량 정보와 함께 시간순으로 조회합니다.
+
+        Args:
+            model_code: 모델 코드 (cars.car_code)
+            exhibition_no: 기획전 번호
+            center: 출고센터 이름
+            since: 시작 시각 (ISO 형식, 포함)
+            until: 종료 시각 (ISO 형식, 미포함)
+            limit: 최대 개수
+        """
+        where, params = [], []
+        if model_code:
+            where.append("c.car_code = ?")
+            params.append(model_code)
+        if exhibition_no:
+            where.append("c.exhibition_no = ?")
+            params.append(exhibition_no)
+        if center:
+            where.append("o.center_name = ?")
+            params.append(center)
+        if since:
+            where.append("o.observed_at >= ?")
+            params.append(since)
+        if until:
+            where.append("o.observed_at < ?")
+            params.append(until)
+
+        sql = (
+            "SELECT o.*, c.car_code, c.exhibition_no, c.trim, c.color "
+            "FROM observations o JOIN cars c USING (car_production_number)"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY o.observed_at"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def price_history(self, car_production_number: str) -> List[Dict[str, Any]]:
+        """
+        차량 1대의 가격 변화를 조회합니다. (같은 가격이 이어지면 첫 관측만)
+
+        Returns:
+            [{"observed_at": ..., "price": ..., "discount": ...}, ...]
+        """
+        rows = self.conn.execute(
+            "SELECT observed_at, MIN(price) AS price, MAX(discount) AS discount "
+            "FROM observations WHERE car_production_number = ? "
+            "GROUP BY sweep_id ORDER BY observed_at",
+            (car_production_number,)
+        )
+        history = []
+        for row in rows:
+            if history and history[-1]["price"] == row["price"] and history[-1]["discount"] == row["discount"]:
+                continue
+            history.append(dict(row))
+        return history
+
+    def car(self, car_production_number: str) -> Optional[Dict[str, Any]]:
+        """차량 정보를 조회합니다."""
+        row = self.conn.execute(
+            "SELECT * FROM cars WHERE car_production_number = ?", (car_production_number,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """저장된 데이터 요약"""
+        count = lambda table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        span = self.conn.execute("SELECT MIN(started_at), MAX(started_at) FROM sweeps").fetchone()
+        return {
+            "sweeps": count("sweeps"),
+            "cars": count("cars"),
+            "observations": count("observations"),
+            "first_sweep": span[0],
+            "last_sweep": span[1],
+        }
+
+
+_store: Optional[HistoryStore] = None
+
+
+def get_history_store(path: str = "inventory_history.db") -> HistoryStore:
+    """전역 HistoryStore 인스턴스를 반환합니다."""
+    global _store
+    if _store is None:
+        _store = HistoryStore(path)
+    return _store
+
+
+def main():
+    """저장된 이력을 요약하거나 차량 가격 변화를 출력합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='재고 이력 조회')
+    parser.add_argument('--db', default='inventory_history.db', help='데이터베이스 파일')
+    parser.add_argument('--car', help='가격 변화를 볼 차대번호')
+    parser.add_argument('--model', '-m', help='모델 코드별 최근 스윕')
+    parser.add_argument('--limit', type=int, default=20, help='최대 출력 개수')
+    args = parser.parse_args()
+
+    with HistoryStore(args.db) as store:
+        if args.car:
+            car = store.car(args.car)
+            if not car:
+                print(f"❌ 차량을 찾을 수 없습니다: {args.car}")
+                return
+            print(f"🚗 {car['car_production_number']} | {car['color']} | {car['trim']} | {car['center_name']}")
+            print(f"   처음 확인 {car['first_seen']} · 마지막 확인 {car['last_seen']}")
+            for row in store.price_history(args.car):
+                print(f"   {row['observed_at']}  {row['price'] or 0:>12,}원  할인 {row['discount'] or 0:>10,}원")
+            return
+
+        stats = store.stats()
+        print(f"📊 스윕 {stats['sweeps']}회 · 차량 {stats['cars']}대 · 관측 {stats['observations']}건")
+        if stats['sweeps']:
+            print(f"   기간: {stats['first_sweep']} ~ {stats['last_sweep']}")
+        for sweep in store.sweeps(model_code=args.model, limit=args.limit):
+            print(f"   #{sweep['id']:<6} {sweep['started_at']}  {sweep['exhibition_no']:<10} "
+                  f"{sweep['model_code']:<6} {sweep['total_count']:>4}대")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+재고 변동 감지(diff) 모듈
+
+이전 조회 결과를 차대번호(carProductionNumber) 기준으로 보관하고,
+새 응답과 비교하여 입고/출고/변경 이벤트를 만들어 냅니다.
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+
+# 스냅샷에 보관할 필드 (출력 및 비교용)
+SNAPSHOT_FIELDS = (
+    "carProductionNumber",
+    "carCode",
+    "carName",
+    "carTrimName",
+    "exteriorColorCode",
+    "exteriorColorName",
+    "interiorColorName",
+    "deliveryCenterCode",
+    "deliveryCenterName",
+    "carPrice",
+    "finalAmount",
+    "discountPrice",
+    "discountRate",
+    "prdnDt",
+)
+
+# 변경 감지 대상 필드 → 이벤트에 표시할 이름
+WATCHED_FIELDS = {
+    "finalAmount": "price",
+    "discountPrice": "discount",
+    "deliveryCenterName": "center",
+}
+
+EVENT_ADDED = "added"
+EVENT_REMOVED = "removed"
+EVENT_CHANGED = "changed"
+
+
+def compact_car(car: Dict[str, Any], **extra) -> Dict[str, Any]:
+    """
+    스냅샷에 보관할 필드만 남긴 차량 정보를 반환합니다.
+
+    Args:
+        car: API 응답의 차량 정보
+        **extra: 함께 보관할 추가 정보 (예: sido, sigun)
+    """
+    compact = {field: car[field] for field in SNAPSHOT_FIELDS if field in car}
+    compact.update(extra)
+    return compact
+
+
+def _same(old: Any, new: Any) -> bool:
+    """문자열/숫자 표현 차이를 무시하고 값을 비교합니다. ("36000000.0" == 36000000)"""
+    if old == new:
+        return True
+    try:
+        return float(old) == float(new)
+    except (TypeError, ValueError):
+        return False
+
+
+def index_cars(cars: Iterable[Dict[str, Any]], **extra) -> Dict[str, Dict[str, Any]]:
+    """
+    차량 리스트를 차대번호 기준 딕셔너리로 만듭니다.
+
+    같은 차량이 여러 번 나오면 처음 나온 것을 사용합니다.
+    차대번호가 없는 차량은 제외됩니다.
+    """
+    index = {}
+    for car in cars:
+        number = car.get("carProductionNumber")
+        if number and number not in index:
+            index[number] = compact_car(car, **extra)
+    return index
+
+
+def diff_index(
+    previous: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    complete: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    두 스냅샷을 비교하여 이벤트 리스트를 반환합니다.
+
+    Args:
+        previous: 이전 스냅샷 {차대번호: 차량}
+        current: 현재 스냅샷 {차대번호: 차량}
+        complete: 현재 스냅샷이 전체 재고인지 여부
+                  (페이지 크기보다 재고가 많아 일부만 받은 경우 False,
+                   이때는 출고 이벤트를 만들지 않습니다)
+
+    Returns:
+        [{"type": "added"|"removed"|"changed", "carProductionNumber": ...,
+          "car": {...}, "changes": {"price": (이전, 현재), ...}}, ...]
+    """
+    events = []
+
+    for number, car in current.items():
+        old = previous.get(number)
+        if old is None:
+            events.append({
+                "type": EVENT_ADDED,
+                "carProductionNumber": number,
+                "car": car,
+            })
+            continue
+
+        changes = {}
+        for field, label in WATCHED_FIELDS.items():
+            if field in car and not _same(old.get(field), car[field]):
+                changes[label] = (old.get(field), car[field])
+        if changes:
+            events.append({
+                "type": EVENT_CHANGED,
+                "carProductionNumber": number,
+                "car": car,
+                "changes": changes,
+            })
+
+    if complete:
+        for number, car in previous.items():
+            if number not in current:
+                events.append({
+                    "type": EVENT_REMOVED,
+                    "carProductionNumber": number,
+                    "car": car,
+                })
+
+    return events
+
+
+class InventoryDiff:
+    """조회 키별 스냅샷을 보관하며 변동 이벤트를 계산하는 클래스"""
+
+    def __init__(self):
+        self.snapshots: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def update(
+        self,
+        key: str,
+        cars: Iterable[Dict[str, Any]],
+        total_count: Optional[int] = None,
+        **extra
+    ) -> List[Dict[str, Any]]:
+        """
+        새 조회 결과로 스냅샷을 갱신하고 변동 이벤트를 반환합니다.
+
+        Args:
+            key: 조회 키 (예: 모델 코드)
+            cars: 이번 응답의 차량 리스트
+            total_count: 응답의 totalCount (차량 리스트보다 크면 일부만 받은 것으로 간주)
+            **extra: 스냅샷에 함께 보관할 추가 정보
+
+        Returns:
+            이벤트 리스트 (diff_index 참고)
+        """
+        current = index_cars(cars, **extra)
+        complete = total_count is None or len(current) >= total_count
+        return self.update_index(key, current, complete)
+
+    def update_index(
+        self,
+        key: str,
+        current: Dict[str, Dict[str, Any]],
+        complete: bool = True
+    ) -> List[Dict[str, Any]]:
+        """이미 만들어진 스냅샷으로 갱신합니다. (update, diff_index 참고)"""
+        previous = self.snapshots.get(key, {})
+        events = diff_index(previous, current, complete)
+
+        if not complete:
+            # 일부만 받은 경우 보이지 않은 이전 차량은 유지
+            merged = dict(previous)
+            merged.update(current)
+            current = merged
+
+        self.snapshots[key] = current
+        return events
+
+    def count(self, key: str) -> int:
+        """키의 현재 스냅샷 차량 수"""
+        return len(self.snapshots.get(key, {}))
+
+
+def summarize(events: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+    """(입고, 출고, 변경) 이벤트 개수를 반환합니다."""
+    added = sum(1 for e in events if e["type"] == EVENT_ADDED)
+    removed = sum(1 for e in events if e["type"] == EVENT_REMOVED)
+    changed = sum(1 for e in events if e["type"] == EVENT_CHANGED)
+    return added, removed, changed
+
+
+def _price(value: Any) -> str:
+    try:
+        return f"{int(float(value)):,}원"
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """이벤트를 한 줄 문자열로 변환합니다."""
+    car = event["car"]
+    label = f"{car.get('exteriorColorName', 'N/A')} | {car.get('carTrimName', 'N/A')}"
+    where = f" @{car['sido']} {car.get('sigun', '')}".rstrip() if car.get("sido") else ""
+
+    if event["type"] == EVENT_ADDED:
+        return f"🆕 입고: {label} - {_price(car.get('finalAmount'))} ({car.get('deliveryCenterName', 'N/A')}){where}"
+    if event["type"] == EVENT_REMOVED:
+        return f"🚚 출고: {label} - {_price(car.get('finalAmount'))} ({car.get('deliveryCenterName', 'N/A')}){where}"
+
+    parts = []
+    for name, (old, new) in event["changes"].items():
+        if name == "center":
+            parts.append(f"출고센터 {old} → {new}")
+        elif name == "discount":
+            parts.append(f"할인 {_price(old)} → {_price(new)}")
+        else:
+            parts.append(f"가격 {_price(old)} → {_price(new)}")
+    return f"🔄 변경: {label} - {', '.join(parts)}{where}"
+
+
+def print_events(events: List[Dict[str, Any]], indent: str = "  ", limit: int = 5):
+    """
+    이벤트를 종류별로 최대 limit개씩 출력합니다.
+    """
+    for kind in (EVENT_ADDED, EVENT_CHANGED, EVENT_REMOVED):
+        selected = [e for e in events if e["type"] == kind]
+        for event in selected[:limit]:
+            print(f"{indent}{format_event(event)}")
+        if len(selected) > limit:
+            print(f"{indent}   ... 외 {len(selected) - limit}건")
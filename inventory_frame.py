@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+열(column) 단위 재고 프레임
+
+검색 결과를 차량 dict 리스트 대신 열별 배열로 보관하여 최저가/최고가,
+분위수, 상위 k개, 그룹별 집계를 한 번에 계산합니다.
+
+- 숫자 열(가격, 할인 금액, 할인율)은 float64 배열 (없는 값은 NaN)
+- 범주 열(색상, 트림, 출고센터, 시도, 시군구 등)은 정수 코드 + 이름 목록
+- NumPy가 설치되어 있으면 벡터 연산을 사용하고, 없으면 표준 라이브러리
+  array 모듈로 같은 결과를 계산합니다.
+
+Examples:
+    >>> frame = InventoryFrame.from_results(results)
+    >>> frame.min("price"), frame.quantile("price", 0.5)
+    >>> frame.groupby("center")                      # {출고센터: {"count": n}}
+    >>> frame.groupby(("sido", "sigun"), "price", ("count", "min", "max"))
+    >>> [frame.row(i) for i in frame.top_k("discount_rate", 3)]
+"""
+
+import math
+import heapq
+from array import array
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple, Union
+
+from car import Car
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 없이도 동작
+    np = None
+
+
+NUMERIC_COLUMNS = ("price", "discount", "car_price", "discount_rate")
+CATEGORICAL_COLUMNS = ("car_code", "color", "trim", "center", "sido", "sigun")
+AMOUNT_COLUMNS = ("price", "discount", "car_price")
+
+AGGREGATES = ("count", "min", "max", "mean", "sum")
+
+NAN = float("nan")
+
+
+def _number(value: Any) -> float:
+    if value is None or value == "":
+        return NAN
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class _Categorical:
+    """범주 열: 행별 정수 코드와 코드별 이름"""
+
+    __slots__ = ("codes", "labels", "lookup")
+
+    def __init__(self):
+        self.codes = array('i')
+        self.labels: List[Any] = []
+        self.lookup: Dict[Any, int] = {}
+
+    def append(self, value: Any):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.labels)
+            self.labels.append(value)
+        self.codes.append(code)
+
+
+class InventoryFrame:
+    """
+    열 단위 재고 프레임
+    """
+
+    def __init__(self):
+        self.numbers: List[Any] = []
+        self.numeric: Dict[str, array] = {name: array('d') for name in NUMERIC_COLUMNS}
+        self.categorical: Dict[str, _Categorical] = {name: _Categorical() for name in CATEGORICAL_COLUMNS}
+
+    # --- 만들기 ---
+
+    def add(self, number: Any = None, **values):
+        """
+        행 1개를 추가합니다.
+
+        Args:
+            number: 차대번호
+            **values: NUMERIC_COLUMNS / CATEGORICAL_COLUMNS 값 (없는 열은 빈 값)
+        """
+        self.numbers.append(number)
+        for name, column in self.numeric.items():
+            column.append(_number(values.get(name)))
+        for name, column in self.categorical.items():
+            column.append(values.get(name))
+
+    def append(self, car: Any, sido: Optional[str] = None, sigun: Optional[str] = None):
+        """차량 1대를 추가합니다. (Car 또는 API 응답 dict)"""
+        if isinstance(car, Car):
+            self.add(
+                car.car_production_number,
+                price=car.price,
+                discount=car.discount,
+                car_price=car.car_price,
+                discount_rate=car.discount_rate,
+                car_code=car.car_code,
+                color=car.color,
+                trim=car.trim,
+                center=car.center,
+                sido=sido,
+                sigun=sigun,
+            )
+            return
+        get = car.get
+        self.add(
+            get("carProductionNumber"),
+            price=get("finalAmount"),
+            discount=get("discountPrice"),
+            car_price=get("carPrice"),
+            discount_rate=get("discountRate"),
+            car_code=get("carCode"),
+            color=get("exteriorColorName"),
+            trim=get("carTrimName"),
+            center=get("deliveryCenterName"),
+            sido=sido,
+            sigun=sigun,
+        )
+
+    def extend(self, cars: Iterable[Any], sido: Optional[str] = None, sigun: Optional[str] = None):
+        """차량 여러 대를 추가합니다."""
+        for car in cars:
+            self.append(car, sido, sigun)
+
+    @classmethod
+    def from_cars(cls, cars: Iterable[Any]) -> "InventoryFrame":
+        """차량 리스트로 프레임을 만듭니다."""
+        frame = cls()
+        frame.extend(cars)
+        return frame
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Dict[str, List[Any]]]) -> "InventoryFrame":
+        """{시도: {시군구: [차량, ...]}} 검색 결과로 프레임을 만듭니다."""
+        frame = cls()
+        for sido, sigun_dict in results.items():
+            for sigun, cars in (sigun_dict or {}).items():
+                frame.extend(cars, sido, sigun)
+        return frame
+
+    @classmethod
+    def from_observations(cls, rows: Iterable[Dict[str, Any]]) -> "InventoryFrame":
+        """history_store.HistoryStore.observations() 결과로 프레임을 만듭니다."""
+        frame = cls()
+        for row in rows:
+            frame.add(
+                row.get("car_production_number"),
+                price=row.get("price"),
+                discount=row.get("discount"),
+                discount_rate=row.get("discount_rate"),
+                car_code=row.get("car_code"),
+                color=row.get("color"),
+                trim=row.get("trim"),
+                center=row.get("center_name"),
+                sido=row.get("sido"),
+                sigun=row.get("sigun"),
+            )
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    # --- 읽기 ---
+
+    def values(self, column: str):
+        """숫자 열 (NumPy 배열 또는 array('d'), 복사 없음)"""
+        data = self.numeric[column]
+        return np.frombuffer(data, dtype=np.float64) if np is not None and len(data) else data
+
+    def codes(self, column: str):
+        """범주 열의 정수 코드 (NumPy 배열 또는 array('i'))"""
+        data = self.categorical[column].codes
+        return np.frombuffer(data, dtype=np.int32) if np is not None and len(data) else data
+
+    def labels(self, column: str) -> List[Any]:
+        """범주 열의 이름 목록 (코드 순)"""
+        return self.categorical[column].labels
+
+    def _present(self, column: str, value: float) -> Any:
+        if value != value:  # NaN
+            return None
+        return int(value) if column in AMOUNT_COLUMNS else value
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """행 1개를 dict 로 반환합니다."""
+        row = {"carProductionNumber": self.numbers[index]}
+        for name, column in self.numeric.items():
+            row[name] = self._present(name, column[index])
+        for name, column in self.categorical.items():
+            row[name] = column.labels[column.codes[index]]
+        return row
+
+    # --- 집계 ---
+
+    def _valid(self, column: str) -> List[float]:
+        return [v for v in self.numeric[column] if v == v]
+
+    def min(self, column: str) -> Optional[Union[int, float]]:
+        """열의 최솟값 (값이 없으면 None)"""
+        if np is not None and len(self):
+            values = self.values(column)
+            if np.isnan(values).all():
+                return None
+            return self._present(column, float(np.nanmin(values)))
+        valid = self._valid(column)
+        return self._present(column, min(valid)) if valid else None
+
+    def max(self, column: str) -> Optional[Union[int, float]]:
+        """열의 최댓값 (값이 없으면 None)"""
+        if np is not None and len(self):
+            values = self.values(column)
+            if np.isnan(values).all():
+                return None
+            return self._present(column, float(np.nanmax(values)))
+        valid = self._valid(column)
+        return self._present(column, max(valid)) if valid else None
+
+    def quantile(self, column: str, q: Union[float, Sequence[float]]) -> Any:
+        """
+        분위수 (선형 보간, numpy.quantile 기본 방식과 같음)
+
+        Args:
+            column: 숫자 열
+            q: 0~1 사이 값 또는 값 리스트
+
+        Returns:
+            q가 리스트면 리스트, 아니면 값 하나 (값이 없으면 None)
+        """
+        qs = [q] if isinstance(q, (int, float)) else list(q)
+        if np is not None and len(self):
+            values = self.values(column)
+            values = values[~np.isnan(values)]
+            result = [float(v) for v in np.quantile(values, qs)] if len(values) else [None] * len(qs)
+        else:
+            values = sorted(self._valid(column))
+            result = []
+            for p in qs:
+                if not values:
+                    result.append(None)
+                    continue
+                pos = p * (len(values) - 1)
+                lo, hi = math.floor(pos), math.ceil(pos)
+                result.append(values[lo] + (values[hi] - values[lo]) * (pos - lo))
+        return result[0] if isinstance(q, (int, float)) else result
+
+    def top_k(self, column: str, k: int, largest: bool = True) -> List[int]:
+        """
+        열 값 기준 상위(또는 하위) k개 행 번호 (정렬됨, 빈 값 제외)
+        """
+        if k <= 0 or not len(self):
+            return []
+        if np is not None:
+            values = self.values(column)
+            index = np.flatnonzero(~np.isnan(values))
+            keys = values[index] if largest else -values[index]
+            if len(index) > k:
+                # 경계값과 같은 행은 앞쪽 행부터 채움 (heapq 결과와 동일)
+                threshold = -np.partition(-keys, k - 1)[k - 1]
+                above = keys > threshold
+                ties = np.flatnonzero(keys == threshold)[:k - int(above.sum())]
+                pick = np.concatenate([np.flatnonzero(above), ties])
+                index, keys = index[pick], keys[pick]
+            order = np.argsort(-keys, kind="stable")
+            return [int(i) for i in index[order]]
+        data = self.numeric[column]
+        pick = heapq.nlargest if largest else heapq.nsmallest
+        return pick(k, (i for i in range(len(data)) if data[i] == data[i]), key=data.__getitem__)
+
+    def groupby(
+        self,
+        keys: Union[str, Tuple[str, ...]],
+        column: Optional[str] = None,
+        aggregates: Sequence[str] = ("count",)
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        범주 열 기준 그룹별 집계
+
+        Args:
+            keys: 범주 열 이름 또는 이름 튜플
+            column: 집계할 숫자 열 (count만 쓰면 생략 가능)
+            aggregates: "count", "min", "max", "mean", "sum" 중 선택
+                (count는 행 수, 나머지는 빈 값 제외)
+
+        Returns:
+            {그룹 이름(키가 여러 개면 튜플): {집계 이름: 값}}
+        """
+        unknown = set(aggregates) - set(AGGREGATES)
+        if unknown:
+            raise ValueError(f"지원하지 않는 집계: {', '.join(sorted(unknown))}")
+        if column is None and set(aggregates) - {"count"}:
+            raise ValueError("count 외의 집계에는 column이 필요합니다.")
+
+        names = (keys,) if isinstance(keys, str) else tuple(keys)
+        columns = [self.categorical[name] for name in names]
+        if not len(self):
+            return {}
+
+        def label(group: Tuple[int, ...]) -> Any:
+            values = tuple(col.labels[code] for col, code in zip(columns, group))
+            return values[0] if len(values) == 1 else values
+
+        if np is not None:
+            return self._groupby_numpy(names, columns, column, aggregates, label)
+
+        stats: Dict[Tuple[int, ...], List[float]] = {}
+        data = self.numeric[column] if column else None
+        code_columns = [col.codes for col in columns]
+        for i in range(len(self)):
+            group = tuple(codes[i] for codes in code_columns)
+            entry = stats.get(group)
+            if entry is None:
+                entry = stats[group] = [0, 0, 0.0, math.inf, -math.inf]  # 행 수, 값 수, 합, 최소, 최대
+            entry[0] += 1
+            if data is not None:
+                value = data[i]
+                if value == value:
+                    entry[1] += 1
+                    entry[2] += value
+                    if value < entry[3]:
+                        entry[3] = value
+                    if value > entry[4]:
+                        entry[4] = value
+
+        result = {}
+        for group, (rows, n, total, low, high) in stats.items():
+            result[label(group)] = self._aggregate(column, aggregates, rows, n, total, low, high)
+        return result
+
+    def _groupby_numpy(self, names, columns, column, aggregates, label) -> Dict[Any, Dict[str, Any]]:
+        # 여러 키의 코드를 하나의 그룹 번호로 합침
+        combined = np.zeros(len(self), dtype=np.int64)
+        for name, col in zip(names, columns):
+            combined = combined * max(len(col.labels), 1) + self.codes(name)
+        groups, inverse = np.unique(combined, return_inverse=True)
+        rows = np.bincount(inverse, minlength=len(groups))
+
+        n = total = low = high = None
+        if column:
+            values = self.values(column)
+            valid = ~np.isnan(values)
+            n = np.bincount(inverse[valid], minlength=len(groups))
+            total = np.bincount(inverse[valid], weights=values[valid], minlength=len(groups))
+            low = np.full(len(groups), np.inf)
+            high = np.full(len(groups), -np.inf)
+            np.minimum.at(low, inverse[valid], values[valid])
+            np.maximum.at(high, inverse[valid], values[valid])
+
+        result = {}
+        sizes = [max(len(col.labels), 1) for col in columns]
+        for g, key in enumerate(groups.tolist()):
+            group = []
+            for size in reversed(sizes):
+                key, code = divmod(key, size)
+                group.append(code)
+            group = tuple(reversed(group))
+            if column:
+                agg = self._aggregate(column, aggregates, int(rows[g]), int(n[g]), float(total[g]),
+                                      float(low[g]), float(high[g]))
+            else:
+                agg = self._aggregate(column, aggregates, int(rows[g]), 0, 0.0, math.inf, -math.inf)
+            result[label(group)] = agg
+        return result
+
+    def _aggregate(self, column, aggregates, rows, n, total, low, high) -> Dict[str, Any]:
+        result = {}
+        for name in aggregates:
+            if name == "count":
+                result[name] = rows
+            elif n == 0:
+                result[name] = None
+            elif name == "min":
+                result[name] = self._present(column, low)
+            elif name == "max":
+                result[name] = self._present(column, high)
+            elif name == "sum":
+                result[name] = self._present(column, total)
+            elif name == "mean":
+                result[name] = total / n
+        return result
+
+    def counts(self, key: str) -> Dict[Any, int]:
+        """범주 열 값별 행 수"""
+        return {group: agg["count"] for group, agg in self.groupby(key).items()}
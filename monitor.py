@@ -6,14 +6,29 @@
 """
 
 import time
+import json
 from casper_checker import CasperChecker, CarModel
+from inventory_diff import InventoryDiff, summarize, print_events
+from monitor_scheduler import AdaptiveInterval, StaggeredScheduler, describe_interval
+from notifier import Notifier, ConsoleSink
+from change_log import ChangeLog
+from monitor_state import MonitorState
+from sweep_planner import get_latency_history, LATENCY_SAVE_INTERVAL
 from typing import Optional, Dict, List
 
 
 def monitor_stock(
     interval: int = 60, 
     models: Optional[List[CarModel]] = None,
-    custom_params: dict = None
+    custom_params: dict = None,
+    adaptive: bool = False,
+    min_interval: Optional[float] = None,
+    max_interval: Optional[float] = None,
+    max_requests_per_hour: Optional[int] = None,
+    notifier: Optional[Notifier] = None,
+    change_log: Optional[ChangeLog] = None,
+    staggered: bool = False,
+    state_file: Optional[str] = "monitor_state.json"
 ):
     """
     재고를 주기적으로 모니터링합니다.
@@ -22,8 +37,21 @@ def monitor_stock(
         interval: 확인 주기 (초 단위, 기본 60초)
         models: 모니터링할 모델 리스트 (None이면 전체)
         custom_params: 커스텀 파라미터
+        adaptive: 재고 변동/시간대에 따라 주기를 자동 조절할지 여부
+        min_interval: 적응형 최소 주기 (초)
+        max_interval: 적응형 최대 주기 (초)
+        max_requests_per_hour: 적응형 시간당 최대 요청 수
+        notifier: 재고 변동 알림 파이프라인 (있으면 이벤트를 비동기로 전달,
+                  시작하지 않았으면 여기서 시작하고 종료할 때 멈춤)
+        change_log: 변동 이벤트 로그 (있으면 이벤트를 기록)
+        staggered: 모델별 조회를 주기 안에 고르게 나눠 보낼지 여부
+                   (False면 주기 시작 시 모든 모델을 연달아 조회)
+        state_file: 모니터 상태 파일 (재시작 시 이전 스냅샷부터 이어서 비교, None이면 저장 안 함)
     """
     checker = CasperChecker()
+    checker.query_cache = None  # 매 확인마다 새 결과 필요
+    if notifier:
+        notifier.start()
     
     if models is None:
         models = list(CarModel)
@@ -33,13 +61,87 @@ def monitor_stock(
         print(f"🔍 캐스퍼 재고 모니터링 시작")
         print(f"대상 모델: {', '.join(model_names)}")
     
-    print(f"확인 주기: {interval}초")
+    scheduler = None
+    if adaptive:
+        scheduler = AdaptiveInterval(
+            interval,
+            floor=min_interval,
+            ceiling=max_interval,
+            max_requests_per_hour=max_requests_per_hour,
+            requests_per_tick=len(models)
+        )
+        print(f"확인 주기: 적응형 ({describe_interval(scheduler.floor)} ~ "
+              f"{describe_interval(scheduler.ceiling)}, 기본 {interval}초)")
+    else:
+        print(f"확인 주기: {interval}초")
     print("중단하려면 Ctrl+C를 누르세요\n")
     
-    last_counts = {model: 0 for model in models}
+    stagger = None
+    if staggered:
+        stagger = StaggeredScheduler(models, interval)
+        print(f"조회 분산: 모델 {len(models)}개를 {describe_interval(stagger.slot)} 간격으로 나눠 조회")
+    
+    diff = InventoryDiff()
+    state = MonitorState(state_file) if state_file else None
+    if state:
+        state.restore(diff)
+        print(f"💾 {state.describe()}")
     check_count = 0
     
+    def state_key(model: CarModel) -> str:
+        """스냅샷 키 (커스텀 파라미터가 있으면 파라미터까지 포함)"""
+        if custom_params:
+            return f"{model.value['carCode']}:{json.dumps(custom_params, sort_keys=True, ensure_ascii=False)}"
+        return model.value['carCode']
+    
+    def check_model(model: CarModel) -> bool:
+        """모델 1개를 조회하고 변동 여부를 반환합니다."""
+        # 개수와 차량 리스트를 한 번의 요청으로 조회
+        if custom_params:
+            count, cars = checker.get_count_and_cars(custom_params=custom_params)
+        else:
+            count, cars = checker.get_count_and_cars(model)
+        
+        model_name = model.value['name']
+        
+        if count is None:
+            print(f"⚠️  {model_name:<25} | 조회 실패 (이전 상태 유지)")
+            return False
+        
+        status = "✅" if count > 0 else "❌"
+        
+        print(f"{status} {model_name:<25} | 재고: {count:>3}대", end="")
+        
+        # 재고 변동 감지 (차대번호 기준)
+        key = state_key(model)
+        known = key in diff.snapshots
+        events = diff.update(key, cars, total_count=count)
+        if not known:
+            # 이전 스냅샷이 없으면 기준만 기록 (기존 재고를 입고로 보고/기록하지 않음)
+            print(" (기준 스냅샷)")
+            return False
+        if not events:
+            print()
+            return False
+        
+        added, removed, updated = summarize(events)
+        print(f" 🎉 입고 {added} · 출고 {removed} · 변경 {updated}")
+        if not notifier:
+            print_events(events, indent="  └─ ", limit=3)
+        if change_log:
+            change_log.append_events(events, exhibition_no="R0003")
+        if notifier:
+            notifier.publish(events, model=model.value['carCode'])
+        return True
+    
     try:
+        # 최근에 확인한 상태라면 남은 주기만큼 기다린 뒤 시작
+        if state:
+            wait = state.remaining_wait(interval)
+            if wait > 0:
+                print(f"⏳ 마지막 확인 후 주기가 지나지 않아 {describe_interval(wait)} 후 시작합니다...")
+                time.sleep(wait)
+        
         while True:
             check_count += 1
             current_time = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -48,52 +150,52 @@ def monitor_stock(
             print(f"[확인 #{check_count}] {current_time}")
             print(f"{'='*70}")
             
-            for model in models:
-                if custom_params:
-                    count = checker.get_car_count(custom_params=custom_params)
+            changed = False
+            for i in range(len(models)):
+                if stagger:
+                    # 모델별 예정 시각까지 대기 후 조회
+                    model, wait = stagger.next()
+                    time.sleep(wait)
+                    changed = check_model(model) or changed
+                    stagger.mark_done(model)
                 else:
-                    count = checker.get_car_count(model)
-                
-                model_name = model.value['name']
-                status = "✅" if count > 0 else "❌"
-                
-                print(f"{status} {model_name:<25} | 재고: {count:>3}대", end="")
-                
-                # 재고 변동 감지
-                last_count = last_counts[model]
-                if count != last_count:
-                    if count > last_count:
-                        print(f" 🎉 +{count - last_count}대 증가!")
-                        
-                        # 새로 들어온 차량 정보 간단히 출력
-                        cars = checker.get_car_list(model) if not custom_params else checker.get_car_list(custom_params=custom_params)
-                        if cars:
-                            print(f"  └─ 새 차량:")
-                            for i, car in enumerate(cars[:3], 1):
-                                print(f"     {i}. {car['exteriorColorName']} - {int(car['finalAmount']):,}원")
-                    elif count < last_count:
-                        print(f" 📉 -{last_count - count}대 감소")
-                    
-                    last_counts[model] = count
-                else:
-                    print()
+                    changed = check_model(models[i]) or changed
             
-            time.sleep(interval)
+            if state:
+                state.save(diff)
+            # 요청 지연 기록 (스윕 계획/--budget 예상치에 사용)
+            get_latency_history().save(LATENCY_SAVE_INTERVAL)
+            
+            if scheduler:
+                scheduler.record_requests()
+                wait = scheduler.next_interval(changed)
+                if stagger:
+                    stagger.set_interval(wait)
+                else:
+                    print(f"\n⏳ {describe_interval(wait)} 후 다시 확인합니다...")
+                    time.sleep(wait)
+            elif not stagger:
+                time.sleep(interval)
             
     except KeyboardInterrupt:
         print("\n\n✋ 모니터링을 종료합니다.")
         print(f"총 {check_count}번 확인했습니다.")
+    finally:
+        get_latency_history().save()
+        if notifier:
+            notifier.stop()
 
 
-def monitor_specific_model(model: CarModel, interval: int = 60):
+def monitor_specific_model(model: CarModel, interval: int = 60, notifier: Optional[Notifier] = None):
     """
     특정 모델만 모니터링합니다.
     
     Args:
         model: 모니터링할 CarModel
         interval: 확인 주기 (초)
+        notifier: 재고 변동 알림 파이프라인
     """
-    monitor_stock(interval=interval, models=[model])
+    monitor_stock(interval=interval, models=[model], notifier=notifier)
 
 
 if __name__ == "__main__":
@@ -106,25 +208,41 @@ if __name__ == "__main__":
     print("4. 캐스퍼 일렉트릭만")
     print("5. 더 뉴 캐스퍼만")
     print("6. 전기차 모델만 (2026 일렉트릭 + 일렉트릭)")
+    print("7. 전체 모델 적응형 모니터링 (15초~10분, 변동 시 빠르게)")
+    
+    # 입고/출고 알림은 별도 스레드에서 출력 (monitor_stock 이 시작/종료)
+    notifier = Notifier([ConsoleSink()])
     
     try:
-        choice = input("\n선택 (1-6, Enter=전체): ").strip()
+        choice = input("\n선택 (1-7, Enter=전체): ").strip()
         
         if choice == "2":
-            monitor_specific_model(CarModel.CASPER_ELECTRIC_2026)
+            monitor_specific_model(CarModel.CASPER_ELECTRIC_2026, notifier=notifier)
         elif choice == "3":
-            monitor_specific_model(CarModel.CASPER_2026)
+            monitor_specific_model(CarModel.CASPER_2026, notifier=notifier)
         elif choice == "4":
-            monitor_specific_model(CarModel.CASPER_ELECTRIC)
+            monitor_specific_model(CarModel.CASPER_ELECTRIC, notifier=notifier)
         elif choice == "5":
-            monitor_specific_model(CarModel.CASPER_NEW)
+            monitor_specific_model(CarModel.CASPER_NEW, notifier=notifier)
         elif choice == "6":
             monitor_stock(
-                models=[CarModel.CASPER_ELECTRIC_2026, CarModel.CASPER_ELECTRIC]
+                models=[CarModel.CASPER_ELECTRIC_2026, CarModel.CASPER_ELECTRIC],
+                notifier=notifier
+            )
+        elif choice == "7":
+            monitor_stock(
+                interval=60,
+                notifier=notifier,
+                change_log=ChangeLog(),
+                staggered=True,
+                adaptive=True,
+                min_interval=15,
+                max_interval=600,
+                max_requests_per_hour=600
             )
         else:
-            # 기본: 전체 모델
-            monitor_stock(interval=60)
+            # 기본: 전체 모델 (주기 안에 분산 조회)
+            monitor_stock(interval=60, staggered=True, notifier=notifier)
             
     except KeyboardInterrupt:
         print("\n종료합니다.")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+모니터링 주기 스케줄러
+
+재고 변동 상황과 시간대별 변동 이력에 따라 확인 주기를 조절하고,
+여러 조회를 한 주기 안에 고르게 분산시킵니다.
+"""
+
+import os
+import json
+import time
+import random
+from collections import deque
+from typing import Any, Optional, Tuple
+
+
+class AdaptiveInterval:
+    """
+    적응형 확인 주기 계산기
+
+    - 재고 변동이 있으면 주기를 줄이고 (빠르게 추적)
+    - 변동 없는 확인이 이어지면 주기를 늘립니다 (요청 절약)
+    - 과거에 변동이 잦았던 시간대에는 주기를 더 짧게 잡습니다
+    - 최소/최대 주기와 시간당 요청 예산을 넘지 않습니다
+    """
+
+    def __init__(
+        self,
+        base: float,
+        floor: Optional[float] = None,
+        ceiling: Optional[float] = None,
+        max_requests_per_hour: Optional[int] = None,
+        requests_per_tick: int = 1,
+        patience: int = 3,
+        history_file: Optional[str] = "change_hours.json"
+    ):
+        """
+        Args:
+            base: 기본 주기 (초)
+            floor: 최소 주기 (초, 기본 base의 1/4)
+            ceiling: 최대 주기 (초, 기본 base의 8배)
+            max_requests_per_hour: 시간당 최대 요청 수 (None이면 제한 없음)
+            requests_per_tick: 한 번 확인할 때 보내는 요청 수
+            patience: 변동 없는 확인이 몇 번 이어지면 주기를 늘릴지
+            history_file: 시간대별 변동 이력 파일 (None이면 저장하지 않음)
+        """
+        self.base = base
+        self.floor = floor if floor is not None else max(base / 4, 1)
+        self.ceiling = ceiling if ceiling is not None else base * 8
+        self.max_requests_per_hour = max_requests_per_hour
+        self.requests_per_tick = requests_per_tick
+        self.patience = patience
+        self.history_file = history_file
+
+        self.current = min(max(base, self.floor), self.ceiling)
+        self.quiet_ticks = 0
+        self.hourly_changes = [0.0] * 24
+        self._requests = deque()
+        self._load_history()
+
+    def _load_history(self):
+        if not self.history_file or not os.path.exists(self.history_file):
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, list) and len(data) == 24:
+                self.hourly_changes = [float(v) for v in data]
+        except (OSError, ValueError):
+            pass
+
+    def _save_history(self):
+        if not self.history_file:
+            return
+        try:
+            with open(self.history_file, 'w', encoding='utf-8') as f:
+                json.dump([round(v, 3) for v in self.hourly_changes], f)
+        except OSError as e:
+            print(f"⚠️  변동 이력 저장 실패: {e}")
+
+    def is_busy_hour(self, hour: int) -> bool:
+        """해당 시간대가 평소보다 변동이 잦았는지 여부"""
+        total = sum(self.hourly_changes)
+        if total < 5:
+            return False
+        return self.hourly_changes[hour] > 1.5 * total / 24
+
+    def budget_floor(self) -> float:
+        """시간당 요청 예산을 지키기 위한 최소 주기"""
+        if not self.max_requests_per_hour:
+            return 0.0
+        return 3600.0 * self.requests_per_tick / self.max_requests_per_hour
+
+    def record_requests(self, count: Optional[int] = None, now: Optional[float] = None):
+        """실제로 보낸 요청 수를 기록합니다. (예산 계산용)"""
+        now = time.time() if now is None else now
+        self._requests.append((now, self.requests_per_tick if count is None else count))
+
+    def _wait_for_budget(self, now: float) -> float:
+        """지난 1시간 요청 수가 예산을 넘었으면 남은 대기 시간을 반환합니다."""
+        if not self.max_requests_per_hour:
+            return 0.0
+        while self._requests and self._requests[0][0] <= now - 3600:
+            self._requests.popleft()
+        used = sum(n for _, n in self._requests)
+        if used + self.requests_per_tick <= self.max_requests_per_hour:
+            return 0.0
+        # 가장 오래된 요청이 1시간 창을 벗어날 때까지 대기
+        return self._requests[0][0] + 3600 - now
+
+    def next_interval(self, changed: bool, now: Optional[float] = None) -> float:
+        """
+        이번 확인 결과를 반영하여 다음 확인까지 대기할 시간을 계산합니다.
+
+        Args:
+            changed: 이번 확인에서 재고 변동이 있었는지 여부
+            now: 현재 시각 (epoch 초, 기본 현재)
+
+        Returns:
+            다음 확인까지 대기 시간 (초)
+        """
+        now = time.time() if now is None else now
+        hour = time.localtime(now).tm_hour
+
+        # 시간대별 변동 이력 (오래된 이력은 서서히 감쇠)
+        if changed:
+            self.hourly_changes = [v * 0.98 for v in self.hourly_changes]
+            self.hourly_changes[hour] += 1
+            self._save_history()
+            self.quiet_ticks = 0
+            self.current = max(self.floor, self.current / 2)
+        else:
+            self.quiet_ticks += 1
+            if self.quiet_ticks >= self.patience:
+                self.current = min(self.ceiling, self.current * 1.5)
+
+        interval = self.current
+        if self.is_busy_hour(hour):
+            interval = max(self.floor, interval / 2)
+
+        interval = max(interval, self.budget_floor())
+        interval = max(interval, self._wait_for_budget(now))
+        return interval
+
+
+def describe_interval(seconds: float) -> str:
+    """대기 시간을 사람이 읽기 쉬운 문자열로 변환합니다."""
+    if seconds < 60:
+        return f"{seconds:.0f}초"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}분"
+    return f"{seconds / 3600:.1f}시간"
+
+
+class StaggeredScheduler:
+    """
+    여러 조회 키를 한 주기 안에 고르게 분산시키는 스케줄러
+
+    키마다 주기 내 위상(phase)을 나눠 갖고, 매 조회 시각에 약간의 무작위
+    지터를 더합니다. 다음 예정 시각은 지터 없이 정확히 주기만큼 증가하므로
+    각 키는 목표 주기대로 조회됩니다.
+
+    Examples:
+        >>> stagger = StaggeredScheduler(["AX05", "AX06"], interval=60)
+        >>> key, wait = stagger.next()
+        >>> time.sleep(wait); poll(key); stagger.mark_done(key)
+    """
+
+    def __init__(
+        self,
+        keys,
+        interval: float,
+        jitter: float = 0.2,
+        start: Optional[float] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            keys: 조회 키 리스트
+            interval: 키별 조회 주기 (초)
+            jitter: 지터 크기 (키 사이 간격 대비 비율, 0~0.5)
+            start: 첫 조회 기준 시각 (time.monotonic 기준, 기본 현재)
+            rng: 난수 생성기 (테스트용)
+        """
+        self.keys = list(keys)
+        self.interval = interval
+        self.jitter = min(max(jitter, 0.0), 0.5)
+        self.rng = rng or random.Random()
+        start = time.monotonic() if start is None else start
+        self._due = {key: start + self._phase(i) for i, key in enumerate(self.keys)}
+
+    @property
+    def slot(self) -> float:
+        """키 사이의 간격 (초)"""
+        return self.interval / max(len(self.keys), 1)
+
+    def _phase(self, index: int) -> float:
+        return index * self.slot
+
+    def set_interval(self, interval: float, now: Optional[float] = None):
+        """
+        주기를 변경합니다. 키들의 순서와 상대 위상은 유지됩니다.
+        """
+        now = time.monotonic() if now is None else now
+        order = sorted(self.keys, key=lambda k: self._due[k])
+        self.interval = interval
+        first = max(now, self._due[order[0]]) if order else now
+        for i, key in enumerate(order):
+            self._due[key] = first + self._phase(i)
+
+    def next(self, now: Optional[float] = None) -> Tuple[Any, float]:
+        """
+        다음에 조회할 키와 그때까지의 대기 시간을 반환합니다.
+
+        Returns:
+            (키, 대기 시간(초))
+        """
+        now = time.monotonic() if now is None else now
+        key = min(self.keys, key=lambda k: self._due[k])
+        offset = self.rng.uniform(-self.jitter, self.jitter) * self.slot
+        return key, max(0.0, self._due[key] + offset - now)
+
+    def mark_done(self, key, now: Optional[float] = None):
+        """
+        키 조회가 끝났음을 기록하고 다음 예정 시각을 정합니다.
+
+        조회가 한 주기 이상 밀렸으면 밀린 조회를 몰아서 하지 않고 현재 기준으로 다시 맞춥니다.
+        """
+        now = time.monotonic() if now is None else now
+        due = self._due[key] + self.interval
+        if due < now:
+            due += ((now - due) // self.interval + 1) * self.interval
+        self._due[key] = due
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+모니터 상태 저장 모듈
+
+매 확인이 끝날 때마다 조회 키별 마지막 스냅샷과 확인 시각을 파일로 저장하고,
+재시작 시 다시 읽어 이전 상태와 바로 비교할 수 있게 합니다.
+(재시작 직후 전체 재고가 새로 입고된 것처럼 알림이 쏟아지는 것을 막습니다)
+"""
+
+import os
+import json
+import time
+from typing import Dict, Any, Optional
+
+from inventory_diff import InventoryDiff
+
+
+STATE_VERSION = 1
+
+
+class MonitorState:
+    """
+    InventoryDiff 스냅샷과 마지막 확인 시각을 파일에 보관하는 클래스
+
+    Examples:
+        >>> state = MonitorState("monitor_state.json")
+        >>> diff = InventoryDiff()
+        >>> state.restore(diff)          # 이전 스냅샷 복원
+        >>> ...                          # 확인
+        >>> state.save(diff)             # 확인 후 저장
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.last_tick: Optional[float] = None
+        self.snapshots: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.extra: Dict[str, Any] = {}
+        self.loaded = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  모니터 상태 로드 실패 ({self.filename}): {e}")
+            return
+
+        if data.get("version") != STATE_VERSION:
+            print(f"⚠️  모니터 상태 버전이 달라 무시합니다: {self.filename}")
+            return
+
+        self.last_tick = data.get("last_tick")
+        self.snapshots = data.get("snapshots", {})
+        self.extra = data.get("extra", {})
+        self.loaded = True
+
+    def restore(self, diff: InventoryDiff) -> int:
+        """
+        저장된 스냅샷을 diff에 복원합니다.
+
+        Returns:
+            복원된 조회 키 수
+        """
+        diff.snapshots.update(self.snapshots)
+        return len(self.snapshots)
+
+    def has(self, key: str) -> bool:
+        """해당 조회 키의 스냅샷이 저장되어 있는지 여부"""
+        return key in self.snapshots
+
+    def age(self, now: Optional[float] = None) -> Optional[float]:
+        """마지막 확인 이후 경과 시간 (초, 기록이 없으면 None)"""
+        if self.last_tick is None:
+            return None
+        now = time.time() if now is None else now
+        return max(0.0, now - self.last_tick)
+
+    def remaining_wait(self, interval: float, now: Optional[float] = None) -> float:
+        """
+        마지막 확인 시각 기준으로 다음 확인까지 남은 시간을 반환합니다.
+
+        재시작 직후 주기보다 일찍 다시 조회하지 않도록 할 때 사용합니다.
+        """
+        age = self.age(now)
+        if age is None:
+            return 0.0
+        return max(0.0, interval - age)
+
+    def save(self, diff: InventoryDiff, now: Optional[float] = None, **extra):
+        """
+        현재 스냅샷과 확인 시각을 저장합니다.
+
+        임시 파일에 쓴 뒤 교체하므로 저장 도중 종료되어도 이전 상태가 유지됩니다.
+
+        Args:
+            diff: 저장할 InventoryDiff
+            now: 확인 시각 (epoch 초, 기본 현재)
+            **extra: 함께 저장할 정보 (예: interval)
+        """
+        self.last_tick = time.time() if now is None else now
+        self.snapshots = diff.snapshots
+        self.extra.update(extra)
+
+        data = {
+            "version": STATE_VERSION,
+            "last_tick": self.last_tick,
+            "snapshots": self.snapshots,
+            "extra": self.extra,
+        }
+        tmp = f"{self.filename}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, self.filename)
+        except OSError as e:
+            print(f"⚠️  모니터 상태 저장 실패: {e}")
+
+    def describe(self) -> str:
+        """상태 요약 문자열"""
+        if not self.loaded:
+            return "저장된 상태 없음 (새로 시작)"
+        cars = sum(len(s) for s in self.snapshots.values())
+        age = self.age() or 0.0
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.last_tick)) if self.last_tick else "?"
+        return f"이전 상태 복원: 조회 키 {len(self.snapshots)}개, 차량 {cars}대 (마지막 확인 {when}, {age:.0f}초 전)"
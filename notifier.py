@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+재고 이벤트 비동기 알림 모듈
+
+모니터링 루프는 이벤트를 큐에 넣기만 하고 바로 다음 조회로 넘어갑니다.
+백그라운드 작업자들이 짧은 시간 동안 모인 이벤트를 묶어서 알림 대상
+(콘솔, 웹훅 등)에 전달하며, 실패하면 재시도합니다. 같은 차량에 대한
+같은 알림은 일정 시간 동안 한 번만 보냅니다. (재시도 후에도 전달하지 못했거나
+큐가 가득 차 버린 알림은 다음에 다시 보냄)
+"""
+
+import time
+import queue
+import threading
+from typing import Dict, List, Any, Callable, Optional, Iterable
+
+
+Sink = Callable[[List[Dict[str, Any]]], None]
+
+
+def event_key(event: Dict[str, Any]) -> tuple:
+    """중복 판별용 키: (차대번호, 이벤트 종류, 변경 내용)"""
+    changes = event.get("changes") or {}
+    return (
+        event.get("carProductionNumber"),
+        event.get("type"),
+        tuple(sorted((k, str(v)) for k, v in changes.items())),
+        event.get("rule", ""),
+    )
+
+
+class ConsoleSink:
+    """이벤트를 콘솔에 출력하는 알림 대상"""
+
+    def __call__(self, events: List[Dict[str, Any]]) -> None:
+        from inventory_diff import format_event
+        for event in events:
+            prefix = f"[{event['rule']}] " if event.get("rule") else ""
+            print(f"🔔 {prefix}{format_event(event)}")
+
+
+class WebhookSink:
+    """이벤트 묶음을 JSON으로 POST 하는 알림 대상"""
+
+    def __init__(self, url: str, timeout: float = 10, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {"content-type": "application/json;charset=UTF-8"}
+
+    def __call__(self, events: List[Dict[str, Any]]) -> None:
+        import requests
+        response = requests.post(
+            self.url,
+            headers=self.headers,
+            json={"events": events, "count": len(events)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class Notifier:
+    """
+    제한된 크기의 큐와 작업자 스레드로 동작하는 알림 파이프라인
+
+    Examples:
+        >>> notifier = Notifier([ConsoleSink(), WebhookSink("http://localhost:8080/hook")])
+        >>> notifier.start()
+        >>> notifier.publish(events)   # 즉시 반환
+        >>> notifier.stop()
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[Sink],
+        max_queue: int = 1000,
+        workers: int = 2,
+        batch_window: float = 2.0,
+        max_batch: int = 50,
+        dedup_ttl: float = 600.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0
+    ):
+        """
+        Args:
+            sinks: 알림 대상 리스트 (이벤트 리스트를 받는 callable)
+            max_queue: 큐 최대 크기 (가득 차면 새 이벤트는 버림)
+            workers: 작업자 스레드 수
+            batch_window: 이벤트를 묶는 시간 (초)
+            max_batch: 한 번에 보내는 최대 이벤트 수
+            dedup_ttl: 같은 알림을 다시 보내지 않는 시간 (초)
+            max_retries: 알림 대상별 최대 재시도 횟수
+            retry_delay: 첫 재시도 대기 시간 (초, 재시도마다 2배)
+        """
+        self.sinks = list(sinks)
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.dedup_ttl = dedup_ttl
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._seen: Dict[tuple, float] = {}
+        self._seen_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()  # stats
+
+        self.stats = {"published": 0, "duplicate": 0, "dropped": 0, "delivered": 0, "failed": 0}
+
+    def start(self) -> "Notifier":
+        """작업자 스레드를 시작합니다."""
+        if self._threads:
+            return self
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"notifier-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """
+        남은 이벤트를 처리한 뒤 작업자를 종료합니다.
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+        """
+        deadline = time.monotonic() + timeout
+        while not self.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def _is_duplicate(self, event: Dict[str, Any]) -> bool:
+        now = time.monotonic()
+        key = event_key(event)
+        with self._seen_lock:
+            # 만료된 항목 정리
+            if len(self._seen) > 10000:
+                self._seen = {k: t for k, t in self._seen.items() if now - t < self.dedup_ttl}
+            last = self._seen.get(key)
+            if last is not None and now - last < self.dedup_ttl:
+                return True
+            self._seen[key] = now  # 전달 중인 알림도 중복으로 봄
+            return False
+
+    def _forget(self, events: Iterable[Dict[str, Any]]):
+        """전달하지 못한 이벤트의 중복 기록을 지워 다음에 다시 보낼 수 있게 합니다."""
+        with self._seen_lock:
+            for event in events:
+                self._seen.pop(event_key(event), None)
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def publish(self, events: Iterable[Dict[str, Any]], **extra) -> int:
+        """
+        이벤트를 큐에 넣습니다. 블로킹하지 않습니다.
+
+        Args:
+            events: 이벤트 리스트 (inventory_diff 형식)
+            **extra: 각 이벤트에 덧붙일 정보 (예: rule="규칙명")
+
+        Returns:
+            큐에 들어간 이벤트 수
+        """
+        accepted = 0
+        for event in events:
+            if extra:
+                event = dict(event, **extra)
+            if self._is_duplicate(event):
+                self._count("duplicate")
+                continue
+            try:
+                self.queue.put_nowait(event)
+                accepted += 1
+            except queue.Full:
+                self._forget((event,))
+                self._count("dropped")
+        self._count("published", accepted)
+        return accepted
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        """첫 이벤트를 기다린 뒤 batch_window 동안 이벤트를 모읍니다."""
+        try:
+            first = self.queue.get(timeout=0.2)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, sink: Sink, batch: List[Dict[str, Any]]) -> bool:
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                sink(batch)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries or self._stopping.is_set():
+                    print(f"⚠️  알림 전송 실패 ({type(sink).__name__}): {e}")
+                    return False
+                time.sleep(delay)
+                delay *= 2
+        return False
+
+    def _worker(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            failed = False
+            for sink in self.sinks:
+                delivered = self._deliver(sink, batch)
+                failed = failed or not delivered
+                self._count("delivered" if delivered else "failed", len(batch))
+            if failed:
+                # 재시도까지 실패: 중복 기록을 지워 dedup_ttl 동안 알림이 사라지지 않게 함
+                self._forget(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+
+def _demo():
+    """느린 로컬 웹훅을 띄워 모니터링 루프가 지연되지 않는지 확인합니다."""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class SlowHook(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("content-length", 0)))
+            time.sleep(1.5)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), SlowHook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/hook"
+
+    notifier = Notifier([WebhookSink(url)], batch_window=0.5).start()
+    print(f"느린 웹훅(1.5초): {url}")
+
+    for tick in range(1, 4):
+        started = time.monotonic()
+        events = [{"type": "added", "carProductionNumber": f"DEMO{tick}{i}",
+                   "car": {"exteriorColorName": "데모", "finalAmount": "0"}} for i in range(3)]
+        notifier.publish(events)
+        notifier.publish(events)  # 중복은 무시됨
+        print(f"[확인 #{tick}] publish 소요: {(time.monotonic() - started) * 1000:.2f}ms")
+        time.sleep(0.3)
+
+    notifier.stop()
+    server.shutdown()
+    print(f"통계: {notifier.stats}")
+
+
+if __name__ == "__main__":
+    _demo()
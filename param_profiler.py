@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+조회 파라미터 영향 분석 모듈
+
+기준 조회에서 파라미터를 하나씩 바꿔 보내고, 응답이 어떻게 달라지는지 기록합니다.
+
+- membership: 조회되는 차량(차대번호 집합)이 달라짐
+- order: 같은 차량이지만 순서가 달라짐
+- price: 같은 차량의 금액(finalAmount/discountPrice)이 달라짐
+
+결과는 param_influence.json 에 기획전별로 저장되며,
+응답에 아무 영향이 없는 필드는 조회 캐시 키에서 빠지고(query_cache),
+deliveryLocalAreaCode 가 차량 집합에 영향이 없으면 전국 스윕을 시도 단위로 줄입니다.
+
+사용법:
+    python param_profiler.py                         # R0003, AX05, 서울 기준
+    python param_profiler.py -e E20260133 -m AX06 --sido 경기
+    python param_profiler.py --show                  # 저장된 분석 결과
+"""
+
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
+
+from car import Car
+
+
+EFFECT_MEMBERSHIP = "membership"
+EFFECT_ORDER = "order"
+EFFECT_PRICE = "price"
+EFFECTS = (EFFECT_MEMBERSHIP, EFFECT_ORDER, EFFECT_PRICE)
+
+# 필드별로 시험해 볼 값 (기준값과 같으면 건너뜀)
+# 색상/출고센터/트림 같은 명시적인 필터는 당연히 차량 집합을 바꾸므로 제외합니다.
+DEFAULT_PROBES: Dict[str, List[Any]] = {
+    "sortCode": ["20", "30"],
+    "subsidyRegion": ["", "1100", "2800"],
+    "choiceOptYn": ["N"],
+    "wpaScnCd": ["Y"],
+    "optionFilter": ["Y"],
+    "carBodyCode": ["X"],
+    "carEngineCode": ["X"],
+    "minSalePrice": [""],
+    "maxSalePrice": [""],
+}
+
+
+def _amounts(car: Car) -> tuple:
+    return (car.price, car.discount)
+
+
+def compare(baseline: Sequence[Car], cars: Sequence[Car]) -> List[str]:
+    """
+    두 조회 결과를 비교하여 달라진 효과 리스트를 반환합니다.
+
+    Returns:
+        EFFECTS 중 해당하는 것들 (같으면 빈 리스트)
+    """
+    effects = []
+    base_ids = [car.car_production_number for car in baseline]
+    ids = [car.car_production_number for car in cars]
+    if set(base_ids) != set(ids):
+        effects.append(EFFECT_MEMBERSHIP)
+    else:
+        if base_ids != ids:
+            effects.append(EFFECT_ORDER)
+    base_amounts = {car.car_production_number: _amounts(car) for car in baseline}
+    for car in cars:
+        if car.car_production_number in base_amounts and base_amounts[car.car_production_number] != _amounts(car):
+            effects.append(EFFECT_PRICE)
+            break
+    return effects
+
+
+class ParameterProfiler:
+    """
+    파라미터를 하나씩 바꿔 가며 응답 변화를 측정합니다.
+    """
+
+    def __init__(
+        self,
+        checker,
+        probes: Optional[Dict[str, List[Any]]] = None,
+        max_pages: Optional[int] = 5,
+        delay: float = 0.2
+    ):
+        """
+        Args:
+            checker: CasperChecker 또는 SpecialChecker
+            probes: {필드: [시험할 값, ...]} (없으면 DEFAULT_PROBES)
+            max_pages: 조회당 최대 페이지 수
+            delay: 요청 간 지연 (초)
+        """
+        self.checker = checker
+        self.probes = probes if probes is not None else DEFAULT_PROBES
+        self.max_pages = max_pages
+        self.delay = delay
+        self.request_count = 0
+
+    def fetch(self, params: Dict[str, Any]) -> List[Car]:
+        """캐시를 거치지 않고 모든 페이지를 조회합니다."""
+        cache, self.checker.query_cache = self.checker.query_cache, None
+        try:
+            cars = list(self.checker.iter_cars(custom_params=params, max_pages=self.max_pages))
+        finally:
+            self.checker.query_cache = cache
+        self.request_count += 1
+        time.sleep(self.delay)
+        return cars
+
+    def profile(
+        self,
+        baseline: Dict[str, Any],
+        probes: Optional[Dict[str, List[Any]]] = None,
+        verbose: bool = True
+    ) -> Dict[str, Any]:
+        """
+        기준 조회에 대해 필드별 영향을 측정합니다.
+
+        Args:
+            baseline: 기준 조회 파라미터
+            probes: 이번 분석에만 쓸 {필드: [값, ...]} (DEFAULT_PROBES 에 추가)
+            verbose: 진행 상황 출력 여부
+
+        Returns:
+            {"baseline_count", "stable", "fields": {필드: {"effects": [...], "probes": [...]}}}
+        """
+        probes = dict(self.probes, **(probes or {}))
+        base_cars = self.fetch(baseline)
+        # 같은 조회를 한 번 더 보내 응답 자체가 흔들리는지 확인
+        stable = not compare(base_cars, self.fetch(baseline))
+        if verbose:
+            print(f"📏 기준 조회: {len(base_cars)}대 ({'안정' if stable else '⚠️ 같은 조회도 결과가 달라짐'})")
+
+        fields = {}
+        for field, values in probes.items():
+            results = []
+            effects = set()
+            for value in values:
+                if value == baseline.get(field):
+                    continue
+                cars = self.fetch(dict(baseline, **{field: value}))
+                changed = compare(base_cars, cars)
+                effects.update(changed)
+                results.append({"value": value, "count": len(cars), "effects": changed})
+            if not results:
+                continue
+            fields[field] = {
+                "effects": [effect for effect in EFFECTS if effect in effects],
+                "probes": results,
+            }
+            if verbose:
+                print(f"  {field:<24} {', '.join(fields[field]['effects']) or '영향 없음'}")
+
+        return {
+            "baseline_count": len(base_cars),
+            "stable": stable,
+            "fields": fields,
+        }
+
+
+class ParamInfluence:
+    """
+    파라미터 영향 분석 결과 저장소
+
+    {기획전: {모델 코드: 분석 결과}} 형태로 저장합니다.
+    """
+
+    def __init__(self, filename: str = "param_influence.json"):
+        self.filename = filename
+        self.data: Dict[str, Dict[str, Any]] = {}
+        self._inert: Dict[str, List[str]] = {}
+        self._load()
+
+    def _load(self):
+        """결과 파일을 로드합니다."""
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  파라미터 분석 결과를 읽지 못했습니다: {e}")
+            self.data = {}
+
+    def save(self):
+        """결과 파일을 저장합니다."""
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+
+    def record(self, exhibition_no: str, model_code: str, report: Dict[str, Any]):
+        """분석 결과 1건을 기록합니다."""
+        entry = dict(report, profiled_at=datetime.now().isoformat(timespec="seconds"))
+        self.data.setdefault(exhibition_no, {})[model_code] = entry
+        self._inert.pop(exhibition_no, None)
+
+    def _reports(self, exhibition_no: str) -> List[Dict[str, Any]]:
+        # 응답이 흔들렸거나 기준 조회가 비어 있던 분석은 판단에 쓰지 않음
+        return [
+            r for r in self.data.get(exhibition_no, {}).values()
+            if r.get("stable") and r.get("baseline_count")
+        ]
+
+    def effects(self, exhibition_no: str, field: str) -> Optional[List[str]]:
+        """
+        필드의 효과 (분석한 모든 모델의 합집합)
+
+        Returns:
+            효과 리스트, 분석한 적 없으면 None
+        """
+        found = None
+        for report in self._reports(exhibition_no):
+            info = report.get("fields", {}).get(field)
+            if info is None:
+                continue
+            found = (found or set()) | set(info.get("effects", []))
+        return None if found is None else [effect for effect in EFFECTS if effect in found]
+
+    def inert_fields(self, exhibition_no: str) -> List[str]:
+        """응답에 아무 영향이 없는 것으로 확인된 필드"""
+        if exhibition_no not in self._inert:
+            fields = set()
+            for report in self._reports(exhibition_no):
+                fields.update(report.get("fields", {}))
+            self._inert[exhibition_no] = sorted(
+                field for field in fields if self.effects(exhibition_no, field) == []
+            )
+        return self._inert[exhibition_no]
+
+    def affects_membership(self, exhibition_no: str, field: str) -> bool:
+        """필드가 차량 집합을 바꾸는지 (분석 전이면 True 로 가정)"""
+        effects = self.effects(exhibition_no, field)
+        return effects is None or EFFECT_MEMBERSHIP in effects
+
+    def canonical(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """영향 없는 필드를 뺀 파라미터 (같은 응답을 받는 조회를 하나로 묶을 때 사용)"""
+        inert = self.inert_fields(params.get("exhbNo", ""))
+        if not inert:
+            return params
+        return {key: value for key, value in params.items() if key not in inert}
+
+
+_param_influence = None
+
+
+def get_param_influence() -> ParamInfluence:
+    """ParamInfluence 싱글톤 인스턴스를 반환합니다."""
+    global _param_influence
+    if _param_influence is None:
+        _param_influence = ParamInfluence()
+    return _param_influence
+
+
+def _checker_and_model(exhibition_no: str, model_code: str):
+    if exhibition_no == "R0003":
+        from casper_checker import CasperChecker, CarModel
+        checker, models = CasperChecker(), CarModel
+    else:
+        from special_checker import SpecialChecker, SpecialCarModel
+        checker, models = SpecialChecker(), SpecialCarModel
+    for model in models:
+        if model.value["carCode"] == model_code:
+            return checker, model
+    raise ValueError(f"알 수 없는 모델 코드: {model_code} (기획전 {exhibition_no})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='조회 파라미터 영향 분석')
+    parser.add_argument('--exhibition', '-e', default='R0003', choices=['R0003', 'E20260133'], help='기획전')
+    parser.add_argument('--model', '-m', default='AX05', help='모델 코드')
+    parser.add_argument('--sido', default='서울', help='기준 시도')
+    parser.add_argument('--sigun', help='기준 시군구')
+    parser.add_argument('--max-pages', type=int, default=5, help='조회당 최대 페이지 수')
+    parser.add_argument('--show', action='store_true', help='저장된 분석 결과만 출력')
+    args = parser.parse_args()
+
+    influence = get_param_influence()
+
+    if not args.show:
+        checker, model = _checker_and_model(args.exhibition, args.model)
+        from region_helper import get_codes, list_siguns
+        siguns = list_siguns(args.sido)
+        sigun = args.sigun or (siguns[0] if siguns else None)
+        area_code, local_code = get_codes(args.sido, sigun)
+        baseline = dict(checker.default_params(model), deliveryAreaCode=area_code, deliveryLocalAreaCode=local_code)
+
+        # 같은 시도의 다른 시군구로 바꿔 봄
+        local_probes = []
+        for other in siguns:
+            code = get_codes(args.sido, other)[1]
+            if code != local_code:
+                local_probes.append(code)
+            if len(local_probes) >= 2:
+                break
+
+        print(f"🔬 파라미터 영향 분석: {model.value['name']} ({args.exhibition}) / {args.sido} {sigun or ''}")
+        profiler = ParameterProfiler(checker, max_pages=args.max_pages)
+        report = profiler.profile(baseline, {"deliveryLocalAreaCode": local_probes} if local_probes else None)
+        influence.record(args.exhibition, args.model, report)
+        influence.save()
+        print(f"\n💾 {influence.filename} 저장 (조회 {profiler.request_count}건)")
+
+    for exhibition_no in influence.data:
+        print(f"\n[{exhibition_no}]")
+        inert = influence.inert_fields(exhibition_no)
+        print(f"  영향 없음: {', '.join(inert) or '-'}")
+        print(f"  deliveryLocalAreaCode: "
+              f"{'차량 집합에 영향' if influence.affects_membership(exhibition_no, 'deliveryLocalAreaCode') else '시도 단위 조회로 충분'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+조회 결과 캐시 (필터 포함 관계)
+
+같은 모델/지역을 색상·출고센터 필터만 바꿔 다시 조회하는 경우가 많습니다.
+필터가 더 넓은 조회 결과(예: 색상/출고센터 조건 없음)를 전부 가지고 있으면
+좁은 조회는 서버에 보내지 않고 로컬에서 걸러 응답을 만듭니다.
+
+- 캐시 키: 기획전 URL + 필터/페이지를 뺀 나머지 파라미터 (모델, 지역, 가격 범위 등)
+  param_profiler 로 응답에 영향이 없다고 확인된 필드도 키에서 뺍니다.
+- 로컬로 좁힐 수 있는 필터: exteriorColorCode, deliveryCenterCode
+  (minSalePrice/maxSalePrice는 보조금 기준 가격이라 응답으로 재현할 수 없으므로 키에 포함)
+- 넓은 결과는 totalCount까지 모든 페이지가 캐시에 있을 때만 사용
+  (iter_cars 로 모든 페이지를 받으면 자동으로 채워짐)
+- 똑같은 조회(같은 필터, 같은 페이지)는 그대로 재사용
+- ttl 초가 지난 결과는 사용하지 않음
+
+모든 CasperChecker / SpecialChecker 인스턴스가 get_query_cache() 하나를 공유합니다.
+모니터링처럼 항상 새 결과가 필요하면 checker.query_cache = None 으로 끕니다.
+"""
+
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+
+from param_profiler import get_param_influence
+
+
+# 응답 차량에서 직접 비교할 수 있는 필터 (파라미터 키 = 차량 키)
+LOCAL_FILTERS = ("exteriorColorCode", "deliveryCenterCode")
+
+PAGING_FIELDS = ("pageNo", "pageSize")
+
+
+def split_params(params: Dict[str, Any]) -> Tuple[str, Tuple[str, ...], int, int]:
+    """
+    조회 파라미터를 (기본 키, 필터 값, 페이지 번호, 페이지 크기)로 나눕니다.
+    """
+    base = {
+        key: value for key, value in params.items()
+        if key not in LOCAL_FILTERS and key not in PAGING_FIELDS
+    }
+    # 응답에 영향 없는 것으로 확인된 필드는 키에서 제외 (param_profiler)
+    base = get_param_influence().canonical(base)
+    filters = tuple(params.get(key) or "" for key in LOCAL_FILTERS)
+    return (
+        json.dumps(base, sort_keys=True, ensure_ascii=False),
+        filters,
+        int(params.get("pageNo") or 1),
+        int(params.get("pageSize") or 0),
+    )
+
+
+def covers(broad: Tuple[str, ...], narrow: Tuple[str, ...]) -> bool:
+    """broad 필터 결과에 narrow 필터 결과가 모두 포함되는지"""
+    return all(not b or b == n for b, n in zip(broad, narrow))
+
+
+class _Entry:
+    """같은 조회(필터, 페이지 크기)의 페이지 모음"""
+
+    __slots__ = ("total", "pages", "page_size", "stored_at")
+
+    def __init__(self, page_size: int, stored_at: float):
+        self.total: Optional[int] = None
+        self.pages: Dict[int, List[Dict[str, Any]]] = {}
+        self.page_size = page_size
+        self.stored_at = stored_at
+
+    def all_cars(self) -> Optional[List[Dict[str, Any]]]:
+        """totalCount까지 모든 페이지가 있으면 전체 차량 리스트, 아니면 None"""
+        if self.total is None:
+            return None
+        cars: List[Dict[str, Any]] = []
+        page = 1
+        while len(cars) < self.total:
+            chunk = self.pages.get(page)
+            if not chunk:
+                return None
+            cars.extend(chunk)
+            page += 1
+        return cars
+
+
+def _response(total: int, cars: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"data": {"totalCount": total, "discountsearchcars": cars}}
+
+
+class QueryCache:
+    """
+    필터 포함 관계를 이용하는 조회 결과 캐시
+    """
+
+    def __init__(self, ttl: float = 30.0, max_queries: int = 256):
+        """
+        Args:
+            ttl: 결과 유효 시간 (초)
+            max_queries: 보관할 기본 키(모델/지역 조합) 최대 개수
+        """
+        self.ttl = ttl
+        self.max_queries = max_queries
+        # (scope, 기본 키) → {(필터, 페이지 크기): _Entry}
+        self._queries: "OrderedDict[Tuple[str, str], Dict[Tuple[Tuple[str, ...], int], _Entry]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.local_hits = 0
+        self.misses = 0
+
+    def _fresh(self, entry: _Entry, now: float) -> bool:
+        return now - entry.stored_at <= self.ttl
+
+    def lookup(self, scope: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        캐시로 응답을 만들 수 있으면 API 응답과 같은 형태로 반환합니다.
+
+        Args:
+            scope: 조회 대상 (기획전 API URL)
+            params: 조회 파라미터
+
+        Returns:
+            {"data": {"totalCount": n, "discountsearchcars": [...]}} 또는 None
+        """
+        base, filters, page_no, page_size = split_params(params)
+        now = time.monotonic()
+        with self._lock:
+            entries = self._queries.get((scope, base))
+            if not entries:
+                self.misses += 1
+                return None
+            self._queries.move_to_end((scope, base))
+
+            # 1) 똑같은 조회
+            entry = entries.get((filters, page_size))
+            if entry is not None and self._fresh(entry, now) and page_no in entry.pages:
+                self.hits += 1
+                return _response(entry.total, list(entry.pages[page_no]))
+
+            # 2) 더 넓은 조회의 전체 결과를 로컬에서 필터링
+            for (broad, _), entry in entries.items():
+                if not covers(broad, filters) or not self._fresh(entry, now):
+                    continue
+                cars = entry.all_cars()
+                if cars is None:
+                    continue
+                matched = [
+                    car for car in cars
+                    if all(not want or car.get(key) == want for key, want in zip(LOCAL_FILTERS, filters))
+                ]
+                start = (page_no - 1) * page_size if page_size else 0
+                end = start + page_size if page_size else None
+                self.local_hits += 1
+                return _response(len(matched), matched[start:end])
+
+            self.misses += 1
+            return None
+
+    def store(self, scope: str, params: Dict[str, Any], response: Dict[str, Any]):
+        """
+        서버 응답을 저장합니다.
+
+        Args:
+            scope: 조회 대상 (기획전 API URL)
+            params: 조회 파라미터
+            response: API 응답 JSON
+        """
+        data = (response or {}).get("data") or {}
+        cars = data.get("discountsearchcars")
+        if cars is None:
+            return
+        base, filters, page_no, page_size = split_params(params)
+        now = time.monotonic()
+        with self._lock:
+            entries = self._queries.setdefault((scope, base), {})
+            self._queries.move_to_end((scope, base))
+            entry = entries.get((filters, page_size))
+            if entry is None or not self._fresh(entry, now):
+                entry = entries[(filters, page_size)] = _Entry(page_size, now)
+            entry.total = data.get("totalCount", len(cars))
+            entry.pages[page_no] = list(cars)
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+
+    def clear(self):
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._queries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """적중/로컬 필터링/미스 횟수"""
+        return {"hits": self.hits, "local_hits": self.local_hits, "misses": self.misses}
+
+
+_query_cache: Optional[QueryCache] = None
+
+
+def get_query_cache() -> QueryCache:
+    """공유 조회 캐시 인스턴스를 반환합니다."""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache()
+    return _query_cache
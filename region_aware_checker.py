@@ -2,12 +2,14 @@
 """
 지역 검색 기능이 통합된 캐스퍼 재고 확인 도구
 
-region_constants.py의 데이터를 활용하여 편리하게 지역별 검색을 수행합니다.
+프로세스 공용 지역 테이블(region_table)을 활용하여 편리하게 지역별 검색을 수행합니다.
 """
 
 from casper_checker import CasperChecker, CarModel
-from typing import Optional, List, Dict, Any
-import json
+from request_payload import build_params
+from region_index import RegionIndex
+from region_table import get_region_table
+from typing import Optional, List, Dict, Any, Tuple
 
 
 class RegionAwareCasperChecker(CasperChecker):
@@ -15,34 +17,33 @@ class RegionAwareCasperChecker(CasperChecker):
     
     def __init__(self):
         super().__init__()
-        self.region_data = self._load_region_data()
-    
-    def _load_region_data(self) -> Dict[str, Any]:
-        """region_data.json 파일을 로드합니다."""
-        try:
-            with open('region_data.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print("⚠️  region_data.json 파일이 없습니다.")
+        if not get_region_table():
+            print("⚠️  지역 데이터가 없습니다.")
             print("   먼저 'python fetch_regions.py'를 실행하세요.")
-            return {}
+    
+    @property
+    def region_data(self) -> Dict[str, Any]:
+        """전체 지역 데이터 (공용 테이블, 읽기 전용)"""
+        table = get_region_table()
+        return table.region_data if table else {}
+    
+    @property
+    def region_index(self) -> RegionIndex:
+        """지역 코드 색인 (공용 테이블)"""
+        table = get_region_table()
+        return table.index if table else RegionIndex()
     
     def get_region_code(self, sido_name: str) -> Optional[str]:
         """시도명으로 코드를 반환합니다."""
-        region = self.region_data.get(sido_name)
-        return region['code'] if region else None
+        return self.region_index.sido_code(sido_name)
     
     def get_sigun_code(self, sido_name: str, sigun_name: str) -> Optional[str]:
         """시군구명으로 코드를 반환합니다."""
-        region = self.region_data.get(sido_name)
-        if not region:
-            return None
-        
-        for sigun in region.get('sigun_list', []):
-            if sigun['codeName'] == sigun_name:
-                return sigun['code']
-        
-        return None
+        return self.region_index.sigun_code(sido_name, sigun_name)
+    
+    def get_region_name(self, sigun_code: str) -> Optional[Tuple[str, str]]:
+        """시군구 코드로 (시도명, 시군구명)을 반환합니다."""
+        return self.region_index.find_code(sigun_code)
     
     def search_by_region(
         self,
@@ -81,36 +82,17 @@ class RegionAwareCasperChecker(CasperChecker):
                 return []
         else:
             # 시군구가 없으면 첫 번째 시군구 사용
-            region = self.region_data.get(sido_name)
-            sigun_list = region.get('sigun_list', [])
-            if sigun_list:
-                sigun_code = sigun_list[0]['code']
-            else:
-                sigun_code = f"{sido_code}0"
+            sigun_code = self.region_index.get_codes(sido_name)[1]
         
         # 파라미터 구성
-        model_data = model.value
-        params = {
-            "carCode": model_data["carCode"],
-            "subsidyRegion": model_data["subsidyRegion"],
-            "exhbNo": "R0003",
-            "sortCode": "10",
-            "deliveryAreaCode": sido_code,
-            "deliveryLocalAreaCode": sigun_code,
-            "carBodyCode": "",
-            "carEngineCode": "",
-            "carTrimCode": "",
-            "exteriorColorCode": kwargs.get("exteriorColorCode", ""),
-            "interiorColorCode": kwargs.get("interiorColorCode", []),
-            "deliveryCenterCode": kwargs.get("deliveryCenterCode", ""),
-            "wpaScnCd": "",
-            "optionFilter": "",
-            "minSalePrice": model_data["minSalePrice"],
-            "maxSalePrice": model_data["maxSalePrice"],
-            "choiceOptYn": "Y",
-            "pageNo": 1,
-            "pageSize": 18
-        }
+        params = build_params(
+            "R0003", model,
+            deliveryAreaCode=sido_code,
+            deliveryLocalAreaCode=sigun_code,
+            exteriorColorCode=kwargs.get("exteriorColorCode", ""),
+            interiorColorCode=kwargs.get("interiorColorCode", []),
+            deliveryCenterCode=kwargs.get("deliveryCenterCode", "")
+        )
         
         return self.get_car_list(custom_params=params)
     
@@ -224,7 +206,7 @@ def main():
     print(f"재고: {len(cars)}대")
     if cars:
         for i, car in enumerate(cars[:3], 1):
-            print(f"  {i}. {car['exteriorColorName']} - {int(car['finalAmount']):,}원")
+            print(f"  {i}. {car.color} - {car.price:,}원")
     
     # 예시 2: 서울 전체 검색
     print("\n[예시 2] 서울 - 2026 캐스퍼")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+지역 데이터 로딩 벤치마크
+
+새 프로세스에서 "지역 데이터 로드 + 코드 1건 조회"에 걸리는 시간을 비교합니다.
+
+- constants: 이전 방식 그대로 (region_constants.py import + 이름/코드 색인 + get_codes)
+- table: region_table.bin 로드 (region_helper.get_codes)
+
+각 방식을 .pyc 가 있는 경우(warm)와 없는 경우(cold, 첫 실행/읽기 전용 설치)로 나눠 측정합니다.
+두 방식 모두 처음 검색할 때만 만드는 부분 문자열 색인(RegionIndex.substrings)은
+포함하지 않고, 생성 시간은 따로 측정합니다.
+
+사용법:
+    python region_benchmark.py
+    python region_benchmark.py --runs 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = {
+    # 이전 region_helper 와 같은 import/생성 순서 (RegionHelper() + get_codes)
+    "constants": (
+        "import os\n"
+        "import json\n"
+        "from region_index import RegionIndex\n"
+        "from region_search import RegionSearchIndex\n"
+        "from region_constants import SIDO_CODES, SIGUN_CODES, REGION_DATA\n"
+        "index = RegionIndex.from_codes(SIDO_CODES, SIGUN_CODES)\n"
+        "index.get_codes('경북', '포항시')\n"
+    ),
+    "table": (
+        "from region_helper import get_codes\n"
+        "get_codes('경북', '포항시')\n"
+    ),
+}
+
+CHILD = (
+    "import time\n"
+    "t = time.perf_counter()\n"
+    "{code}"
+    "print((time.perf_counter() - t) * 1000)\n"
+)
+
+
+def run_once(code: str, cold: bool) -> tuple:
+    """
+    새 프로세스에서 1회 실행합니다.
+
+    Returns:
+        (로드+조회 시간 ms, 프로세스 전체 시간 ms)
+    """
+    env = dict(os.environ)
+    if cold:
+        # 빈 캐시 디렉터리를 지정하면 .pyc 없이 소스를 컴파일
+        env["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp(prefix="region_bench_")
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(code=code)],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    total = (time.perf_counter() - started) * 1000
+    return float(output.strip().splitlines()[-1]), total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지역 데이터 로딩 벤치마크')
+    parser.add_argument('--runs', type=int, default=20, help='방식별 실행 횟수')
+    args = parser.parse_args()
+
+    # 테이블 파일 준비 (없으면 첫 로드에서 생성)
+    sys.path.insert(0, BASE_DIR)
+    from region_index import RegionIndex
+    from region_table import load_region_table
+    if not load_region_table():
+        print("❌ 지역 데이터가 없습니다. fetch_regions.py를 먼저 실행하세요.")
+        return
+
+    print(f"⏱️  지역 데이터 로드 + 코드 조회 (중앙값, {args.runs}회)")
+    print("-" * 60)
+    print(f"{'방식':<12} {'pyc':<6} {'로드+조회':>12} {'프로세스 전체':>14}")
+    for cold in (False, True):
+        for name, code in SCENARIOS.items():
+            run_once(code, cold)  # 파일 캐시 준비
+            samples = [run_once(code, cold) for _ in range(args.runs)]
+            load = median(s[0] for s in samples)
+            total = median(s[1] for s in samples)
+            print(f"{name:<12} {'없음' if cold else '있음':<6} {load:>10.2f}ms {total:>12.1f}ms")
+
+    # 부분 문자열 색인: 두 방식 공통, 처음 검색(search_sigun/suggest)할 때 1회
+    table = load_region_table()
+    samples = []
+    for _ in range(args.runs):
+        index = RegionIndex.from_codes(table.sido_codes, table.sigun_codes)
+        started = time.perf_counter()
+        index.substrings
+        samples.append((time.perf_counter() - started) * 1000)
+    print("-" * 60)
+    print(f"부분 문자열 색인 생성 (처음 검색할 때 1회): {median(samples):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ def example_1_basic_region_search():
     
     print(f"\n검색 결과: {len(cars)}대")
     for i, car in enumerate(cars[:3], 1):
-        print(f"{i}. {car['exteriorColorName']} - {int(float(car['finalAmount'])):,}원")
+        print(f"{i}. {car.color} - {car.price:,}원")
 
 
 def example_2_search_multiple_regions():
@@ -91,7 +91,7 @@ def example_4_color_filter_by_region():
     
     print(f"\n아틀라스 화이트 재고: {len(cars)}대")
     for car in cars[:5]:
-        print(f"  • {car['carTrimName']} - {int(float(car['finalAmount'])):,}원 - {car['deliveryCenterName']}")
+        print(f"  • {car.trim} - {car.price:,}원 - {car.center}")
 
 
 def example_5_region_helper():
@@ -2,13 +2,15 @@
 """
 지역 검색 헬퍼 모듈
 
-region_constants.py의 데이터를 쉽게 사용할 수 있도록 도와줍니다.
+지역 데이터(region_table.bin, 없으면 region_constants.py / region_data.json)를 쉽게 사용할 수 있도록 도와줍니다.
+모든 인스턴스가 프로세스 공용 지역 테이블(region_table.get_region_table)을 함께 사용합니다.
 """
 
-import os
-import json
 from typing import Dict, List, Optional, Tuple
 
+from region_index import RegionIndex
+from region_table import get_region_table
+
 
 class RegionHelper:
     """지역 코드 검색을 도와주는 헬퍼 클래스"""
@@ -16,38 +18,27 @@ class RegionHelper:
     def __init__(self):
         self.sido_codes = {}
         self.sigun_codes = {}
-        self.region_data = {}
+        self.table = None
         self._load_region_data()
     
     def _load_region_data(self):
-        """지역 데이터를 로드합니다."""
-        try:
-            # region_constants.py에서 로드 시도
-            from region_constants import SIDO_CODES, SIGUN_CODES, REGION_DATA
-            self.sido_codes = SIDO_CODES
-            self.sigun_codes = SIGUN_CODES
-            self.region_data = REGION_DATA
-        except ImportError:
-            # region_data.json에서 로드 시도
-            try:
-                if os.path.exists('region_data.json'):
-                    with open('region_data.json', 'r', encoding='utf-8') as f:
-                        self.region_data = json.load(f)
-                        self._build_codes_from_json()
-                else:
-                    print("⚠️  지역 데이터가 없습니다. fetch_regions.py를 먼저 실행하세요.")
-            except Exception as e:
-                print(f"❌ 지역 데이터 로드 실패: {e}")
+        """지역 데이터를 로드합니다. (공용 테이블, 다시 읽지 않음)"""
+        self.table = get_region_table()
+        if not self.table:
+            print("⚠️  지역 데이터가 없습니다. fetch_regions.py를 먼저 실행하세요.")
+            return
+        self.sido_codes = self.table.sido_codes
+        self.sigun_codes = self.table.sigun_codes
     
-    def _build_codes_from_json(self):
-        """JSON 데이터로부터 코드 딕셔너리 생성"""
-        for region_name, info in self.region_data.items():
-            self.sido_codes[region_name] = info['code']
-            
-            if info.get('sigun_list'):
-                self.sigun_codes[region_name] = {}
-                for sigun in info['sigun_list']:
-                    self.sigun_codes[region_name][sigun['codeName']] = sigun['code']
+    @property
+    def region_data(self) -> Dict[str, Dict]:
+        """REGION_DATA 형식의 전체 지역 데이터 (처음 사용할 때 생성)"""
+        return self.table.region_data if self.table else {}
+    
+    @property
+    def index(self) -> RegionIndex:
+        """이름 ↔ 코드 색인 (처음 사용할 때 생성)"""
+        return self.table.index if self.table else RegionIndex()
     
     def get_codes(self, sido_name: str, sigun_name: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -71,32 +62,7 @@ class RegionHelper:
         if not self.sido_codes:
             raise ValueError("지역 데이터가 로드되지 않았습니다. fetch_regions.py를 먼저 실행하세요.")
         
-        # 시도 코드 조회
-        sido_code = self.sido_codes.get(sido_name)
-        if not sido_code:
-            available = ', '.join(self.sido_codes.keys())
-            raise ValueError(f"알 수 없는 시도명: {sido_name}\n사용 가능: {available}")
-        
-        # 시군구 코드 조회
-        if sigun_name:
-            region_siguns = self.sigun_codes.get(sido_name, {})
-            sigun_code = region_siguns.get(sigun_name)
-            
-            if not sigun_code:
-                available = ', '.join(region_siguns.keys()) if region_siguns else "시군구 구분 없음"
-                raise ValueError(f"{sido_name}에서 '{sigun_name}'을(를) 찾을 수 없습니다.\n사용 가능: {available}")
-            
-            return sido_code, sigun_code
-        else:
-            # 시군구가 없으면 첫 번째 시군구 사용
-            region_info = self.region_data.get(sido_name, {})
-            sigun_list = region_info.get('sigun_list', [])
-            
-            if sigun_list:
-                return sido_code, sigun_list[0]['code']
-            else:
-                # 데이터가 없으면 시도코드 + "0" 사용
-                return sido_code, f"{sido_code}0"
+        return self.index.get_codes(sido_name, sigun_name)
     
     def search_sigun(self, query: str) -> List[Dict[str, str]]:
         """
@@ -108,19 +74,34 @@ class RegionHelper:
         Returns:
             검색 결과 리스트
         """
-        results = []
-        
-        for sido_name, siguns in self.sigun_codes.items():
-            for sigun_name, sigun_code in siguns.items():
-                if query in sigun_name:
-                    results.append({
-                        'sido': sido_name,
-                        'sido_code': self.sido_codes[sido_name],
-                        'sigun': sigun_name,
-                        'sigun_code': sigun_code
-                    })
-        
-        return results
+        return self.index.search(query)
+    
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        자동완성용 시군구 검색 (초성, 오타 허용, 점수 순)
+        
+        Args:
+            query: 입력 문자열 (예: "포항", "ㅍㅎ", "포항시청", "표항시")
+            limit: 최대 결과 수
+        
+        Returns:
+            [{'sido', 'sido_code', 'sigun', 'sigun_code', 'score'}, ...]
+        """
+        if not self.table:
+            return []
+        return self.table.search_index.suggest(query, limit)
+    
+    def find_code(self, sigun_code: str) -> Optional[Tuple[str, str]]:
+        """
+        시군구 코드로 지역명을 조회합니다.
+        
+        Args:
+            sigun_code: 시군구 코드 (예: "NL")
+        
+        Returns:
+            (시도명, 시군구명) 튜플, 없으면 None
+        """
+        return self.index.find_code(sigun_code)
     
     def list_siguns(self, sido_name: str) -> List[str]:
         """
@@ -165,7 +146,8 @@ _region_helper = None
 def get_region_helper() -> RegionHelper:
     """RegionHelper 싱글톤 인스턴스를 반환합니다."""
     global _region_helper
-    if _region_helper is None:
+    # 공용 테이블이 다시 로드되었으면 새 테이블로 교체
+    if _region_helper is None or _region_helper.table is not get_region_table():
         _region_helper = RegionHelper()
     return _region_helper
 
@@ -181,6 +163,11 @@ def search_sigun(query: str) -> List[Dict[str, str]]:
     return get_region_helper().search_sigun(query)
 
 
+def suggest(query: str, limit: int = 10) -> List[Dict[str, object]]:
+    """자동완성용 시군구 검색 (초성, 오타 허용)"""
+    return get_region_helper().suggest(query, limit)
+
+
 def list_siguns(sido_name: str) -> List[str]:
     """특정 시도의 시군구 목록을 반환합니다."""
     return get_region_helper().list_siguns(sido_name)
@@ -224,6 +211,12 @@ if __name__ == "__main__":
         results = helper.search_sigun("포항")
         for r in results:
             print(f"  {r['sido']} > {r['sigun']} (코드: {r['sido_code']}-{r['sigun_code']})")
+        
+        # 자동완성 (초성/오타)
+        for query in ("ㅍㅎ", "표항시"):
+            print(f"\n'{query}' 자동완성:")
+            for r in helper.suggest(query, 3):
+                print(f"  {r['sido']} > {r['sigun']} (점수: {r['score']})")
     else:
         print("❌ 지역 데이터를 찾을 수 없습니다.")
         print("fetch_regions.py를 먼저 실행하세요.")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+지역 코드 색인 모듈
+
+REGION_DATA(또는 region_data.json)로 한 번만 만들어 두고, 스윕 루프 안에서
+지역 이름 ↔ 코드 변환과 시군구 검색을 상수 시간에 처리합니다.
+
+- 이름 → 코드: 시도명 → 시도 코드, (시도명, 시군구명) → 시군구 코드
+- 코드 → 이름: 시도 코드 → 시도명, 시군구 코드 → (시도명, 시군구명)
+- 부분 문자열 색인: 시군구명의 모든 부분 문자열 → 시군구 목록
+  (시군구가 수백 개, 이름이 짧아 전체 부분 문자열을 만들어도 작음.
+  코드 변환만 하는 짧은 실행에서는 만들지 않도록 처음 검색할 때 생성)
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class RegionIndex:
+    """
+    지역 코드 양방향 색인
+
+    Examples:
+        >>> index = RegionIndex(REGION_DATA)
+        >>> index.get_codes("경북", "포항시")
+        ('N', 'NL')
+        >>> index.find_code("NL")
+        ('경북', '포항시')
+        >>> [r['sigun'] for r in index.search("포항")]
+        ['포항시']
+    """
+
+    def __init__(self, region_data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            region_data: {시도명: {"code": 시도 코드, "sigun_list": [{"code", "codeName"}, ...]}}
+        """
+        self.sido_codes: Dict[str, str] = {}
+        self.sido_names: Dict[str, str] = {}
+        self.sigun_codes: Dict[str, Dict[str, str]] = {}
+        self.sigun_names: Dict[str, Tuple[str, str]] = {}
+        self.default_sigun: Dict[str, str] = {}
+        # 시군구 검색 결과 (데이터 순서), 부분 문자열 → 결과 번호 리스트
+        self.entries: List[Dict[str, str]] = []
+        self._substrings: Optional[Dict[str, List[int]]] = None
+
+        for sido_name, info in (region_data or {}).items():
+            self.add_sido(sido_name, info["code"])
+            for sigun in info.get("sigun_list") or []:
+                self.add_sigun(sido_name, sigun["codeName"], sigun["code"])
+
+    @classmethod
+    def from_codes(
+        cls,
+        sido_codes: Dict[str, str],
+        sigun_codes: Dict[str, Dict[str, str]]
+    ) -> "RegionIndex":
+        """SIDO_CODES / SIGUN_CODES 형식의 딕셔너리로 색인을 만듭니다."""
+        index = cls()
+        for sido_name, sido_code in sido_codes.items():
+            index.add_sido(sido_name, sido_code)
+            for sigun_name, sigun_code in (sigun_codes.get(sido_name) or {}).items():
+                index.add_sigun(sido_name, sigun_name, sigun_code)
+        return index
+
+    def add_sido(self, sido_name: str, sido_code: str):
+        """시도 1개를 추가합니다."""
+        self.sido_codes[sido_name] = sido_code
+        self.sido_names[sido_code] = sido_name
+
+    def add_sigun(self, sido_name: str, sigun_name: str, sigun_code: str):
+        """시군구 1개를 추가합니다."""
+        siguns = self.sigun_codes.setdefault(sido_name, {})
+        siguns[sigun_name] = sigun_code
+        self.sigun_names[sigun_code] = (sido_name, sigun_name)
+        self.default_sigun.setdefault(sido_name, sigun_code)
+
+        self.entries.append({
+            'sido': sido_name,
+            'sido_code': self.sido_codes[sido_name],
+            'sigun': sigun_name,
+            'sigun_code': sigun_code
+        })
+        self._substrings = None
+
+    @property
+    def substrings(self) -> Dict[str, List[int]]:
+        """부분 문자열 → 결과 번호 리스트 (처음 사용할 때 생성)"""
+        if self._substrings is None:
+            substrings: Dict[str, List[int]] = {}
+            for position, entry in enumerate(self.entries):
+                name = entry['sigun']
+                seen = set()
+                for start in range(len(name)):
+                    for end in range(start + 1, len(name) + 1):
+                        part = name[start:end]
+                        if part not in seen:
+                            seen.add(part)
+                            substrings.setdefault(part, []).append(position)
+            self._substrings = substrings
+        return self._substrings
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # --- 이름 → 코드 ---
+
+    def sido_code(self, sido_name: str) -> Optional[str]:
+        """시도명 → 시도 코드 (없으면 None)"""
+        return self.sido_codes.get(sido_name)
+
+    def sigun_code(self, sido_name: str, sigun_name: str) -> Optional[str]:
+        """(시도명, 시군구명) → 시군구 코드 (없으면 None)"""
+        return self.sigun_codes.get(sido_name, {}).get(sigun_name)
+
+    def get_codes(self, sido_name: str, sigun_name: Optional[str] = None) -> Tuple[str, str]:
+        """
+        지역명으로 (deliveryAreaCode, deliveryLocalAreaCode)를 반환합니다.
+
+        시군구가 없으면 첫 번째 시군구, 시군구 데이터도 없으면 시도 코드 + "0"을 사용합니다.
+
+        Raises:
+            ValueError: 알 수 없는 시도/시군구
+        """
+        sido_code = self.sido_codes.get(sido_name)
+        if not sido_code:
+            available = ', '.join(self.sido_codes.keys())
+            raise ValueError(f"알 수 없는 시도명: {sido_name}\n사용 가능: {available}")
+
+        if sigun_name:
+            region_siguns = self.sigun_codes.get(sido_name, {})
+            sigun_code = region_siguns.get(sigun_name)
+            if not sigun_code:
+                available = ', '.join(region_siguns.keys()) if region_siguns else "시군구 구분 없음"
+                raise ValueError(f"{sido_name}에서 '{sigun_name}'을(를) 찾을 수 없습니다.\n사용 가능: {available}")
+            return sido_code, sigun_code
+
+        return sido_code, self.default_sigun.get(sido_name, f"{sido_code}0")
+
+    # --- 코드 → 이름 ---
+
+    def sido_name(self, sido_code: str) -> Optional[str]:
+        """시도 코드 → 시도명 (없으면 None)"""
+        return self.sido_names.get(sido_code)
+
+    def find_code(self, sigun_code: str) -> Optional[Tuple[str, str]]:
+        """시군구 코드 → (시도명, 시군구명) (없으면 None)"""
+        return self.sigun_names.get(sigun_code)
+
+    # --- 검색 ---
+
+    def search(self, query: str) -> List[Dict[str, str]]:
+        """
+        이름에 query 가 들어간 시군구를 데이터 순서대로 반환합니다.
+
+        Returns:
+            [{'sido', 'sido_code', 'sigun', 'sigun_code'}, ...]
+        """
+        if not query:
+            return [dict(entry) for entry in self.entries]
+        return [dict(self.entries[i]) for i in self.substrings.get(query, ())]
+
+    def prefix(self, query: str) -> List[Dict[str, str]]:
+        """이름이 query 로 시작하는 시군구"""
+        return [entry for entry in self.search(query) if entry['sigun'].startswith(query)]
@@ -92,7 +92,7 @@ def example_color_filter():
     
     if white_cars:
         for car in white_cars:
-            print(f"  • {car['carTrimName']} - {int(car['finalAmount']):,}원")
+            print(f"  • {car.trim} - {car.price:,}원")
 
 
 def example_compare_models():
@@ -231,9 +231,9 @@ def interactive_search():
         if cars:
             print("\n상위 5대:")
             for i, car in enumerate(cars[:5], 1):
-                print(f"{i}. {car['carName']} - {car['exteriorColorName']}")
-                print(f"   가격: {int(car['finalAmount']):,}원 (할인 {int(car['discountPrice']):,}원)")
-                print(f"   출고: {car['deliveryCenterName']}")
+                print(f"{i}. {car.car_name} - {car.color}")
+                print(f"   가격: {car.price:,}원 (할인 {car.discount:,}원)")
+                print(f"   출고: {car.center}")
                 print()
         
     except KeyboardInterrupt:
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+한글 지역명 퍼지 검색 모듈
+
+"포항", "ㅍㅎ", "포항시청", "포항ㅅ", "표항시"처럼 입력해도 시군구를 찾아 주는
+자동완성용 검색 색인입니다. 색인은 한 번만 만들고, 조회는 대부분 딕셔너리
+조회로 끝납니다.
+
+점수 (높을수록 우선):
+- 100 이름 일치
+-  90 이름 앞부분 일치 (자모 단위, 입력 중인 글자 포함)
+-  85 초성 앞부분 일치 ("ㅍㅎ" → 포항시)
+-  80 이름 중간 일치
+-  75 초성 중간 일치
+-  70 입력에 이름이 포함됨 ("포항시청" → 포항시)
+-  60 이하 자모 편집 거리 (오타 1~2개)
+-  +5 입력 앞에 시도명(또는 앞부분)이 붙고 그 시도의 시군구인 경우
+      ("강원 고성", "강원도 고성군" → 강원 고성군, "세종" → 세종 세종특별자치시)
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from region_index import RegionIndex
+
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 행정 단위 접미사 (이름에서 떼어 낸 어간도 색인)
+SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "시", "군", "구")
+
+# 시도 한정어 뒤에 붙을 수 있는 접미사 ("강원도 고성")
+SIDO_SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "도")
+
+SCORE_EXACT = 100
+SCORE_PREFIX = 90
+SCORE_CHOSEONG_PREFIX = 85
+SCORE_SUBSTRING = 80
+SCORE_CHOSEONG = 75
+SCORE_CONTAINED = 70
+SCORE_FUZZY = 60
+SCORE_SIDO_BONUS = 5
+
+# 입력별 순위 캐시 크기
+RANK_CACHE_SIZE = 1024
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.split())
+
+
+def choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꿉니다. ("포항시" → "ㅍㅎㅅ", 한글이 아니면 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모로 풀어 씁니다. ("포항" → "ㅍㅗㅎㅏㅇ")"""
+    result = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            result.append(CHOSEONG[index // 588])
+            result.append(JUNGSEONG[(index % 588) // 28])
+            result.append(JONGSEONG[index % 28])
+        else:
+            result.append(ch)
+    return "".join(result)
+
+
+def is_choseong_query(text: str) -> bool:
+    """입력이 초성(자음)으로만 이루어졌는지"""
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    편집 거리 (limit 를 넘으면 limit + 1 을 반환하고 중단)
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j, cb in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            )
+            if current[j] < best:
+                best = current[j]
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _stem(name: str) -> str:
+    for suffix in SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix) + 1:
+            return name[:-len(suffix)]
+    return name
+
+
+class RegionSearchIndex:
+    """
+    시군구 자동완성 검색 색인
+
+    Examples:
+        >>> search = RegionSearchIndex(RegionIndex(REGION_DATA))
+        >>> [r['sigun'] for r in search.suggest("ㅍㅎ")]
+        ['포항시']
+    """
+
+    def __init__(self, index: RegionIndex):
+        self.index = index
+        self.entries = index.entries
+        # 키(이름/어간, 자모, 초성) 앞부분 → 결과 번호
+        self.jamo_prefix: Dict[str, List[int]] = {}
+        self.choseong_prefix: Dict[str, List[int]] = {}
+        self.choseong_substring: Dict[str, List[int]] = {}
+        # 이름/어간 → 결과 번호 (입력에 이름이 포함되었는지 확인용)
+        self.names: Dict[str, List[int]] = {}
+        # 자모 길이 → [(자모, 결과 번호)] (오타 검색 시 길이가 비슷한 것만 비교)
+        self.by_length: Dict[int, List[Tuple[str, int]]] = {}
+        # 시도명과 그 앞부분 → 시도명 집합 (입력 앞의 시도 한정어 확인용)
+        self.sido_prefix: Dict[str, Set[str]] = {}
+        # 입력 → 순위 (최근 사용 순, 인스턴스마다 따로 보관)
+        self._rank_cache: "OrderedDict[str, List[Tuple[int, int]]]" = OrderedDict()
+
+        for position, entry in enumerate(self.entries):
+            for name in {entry['sigun'], _stem(entry['sigun'])}:
+                self._add(name, position)
+        for sido_name in index.sido_codes:
+            for end in range(1, len(sido_name) + 1):
+                self.sido_prefix.setdefault(sido_name[:end], set()).add(sido_name)
+
+    @staticmethod
+    def _put(table: Dict[str, List[int]], key: str, position: int):
+        bucket = table.setdefault(key, [])
+        if not bucket or bucket[-1] != position:
+            bucket.append(position)
+
+    def _add(self, name: str, position: int):
+        self._put(self.names, name, position)
+        jamo = to_jamo(name)
+        for end in range(1, len(jamo) + 1):
+            self._put(self.jamo_prefix, jamo[:end], position)
+        initials = choseong(name)
+        for start in range(len(initials)):
+            for end in range(start + 1, len(initials) + 1):
+                self._put(self.choseong_substring, initials[start:end], position)
+            self._put(self.choseong_prefix, initials[:start + 1], position)
+        self.by_length.setdefault(len(jamo), []).append((jamo, position))
+
+    def _contained(self, query: str) -> List[int]:
+        """입력 문자열 안에 들어 있는 이름 ("포항시청" → 포항시)"""
+        found = []
+        for start in range(len(query)):
+            for end in range(len(query), start + 1, -1):
+                found.extend(self.names.get(query[start:end], ()))
+        return found
+
+    def _fuzzy(self, query: str, limit: int) -> List[Tuple[int, int]]:
+        jamo = to_jamo(query)
+        matches = []
+        for length in range(len(jamo) - limit, len(jamo) + limit + 1):
+            for candidate, position in self.by_length.get(length, ()):
+                distance = edit_distance(jamo, candidate, limit)
+                if distance <= limit:
+                    matches.append((position, distance))
+        return matches
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        입력에 맞는 시군구를 점수 순으로 반환합니다.
+
+        Args:
+            query: 입력 문자열 (초성, 일부, 오타 포함 가능)
+            limit: 최대 결과 수
+
+        Returns:
+            [{'sido', 'sido_code', 'sigun', 'sigun_code', 'score'}, ...]
+        """
+        return [dict(self.entries[position], score=score)
+                for position, score in self._ranked(_normalize(query))[:limit]]
+
+    def _ranked(self, query: str) -> List[Tuple[int, int]]:
+        """(결과 번호, 점수) 점수 순 리스트 (최근 RANK_CACHE_SIZE 개 입력은 캐시)"""
+        cache = self._rank_cache
+        ranked = cache.get(query)
+        if ranked is None:
+            ranked = self._rank(query)
+            cache[query] = ranked
+            if len(cache) > RANK_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            try:
+                cache.move_to_end(query)
+            except KeyError:
+                pass  # 다른 스레드가 방금 밀어냄
+        return ranked
+
+    def _rank(self, query: str) -> List[Tuple[int, int]]:
+        if not query:
+            return []
+        scores: Dict[int, int] = {}
+
+        def offer(positions, score):
+            for position in positions:
+                if scores.get(position, -1) < score:
+                    scores[position] = score
+
+        if is_choseong_query(query):
+            offer(self.choseong_prefix.get(query, ()), SCORE_CHOSEONG_PREFIX)
+            offer(self.choseong_substring.get(query, ()), SCORE_CHOSEONG)
+        else:
+            offer(self.names.get(query, ()), SCORE_EXACT)
+            offer(self.jamo_prefix.get(to_jamo(query), ()), SCORE_PREFIX)
+            offer(self.index.substrings.get(query, ()), SCORE_SUBSTRING)
+            offer(self._contained(query), SCORE_CONTAINED)
+            # 앞의 방법으로 찾지 못했을 때만 오타 허용 검색
+            if not scores and len(query) >= 2:
+                max_distance = 1 if len(query) <= 3 else 2
+                for position, distance in self._fuzzy(query, max_distance):
+                    offer((position,), SCORE_FUZZY - 10 * (distance - 1))
+
+        # 시도 한정어: "강원 고성" → 나머지("고성")로 찾은 강원 시군구에 가산점,
+        # "세종"처럼 시도명만 입력하면 이미 찾은 그 시도의 시군구에 가산점
+        base = list(scores.items())
+        qualified = False
+        for end in range(len(query), 0, -1):
+            head = query[:end]
+            sidos = self.sido_prefix.get(head)
+            if not sidos:
+                continue
+            rest = query[end:]
+            if head in sidos:
+                qualified = True
+                for suffix in SIDO_SUFFIXES:
+                    if rest.startswith(suffix):
+                        rest = rest[len(suffix):]
+                        break
+                found = self._ranked(rest) if rest else base
+            elif qualified:
+                break  # 시도명 전체가 붙은 입력은 그 앞부분으로 다시 보지 않음
+            else:
+                # 시도명 앞부분("충")은 흔한 글자라 나머지가 이름 앞부분과 맞을 때만 사용
+                found = [(position, score) for position, score in self._ranked(rest)
+                         if score >= SCORE_CHOSEONG_PREFIX]
+            for position, score in found:
+                if self.entries[position]['sido'] in sidos:
+                    offer((position,), score + SCORE_SIDO_BONUS)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def best(self, query: str) -> Optional[Dict[str, object]]:
+        """가장 점수가 높은 시군구 1개 (없으면 None)"""
+        found = self.suggest(query, 1)
+        return found[0] if found else None
@@ -7,6 +7,7 @@ fetch_regions.py로 수집한 지역 정보를 활용하여
 """
 
 from casper_checker import CasperChecker, CarModel
+from request_payload import build_params
 
 
 def search_by_region_example():
@@ -22,27 +23,11 @@ def search_by_region_example():
     print("\n[예시 1] 경북 포항시 - 2026 캐스퍼 일렉트릭")
     print("-"*70)
     
-    params_pohang = {
-        "carCode": "AX05",                    # 2026 캐스퍼 일렉트릭
-        "subsidyRegion": "2800",              # 보조금 지역
-        "exhbNo": "R0003",
-        "sortCode": "10",
-        "deliveryAreaCode": "N",              # 경북
-        "deliveryLocalAreaCode": "NL",        # 포항시
-        "carBodyCode": "",
-        "carEngineCode": "",
-        "carTrimCode": "",
-        "exteriorColorCode": "",
-        "interiorColorCode": [],
-        "deliveryCenterCode": "",
-        "wpaScnCd": "",
-        "optionFilter": "",
-        "minSalePrice": "35877000",
-        "maxSalePrice": "37306000",
-        "choiceOptYn": "Y",
-        "pageNo": 1,
-        "pageSize": 18
-    }
+    params_pohang = build_params(
+        "R0003", CarModel.CASPER_ELECTRIC_2026,
+        deliveryAreaCode="N",              # 경북
+        deliveryLocalAreaCode="NL"         # 포항시
+    )
     
     count = checker.get_car_count(custom_params=params_pohang)
     print(f"경북 포항시 재고: {count}대")
@@ -50,33 +35,17 @@ def search_by_region_example():
     if count > 0:
         cars = checker.get_car_list(custom_params=params_pohang)
         for i, car in enumerate(cars[:3], 1):
-            print(f"  {i}. {car['exteriorColorName']} - {int(car['finalAmount']):,}원")
+            print(f"  {i}. {car.color} - {car.price:,}원")
     
     # 예시 2: 서울 지역 검색
     print("\n[예시 2] 서울 - 2026 캐스퍼")
     print("-"*70)
     
-    params_seoul = {
-        "carCode": "AX06",                    # 2026 캐스퍼
-        "subsidyRegion": "",
-        "exhbNo": "R0003",
-        "sortCode": "10",
-        "deliveryAreaCode": "B",              # 서울
-        "deliveryLocalAreaCode": "B0",        # 서울특별시 (시군구 구분 없음)
-        "carBodyCode": "",
-        "carEngineCode": "",
-        "carTrimCode": "",
-        "exteriorColorCode": "",
-        "interiorColorCode": [],
-        "deliveryCenterCode": "",
-        "wpaScnCd": "",
-        "optionFilter": "",
-        "minSalePrice": "",
-        "maxSalePrice": "",
-        "choiceOptYn": "Y",
-        "pageNo": 1,
-        "pageSize": 18
-    }
+    params_seoul = build_params(
+        "R0003", CarModel.CASPER_2026,
+        deliveryAreaCode="B",              # 서울
+        deliveryLocalAreaCode="B0"         # 서울특별시 (시군구 구분 없음)
+    )
     
     count = checker.get_car_count(custom_params=params_seoul)
     print(f"서울 재고: {count}대")
@@ -85,27 +54,11 @@ def search_by_region_example():
     print("\n[예시 3] 전북 전체 - 캐스퍼 일렉트릭")
     print("-"*70)
     
-    params_jeonbuk = {
-        "carCode": "AX03",                    # 캐스퍼 일렉트릭
-        "subsidyRegion": "2800",
-        "exhbNo": "R0003",
-        "sortCode": "10",
-        "deliveryAreaCode": "J",              # 전북
-        "deliveryLocalAreaCode": "J1",        # 군산시 (예시)
-        "carBodyCode": "",
-        "carEngineCode": "",
-        "carTrimCode": "",
-        "exteriorColorCode": "",
-        "interiorColorCode": [],
-        "deliveryCenterCode": "",
-        "wpaScnCd": "",
-        "optionFilter": "",
-        "minSalePrice": "32060670",
-        "maxSalePrice": "32060670",
-        "choiceOptYn": "Y",
-        "pageNo": 1,
-        "pageSize": 18
-    }
+    params_jeonbuk = build_params(
+        "R0003", CarModel.CASPER_ELECTRIC,
+        deliveryAreaCode="J",              # 전북
+        deliveryLocalAreaCode="J1"         # 군산시 (예시)
+    )
     
     count = checker.get_car_count(custom_params=params_jeonbuk)
     print(f"전북 군산시 재고: {count}대")
@@ -157,24 +110,25 @@ def create_region_search_helper():
 1. fetch_regions.py 실행:
    python fetch_regions.py
    
-2. region_constants.py 파일이 생성됨
+2. region_table.bin (및 region_constants.py, region_data.json) 파일이 생성됨
 
-3. 헬퍼 함수 사용:
-   from region_constants import SIDO_CODES, SIGUN_CODES
+3. 헬퍼 함수 사용 (공용 테이블: 데이터가 갱신되면 새 코드를 반환):
+   from region_table import get_region_table
+   table = get_region_table()
    
    # 경북 포항 코드 가져오기
-   sido_code = SIDO_CODES["경북"]          # "N"
-   sigun_code = SIGUN_CODES["경북"]["포항시"]  # "NL"
+   sido_code = table.sido_codes["경북"]              # "N"
+   sigun_code = table.sigun_codes["경북"]["포항시"]  # "NL"
    
 4. casper_checker와 연동:
    checker = CasperChecker()
    
-   params = {
-       "carCode": "AX05",
-       "deliveryAreaCode": sido_code,
-       "deliveryLocalAreaCode": sigun_code,
-       # ... 기타 파라미터
-   }
+   from request_payload import build_params
+   params = build_params(
+       "R0003", CarModel.CASPER_ELECTRIC_2026,
+       deliveryAreaCode=sido_code,
+       deliveryLocalAreaCode=sigun_code,
+   )
    
    cars = checker.get_car_list(custom_params=params)
 """
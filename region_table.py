@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+지역 코드 테이블 (marshal 캐시)
+
+region_constants.py(약 30KB, REGION_DATA 전체 사본 포함)를 import 하는 대신,
+시도/시군구 목록만 담은 작은 marshal 파일(region_table.bin)을 읽습니다.
+딕셔너리(SIDO_CODES/SIGUN_CODES 형식, REGION_DATA 형식, RegionIndex)는
+호출한 쪽이 처음 사용할 때 만듭니다.
+
+- region_table.bin 이 원본(region_constants.py / region_data.json)보다 오래되었거나
+  없거나 읽을 수 없으면 원본에서 다시 만들고 저장합니다.
+- fetch_regions.py 는 수집 결과를 이 파일로도 저장합니다.
+- get_region_table() 은 프로세스 전체가 공유하는 테이블 1개를 반환하고,
+  데이터 파일이 바뀌면 다시 로드합니다. (헬퍼/체커/스윕이 모두 이 테이블을 사용)
+- region_constants.py 는 모듈로 import 하지 않고 파일을 직접 실행해 읽습니다.
+  `from region_constants import SIDO_CODES` 처럼 직접 가져온 이름은 import 시점의
+  데이터에 고정되므로, 갱신을 따라가야 하는 코드는 get_region_table() 을 사용하세요.
+
+사용법:
+    python region_table.py            # 원본에서 테이블 다시 생성
+"""
+
+import os
+import time
+import marshal
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Any, Mapping, Optional, Tuple
+
+from region_index import RegionIndex
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TABLE_FILE = os.path.join(BASE_DIR, "region_table.bin")
+CONSTANTS_FILE = os.path.join(BASE_DIR, "region_constants.py")
+JSON_FILE = os.path.join(BASE_DIR, "region_data.json")
+
+FORMAT = ("region_table", 1)
+
+# 공유 테이블의 데이터 파일 변경 확인 주기 (초)
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+class RegionTable:
+    """
+    시도/시군구 목록과 필요할 때 만드는 조회용 딕셔너리
+
+    sidos: ((시도명, 시도 코드), ...)
+    siguns: ((시도 번호, 시군구명, 시군구 코드, 나머지 필드 dict), ...)
+
+    여러 곳에서 공유하므로 내용을 바꾸지 않습니다. (코드 딕셔너리는 읽기 전용 뷰,
+    region_data 도 수정하지 말고 필요하면 복사해서 사용)
+    """
+
+    def __init__(
+        self,
+        sidos: Tuple[Tuple[str, str], ...],
+        siguns: Tuple[Tuple[int, str, str, Dict[str, Any]], ...]
+    ):
+        self.sidos = sidos
+        self.siguns = siguns
+        self._sido_codes: Optional[Mapping[str, str]] = None
+        self._sigun_codes: Optional[Mapping[str, Mapping[str, str]]] = None
+        self._region_data: Optional[Dict[str, Any]] = None
+        self._index: Optional[RegionIndex] = None
+        self._search_index = None
+
+    @classmethod
+    def from_region_data(cls, region_data: Dict[str, Any]) -> "RegionTable":
+        """REGION_DATA 형식의 딕셔너리로 테이블을 만듭니다."""
+        sidos = []
+        siguns = []
+        for sido_index, (sido_name, info) in enumerate(region_data.items()):
+            sidos.append((sido_name, info["code"]))
+            for sigun in info.get("sigun_list") or []:
+                extra = {k: v for k, v in sigun.items() if k not in ("code", "codeName")}
+                siguns.append((sido_index, sigun["codeName"], sigun["code"], extra))
+        return cls(tuple(sidos), tuple(siguns))
+
+    def __len__(self) -> int:
+        return len(self.siguns)
+
+    def __bool__(self) -> bool:
+        return bool(self.sidos)
+
+    @property
+    def sido_codes(self) -> Mapping[str, str]:
+        """{시도명: 시도 코드} (SIDO_CODES 형식, 읽기 전용)"""
+        if self._sido_codes is None:
+            self._sido_codes = MappingProxyType(dict(self.sidos))
+        return self._sido_codes
+
+    @property
+    def sigun_codes(self) -> Mapping[str, Mapping[str, str]]:
+        """{시도명: {시군구명: 시군구 코드}} (SIGUN_CODES 형식, 읽기 전용)"""
+        if self._sigun_codes is None:
+            codes: Dict[str, Dict[str, str]] = {}
+            for sido_index, sigun_name, sigun_code, _ in self.siguns:
+                codes.setdefault(self.sidos[sido_index][0], {})[sigun_name] = sigun_code
+            self._sigun_codes = MappingProxyType({
+                sido_name: MappingProxyType(siguns) for sido_name, siguns in codes.items()
+            })
+        return self._sigun_codes
+
+    @property
+    def region_data(self) -> Dict[str, Any]:
+        """REGION_DATA 형식 (fetch_regions.py 수집 결과와 같은 구조)"""
+        if self._region_data is None:
+            data: Dict[str, Any] = {}
+            for sido_name, sido_code in self.sidos:
+                data[sido_name] = {"code": sido_code, "has_sigun": False, "sigun_list": [], "count": 0}
+            for sido_index, sigun_name, sigun_code, extra in self.siguns:
+                info = data[self.sidos[sido_index][0]]
+                info["sigun_list"].append(dict({"code": sigun_code, "codeName": sigun_name}, **extra))
+            for info in data.values():
+                count = len(info["sigun_list"])
+                info["has_sigun"] = count > 1
+                info["count"] = count
+            self._region_data = data
+        return self._region_data
+
+    @property
+    def index(self) -> RegionIndex:
+        """이름 ↔ 코드 색인"""
+        if self._index is None:
+            index = RegionIndex()
+            for sido_name, sido_code in self.sidos:
+                index.add_sido(sido_name, sido_code)
+            for sido_index, sigun_name, sigun_code, _ in self.siguns:
+                index.add_sigun(self.sidos[sido_index][0], sigun_name, sigun_code)
+            self._index = index
+        return self._index
+
+    @property
+    def search_index(self):
+        """자동완성 검색 색인 (region_search.RegionSearchIndex)"""
+        if self._search_index is None:
+            from region_search import RegionSearchIndex
+            self._search_index = RegionSearchIndex(self.index)
+        return self._search_index
+
+    def content_hash(self) -> str:
+        """내용 해시 (같은 지역 데이터면 같은 값)"""
+        import json
+        import hashlib
+        encoded = json.dumps([self.sidos, self.siguns], ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def dumps(self) -> bytes:
+        """marshal 바이트로 직렬화합니다."""
+        return marshal.dumps((FORMAT, self.sidos, self.siguns))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "RegionTable":
+        """
+        marshal 바이트에서 테이블을 읽습니다.
+
+        Raises:
+            ValueError: 형식이 맞지 않음
+        """
+        try:
+            fmt, sidos, siguns = marshal.loads(data)
+        except (EOFError, TypeError, ValueError) as e:
+            raise ValueError(f"지역 테이블을 읽을 수 없습니다: {e}")
+        if fmt != FORMAT:
+            raise ValueError(f"지역 테이블 형식이 다릅니다: {fmt}")
+        return cls(sidos, siguns)
+
+
+# 지역 데이터가 바뀌었을 때 호출할 함수 (싱글톤 초기화 등)
+_listeners: List[Callable[[RegionTable], None]] = []
+
+
+def add_listener(callback: Callable[[RegionTable], None]):
+    """지역 데이터가 바뀌었을 때 호출할 함수를 등록합니다."""
+    _listeners.append(callback)
+
+
+def notify_changed(table: RegionTable):
+    """공유 테이블을 교체하고 등록된 함수들에 새 지역 테이블을 알립니다."""
+    global _shared, _shared_stamp
+    with _shared_lock:
+        _shared = table
+        _shared_stamp = _stamp()
+    for callback in list(_listeners):
+        try:
+            callback(table)
+        except Exception as e:
+            print(f"⚠️  지역 데이터 변경 알림 실패: {e}")
+
+
+def save_table(table: RegionTable, filename: str = TABLE_FILE):
+    """테이블을 파일로 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    tmp = f"{filename}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(table.dumps())
+    os.replace(tmp, filename)
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _stamp() -> Tuple:
+    """데이터 파일들의 (수정 시각, 크기) - 달라지면 다시 로드"""
+    stamp = []
+    for path in (TABLE_FILE, CONSTANTS_FILE, JSON_FILE):
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _read_constants() -> Dict[str, Any]:
+    # import 하지 않고 실행만 함: sys.modules 의 region_constants 를 바꾸지 않음
+    import runpy
+    return runpy.run_path(CONSTANTS_FILE)["REGION_DATA"]
+
+
+def _read_json() -> Dict[str, Any]:
+    import json
+    with open(JSON_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _from_sources() -> Optional[RegionTable]:
+    """
+    region_constants.py / region_data.json 중 수정 시각이 더 최근인 파일에서
+    테이블을 만듭니다. (읽을 수 없으면 다른 파일 사용)
+    """
+    sources = [(_mtime(CONSTANTS_FILE), CONSTANTS_FILE, _read_constants),
+               (_mtime(JSON_FILE), JSON_FILE, _read_json)]
+    for mtime, path, read in sorted(sources, key=lambda source: -source[0]):
+        if not mtime:
+            continue
+        try:
+            return RegionTable.from_region_data(read())
+        except (OSError, ValueError, SyntaxError, KeyError, TypeError, AttributeError) as e:
+            print(f"❌ 지역 데이터 로드 실패 ({os.path.basename(path)}): {e}")
+    return None
+
+
+def load_region_table(filename: str = TABLE_FILE) -> Optional[RegionTable]:
+    """
+    지역 테이블을 로드합니다.
+
+    region_table.bin 이 원본보다 새로우면 그대로 읽고, 아니면 원본에서 만들어 저장합니다.
+
+    Returns:
+        RegionTable, 지역 데이터가 전혀 없으면 None
+    """
+    table_mtime = _mtime(filename)
+    if table_mtime and table_mtime >= max(_mtime(CONSTANTS_FILE), _mtime(JSON_FILE)):
+        try:
+            with open(filename, 'rb') as f:
+                return RegionTable.loads(f.read())
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {e} - 원본에서 다시 만듭니다.")
+
+    table = _from_sources()
+    if table:
+        try:
+            save_table(table, filename)
+        except OSError:
+            pass  # 읽기 전용 설치 등: 캐시 없이 계속 사용
+    return table
+
+
+# 프로세스 공용 테이블
+_shared: Optional[RegionTable] = None
+_shared_stamp: Optional[Tuple] = None
+_shared_checked = 0.0
+_shared_lock = threading.Lock()
+
+
+def get_region_table() -> Optional[RegionTable]:
+    """
+    프로세스 공용 지역 테이블을 반환합니다.
+
+    처음 호출할 때 한 번 로드하고, 이후에는 RELOAD_CHECK_INTERVAL 초마다 데이터 파일의
+    수정 시각만 확인합니다. 파일이 바뀌었으면 다시 로드해 교체하고 add_listener 로
+    등록된 함수들에 알립니다. (이미 받아 둔 테이블은 바뀌지 않음)
+
+    Returns:
+        RegionTable, 지역 데이터가 전혀 없으면 None
+    """
+    global _shared, _shared_stamp, _shared_checked
+    now = time.monotonic()
+    if _shared_stamp is not None and now - _shared_checked < RELOAD_CHECK_INTERVAL:
+        return _shared
+
+    with _shared_lock:
+        _shared_checked = now
+        stamp = _stamp()
+        if _shared_stamp is not None and stamp == _shared_stamp:
+            return _shared
+        reloading = _shared_stamp is not None
+        table = load_region_table()
+        if reloading and not table:
+            # 파일을 쓰는 중이거나 지워진 경우: 기존 테이블을 계속 사용
+            _shared_stamp = stamp
+            return _shared
+        if not reloading:
+            _shared = table
+            _shared_stamp = _stamp()  # load_region_table 이 테이블 파일을 다시 썼을 수 있음
+            return _shared
+
+    print("🔄 지역 데이터 파일이 바뀌어 다시 로드했습니다.")
+    notify_changed(table)
+    return table
+
+
+def main():
+    table = _from_sources()
+    if not table:
+        print("❌ 지역 데이터가 없습니다. fetch_regions.py를 먼저 실행하세요.")
+        return
+    save_table(table)
+    print(f"💾 {TABLE_FILE} 저장 완료: 시도 {len(table.sidos)}개, 시군구 {len(table)}개 "
+          f"({os.path.getsize(TABLE_FILE):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+재고 조회 요청 본문(payload) 생성 모듈
+
+기획전/모델별 기본 파라미터 템플릿을 한 번만 만들어 두고, 지역/필터만 바꿔
+조회 파라미터를 만듭니다. 같은 파라미터의 JSON 인코딩 결과(요청 바이트)는
+캐시해 두어 같은 조회를 반복하는 모니터링에서 매번 다시 직렬화하지 않습니다.
+
+Examples:
+    >>> params = build_params("R0003", CarModel.CASPER_2026,
+    ...                       deliveryAreaCode="B", deliveryLocalAreaCode="B0")
+    >>> body = encode_params(params)          # requests.post(url, data=body)
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+
+# 기획전별 기본 지역 코드와 페이지 크기
+EXHIBITION_DEFAULTS = {
+    "R0003": {"deliveryAreaCode": "J", "deliveryLocalAreaCode": "J1", "pageSize": 18},
+    "E20260133": {"deliveryAreaCode": "H", "deliveryLocalAreaCode": "H0", "pageSize": 100},
+}
+
+# 요청 본문의 필드 순서 (API 화면에서 보내는 순서 그대로)
+FIELDS = (
+    "carCode",
+    "subsidyRegion",
+    "exhbNo",
+    "sortCode",
+    "deliveryAreaCode",
+    "deliveryLocalAreaCode",
+    "carBodyCode",
+    "carEngineCode",
+    "carTrimCode",
+    "exteriorColorCode",
+    "interiorColorCode",
+    "deliveryCenterCode",
+    "wpaScnCd",
+    "optionFilter",
+    "minSalePrice",
+    "maxSalePrice",
+    "choiceOptYn",
+    "pageNo",
+    "pageSize",
+)
+
+
+class PayloadTemplate:
+    """기획전 + 모델 1개의 기본 파라미터"""
+
+    __slots__ = ("exhibition_no", "base")
+
+    def __init__(self, exhibition_no: str, model_data: Optional[Dict[str, Any]] = None):
+        defaults = EXHIBITION_DEFAULTS.get(exhibition_no, EXHIBITION_DEFAULTS["R0003"])
+        model_data = model_data or {}
+        self.exhibition_no = exhibition_no
+        self.base: Dict[str, Any] = {
+            "carCode": model_data.get("carCode", ""),
+            "subsidyRegion": model_data.get("subsidyRegion", ""),
+            "exhbNo": exhibition_no,
+            "sortCode": "10",
+            "deliveryAreaCode": defaults["deliveryAreaCode"],
+            "deliveryLocalAreaCode": defaults["deliveryLocalAreaCode"],
+            "carBodyCode": "",
+            "carEngineCode": "",
+            "carTrimCode": "",
+            "exteriorColorCode": "",
+            "interiorColorCode": [],
+            "deliveryCenterCode": "",
+            "wpaScnCd": "",
+            "optionFilter": "",
+            "minSalePrice": model_data.get("minSalePrice", ""),
+            "maxSalePrice": model_data.get("maxSalePrice", ""),
+            "choiceOptYn": "Y",
+            "pageNo": 1,
+            "pageSize": defaults["pageSize"],
+        }
+
+    def params(self, **overrides) -> Dict[str, Any]:
+        """
+        조회 파라미터를 만듭니다. (매번 새 dict)
+
+        Args:
+            **overrides: 바꿀 필드 (예: deliveryAreaCode="B", exteriorColorCode="SAW")
+        """
+        unknown = set(overrides) - set(self.base)
+        if unknown:
+            raise ValueError(f"알 수 없는 조회 파라미터: {', '.join(sorted(unknown))}")
+        params = dict(self.base)
+        params.update(overrides)
+        params["interiorColorCode"] = list(params["interiorColorCode"] or [])
+        return params
+
+
+@lru_cache(maxsize=64)
+def _template(exhibition_no: str, model_key: Tuple[Tuple[str, Any], ...]) -> PayloadTemplate:
+    return PayloadTemplate(exhibition_no, dict(model_key))
+
+
+def get_template(exhibition_no: str, model=None) -> PayloadTemplate:
+    """
+    기획전/모델의 템플릿을 반환합니다. (한 번 만든 템플릿은 재사용)
+
+    Args:
+        exhibition_no: 기획전 번호
+        model: CarModel / SpecialCarModel (없으면 전체 모델)
+    """
+    model_data = model.value if model is not None else {}
+    key = tuple(sorted((k, v) for k, v in model_data.items() if k != "name"))
+    return _template(exhibition_no, key)
+
+
+def build_params(exhibition_no: str, model=None, **overrides) -> Dict[str, Any]:
+    """기획전/모델의 기본 파라미터에 overrides 를 적용한 조회 파라미터를 반환합니다."""
+    return get_template(exhibition_no, model).params(**overrides)
+
+
+# 파라미터 → 인코딩된 요청 본문 (최근 사용 순, 여러 스레드의 체커가 함께 사용)
+_encoded: "OrderedDict[Tuple, bytes]" = OrderedDict()
+_encoded_lock = threading.Lock()
+_ENCODED_MAX = 512
+
+
+def _params_key(params: Dict[str, Any]) -> Tuple:
+    return tuple(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in params.items()
+    )
+
+
+def encode_params(params: Dict[str, Any]) -> bytes:
+    """
+    조회 파라미터를 요청 본문 바이트로 인코딩합니다.
+
+    requests 의 json= 인자와 같은 결과이며, 같은 파라미터는 캐시된 바이트를 반환합니다.
+    """
+    try:
+        key = _params_key(params)
+        hash(key)
+    except TypeError:  # 해시할 수 없는 값 (중첩 dict 등)
+        return json.dumps(params, allow_nan=False).encode("utf-8")
+
+    with _encoded_lock:
+        body = _encoded.get(key)
+        if body is not None:
+            _encoded.move_to_end(key)
+            return body
+
+    body = json.dumps(params, allow_nan=False).encode("utf-8")
+    with _encoded_lock:
+        _encoded[key] = body
+        if len(_encoded) > _ENCODED_MAX:
+            _encoded.popitem(last=False)
+    return body
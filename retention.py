@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+스냅샷 보존 정책 및 압축 보관
+
+오래된 검색 결과를 정책에 따라 솎아내고(다운샘플링), 남길 결과는
+월별 압축 보관 파일로 옮깁니다. 옮긴 위치는 카탈로그에 기록하므로
+이력 조회 시 그대로 찾을 수 있습니다.
+
+기본 정책:
+    - 1일 이내: 모두 보관
+    - 30일 이내: 시간당 1개 (그 시간의 마지막 결과)
+    - 그 이후: 하루 1개
+
+대상:
+    - 작업 디렉터리의 casper_stock_* / special_stock_* 결과 파일 (.json, .jsonl.gz)
+    - 보관 파일 (archive/) 안의 스냅샷
+    - 델타 스냅샷 저장소 (snapshots/) 의 스트림 색인
+
+결과 파일과 보관 파일은 사용자가 직접 저장한 것이므로 python retention.py 로
+실행할 때만 정리합니다. 모니터링 중 백그라운드 정리(선택)는 snapshots/ 만 다룹니다.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
+
+from snapshot_stream import SnapshotReader, SnapshotWriter
+from snapshot_catalog import SnapshotCatalog, parse_result_filename
+from snapshot_store import SnapshotStore
+
+
+def iter_result_file(path: str) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    결과 파일의 (시도, 시군구, 레코드)를 순서대로 읽습니다.
+
+    NDJSON 형식과 이전 JSON 형식(regions 중첩 딕셔너리)을 모두 지원합니다.
+    """
+    if path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for sido, sigun_dict in data.get("regions", {}).items():
+            for sigun, cars in sigun_dict.items():
+                for car in cars:
+                    yield sido, sigun, car
+    else:
+        for record in SnapshotReader(path):
+            yield record["sido"], record["sigun"], record
+
+
+class RetentionPolicy:
+    """
+    시간 구간별 보존 정책
+
+    Examples:
+        >>> policy = RetentionPolicy(raw=timedelta(days=1), hourly=timedelta(days=30))
+        >>> keep, drop = policy.select(entries, key=lambda e: e["ts"])
+    """
+
+    def __init__(self, raw: timedelta = timedelta(days=1), hourly: timedelta = timedelta(days=30)):
+        """
+        Args:
+            raw: 모두 보관하는 기간
+            hourly: 시간당 1개를 보관하는 기간 (그 이후는 하루 1개)
+        """
+        self.raw = raw
+        self.hourly = hourly
+
+    def bucket(self, ts: datetime, now: datetime) -> Optional[str]:
+        """
+        시각이 속한 보존 구간을 반환합니다. (None이면 모두 보관하는 구간)
+        """
+        age = now - ts
+        if age < self.raw:
+            return None
+        if age < self.hourly:
+            return ts.strftime("H%Y%m%d%H")
+        return ts.strftime("D%Y%m%d")
+
+    def select(
+        self,
+        items: List[Any],
+        key: Callable[[Any], datetime],
+        now: Optional[datetime] = None,
+        occupied: Optional[set] = None
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        보관할 항목과 지울 항목을 나눕니다. 구간마다 가장 늦은 항목 1개를 남깁니다.
+
+        Args:
+            items: 항목 리스트
+            key: 항목의 시각을 반환하는 함수
+            now: 기준 시각 (기본 현재)
+            occupied: 이미 다른 곳에 보관된 항목이 있는 구간 (이 구간의 항목은 모두 지움)
+
+        Returns:
+            (보관 리스트, 삭제 리스트) - 각각 시간순
+        """
+        now = now or datetime.now()
+        occupied = occupied or set()
+        latest: Dict[str, Any] = {}
+        keep, drop = [], []
+
+        for item in sorted(items, key=key):
+            bucket = self.bucket(key(item), now)
+            if bucket is None:
+                keep.append(item)
+            elif bucket in occupied:
+                drop.append(item)
+            else:
+                if bucket in latest:
+                    drop.append(latest[bucket])
+                latest[bucket] = item
+
+        keep.extend(latest.values())
+        keep.sort(key=key)
+        return keep, drop
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+class RetentionEngine:
+    """
+    보존 정책 실행기
+
+    한 번 실행할 때 최대 max_files 개의 결과 파일과 보관 파일 1개만 처리하므로
+    반복 실행하면서 조금씩 정리합니다.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = ".",
+        archive_dir: Optional[str] = "archive",
+        catalog: Optional[SnapshotCatalog] = None,
+        store: Optional[SnapshotStore] = None,
+        policy: Optional[RetentionPolicy] = None,
+        dry_run: bool = False
+    ):
+        """
+        Args:
+            directory: 결과 파일이 있는 디렉터리 (None이면 결과 파일을 건드리지 않음)
+            archive_dir: 보관 파일 디렉터리 (None이면 보관/압축하지 않음)
+            catalog: 스냅샷 카탈로그 (기본: snapshot_catalog.db, 저장소만 정리하면 사용 안 함)
+            store: 델타 스냅샷 저장소 (None이면 정리하지 않음)
+            policy: 보존 정책 (기본 RetentionPolicy())
+            dry_run: 파일을 바꾸지 않고 계획만 출력
+        """
+        self.directory = directory
+        self.archive_dir = archive_dir
+        # 결과/보관 파일을 다루지 않으면 카탈로그도 열지 않음
+        self.catalog = catalog or (SnapshotCatalog() if directory or archive_dir else None)
+        self.store = store
+        self.policy = policy or RetentionPolicy()
+        self.dry_run = dry_run
+        self.stats = {"archived": 0, "deleted": 0, "compacted": 0, "pruned": 0, "gc": 0}
+        self._archive_cursor = 0
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+    @classmethod
+    def store_only(cls, store: SnapshotStore, **kwargs) -> "RetentionEngine":
+        """델타 스냅샷 저장소만 정리하는 실행기 (모니터링 중 백그라운드 정리용)"""
+        return cls(directory=None, archive_dir=None, store=store, **kwargs)
+
+    def _archive_path(self, exhibition_no: str, model_code: str, ts: datetime) -> str:
+        return os.path.join(self.archive_dir, f"{exhibition_no}_{model_code}_{ts.strftime('%Y-%m')}.jsonl.gz")
+
+    def result_files(self) -> List[Tuple[str, str, str, datetime]]:
+        """디렉터리의 결과 파일 (경로, 기획전, 모델, 시각) 리스트 (시간순)"""
+        if not self.directory:
+            return []
+        files = []
+        for name in os.listdir(self.directory):
+            info = parse_result_filename(name)
+            if info:
+                files.append((os.path.join(self.directory, name),) + info)
+        return sorted(files, key=lambda f: f[3])
+
+    def _delete_file(self, path: str):
+        for target in (path, path + ".idx"):
+            if os.path.exists(target):
+                os.remove(target)
+        self.catalog.remove(path)
+
+    def archive_file(self, path: str, exhibition_no: str, model_code: str, ts: datetime) -> Dict[str, Any]:
+        """
+        결과 파일 1개를 월별 보관 파일 끝에 추가하고 원본을 지웁니다.
+
+        Returns:
+            카탈로그 항목
+        """
+        archive = self._archive_path(exhibition_no, model_code, ts)
+        timestamp = ts.isoformat()
+        with SnapshotWriter(archive, append=True, timestamp=timestamp, exhibition_no=exhibition_no,
+                            model_code=model_code, source=os.path.basename(path)) as writer:
+            for sido, sigun, record in iter_result_file(path):
+                writer.write_record(sido, sigun, record)
+
+        entry = dict(path=archive, timestamp=timestamp, exhibition_no=exhibition_no, model_code=model_code,
+                     total_count=writer.total_count, offset=writer.offset, sidos=writer.sidos, archived=True)
+        self.catalog.add(**entry)
+        self._delete_file(path)
+        return entry
+
+    def process_files(self, now: datetime, max_files: int) -> int:
+        """보관 기간이 지난 결과 파일을 보관 파일로 옮기거나 지웁니다."""
+        if not self.directory or not self.archive_dir:
+            return 0
+        streams: Dict[Tuple[str, str], List[tuple]] = {}
+        for item in self.result_files():
+            if self.policy.bucket(item[3], now) is not None:
+                streams.setdefault((item[1], item[2]), []).append(item)
+
+        processed = 0
+        for (exhibition_no, model_code), items in streams.items():
+            archived = self.catalog.find(model_code=model_code, exhibition_no=exhibition_no)
+            occupied = {
+                self.policy.bucket(_parse_ts(entry["timestamp"]), now)
+                for entry in archived if entry["archived"]
+            }
+            keep, drop = self.policy.select(items, key=lambda f: f[3], now=now, occupied=occupied)
+
+            for path, *_ in drop:
+                if processed >= max_files:
+                    return processed
+                if self.dry_run:
+                    print(f"  🗑️  삭제 예정: {path}")
+                else:
+                    self._delete_file(path)
+                    self.stats["deleted"] += 1
+                processed += 1
+
+            for path, exh, model, ts in keep:
+                if processed >= max_files:
+                    return processed
+                if self.dry_run:
+                    print(f"  📦 보관 예정: {path} → {self._archive_path(exh, model, ts)}")
+                else:
+                    try:
+                        self.archive_file(path, exh, model, ts)
+                        self.stats["archived"] += 1
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️  보관 실패 ({path}): {e}")
+                processed += 1
+        return processed
+
+    def compact_archive(self, path: str, now: datetime) -> int:
+        """
+        보관 파일 안에서 정책상 필요 없어진 스냅샷을 지웁니다.
+
+        스냅샷마다 별도 gzip 멤버이므로 압축을 풀지 않고 남길 구간만 복사합니다.
+
+        Returns:
+            지운 스냅샷 수
+        """
+        entries = sorted(self.catalog.find(path=path), key=lambda e: e["offset"])
+        if not entries:
+            return 0
+        keep, drop = self.policy.select(entries, key=lambda e: _parse_ts(e["timestamp"]), now=now)
+        if not drop:
+            return 0
+        if self.dry_run:
+            print(f"  🗜️  압축 예정: {path} (스냅샷 {len(drop)}개 제거)")
+            return len(drop)
+
+        size = os.path.getsize(path)
+        ends = {e["offset"]: (entries[i + 1]["offset"] if i + 1 < len(entries) else size)
+                for i, e in enumerate(entries)}
+        kept_offsets = {e["offset"] for e in keep}
+
+        tmp = f"{path}.tmp"
+        moved = []
+        with open(path, 'rb') as src, open(tmp, 'wb') as dst:
+            for entry in entries:
+                if entry["offset"] not in kept_offsets:
+                    continue
+                start, end = entry["offset"], ends[entry["offset"]]
+                new_offset = dst.tell()
+                src.seek(start)
+                dst.write(src.read(end - start))
+                shift = new_offset - start
+                moved.append(dict(entry, offset=new_offset,
+                                  sidos={sido: offset + shift for sido, offset in entry["sidos"].items()}))
+        os.replace(tmp, path)
+
+        self.catalog.remove(path)
+        for entry in moved:
+            self.catalog.add(**entry)
+        return len(drop)
+
+    def process_archives(self, now: datetime) -> int:
+        """보관 파일 1개를 골라 압축합니다. (호출할 때마다 다음 파일)"""
+        if not self.archive_dir:
+            return 0
+        archives = sorted(name for name in os.listdir(self.archive_dir) if name.endswith(".jsonl.gz"))
+        if not archives:
+            return 0
+        name = archives[self._archive_cursor % len(archives)]
+        self._archive_cursor += 1
+        removed = self.compact_archive(os.path.join(self.archive_dir, name), now)
+        if not self.dry_run:
+            self.stats["compacted"] += removed
+        return removed
+
+    def process_store(self, now: datetime) -> int:
+        """델타 스냅샷 저장소의 색인을 정책에 맞게 줄이고 쓰지 않는 객체를 지웁니다."""
+        if self.store is None:
+            return 0
+        pruned = 0
+
+        def select(entries):
+            return self.policy.select(entries, key=lambda e: _parse_ts(e["ts"]), now=now)[0]
+
+        for stream in self.store.streams():
+            if self.dry_run:
+                entries = self.store.history(stream)
+                dropped = len(entries) - len(select(entries))
+                if dropped:
+                    print(f"  ✂️  색인 정리 예정: {stream} ({dropped}개)")
+            else:
+                # 색인 읽기/선택/다시 쓰기를 저장소 잠금 안에서 (동시에 put() 되는 스윕 보존)
+                pruned += self.store.retain(stream, select)
+        if pruned and not self.dry_run:
+            self.stats["pruned"] += pruned
+            self.stats["gc"] += self.store.gc()
+        return pruned
+
+    def run_once(self, now: Optional[datetime] = None, max_files: int = 50) -> int:
+        """
+        정책을 한 번 적용합니다.
+
+        Args:
+            now: 기준 시각 (기본 현재)
+            max_files: 이번에 처리할 최대 결과 파일 수
+
+        Returns:
+            처리한 항목 수 (0이면 더 할 일이 없음)
+        """
+        now = now or datetime.now()
+        done = self.process_files(now, max_files)
+        done += self.process_archives(now)
+        done += self.process_store(now)
+        return done
+
+    def run_all(self, now: Optional[datetime] = None, batch: int = 200):
+        """남은 일이 없을 때까지 정책을 적용합니다. (모든 보관 파일 압축 포함)"""
+        now = now or datetime.now()
+        while self.process_files(now, batch) >= batch:
+            pass
+        for _ in (os.listdir(self.archive_dir) if self.archive_dir else ()):
+            self.process_archives(now)
+        self.process_store(now)
+
+
+class RetentionWorker:
+    """
+    보존 정책을 백그라운드 스레드에서 주기적으로 실행합니다.
+
+    Examples:
+        >>> worker = RetentionWorker(RetentionEngine.store_only(get_snapshot_store())).start()
+        >>> ...  # 스윕 계속
+        >>> worker.stop()
+    """
+
+    def __init__(self, engine: RetentionEngine, interval: float = 600.0, max_files: int = 20):
+        """
+        Args:
+            engine: 보존 정책 실행기
+            interval: 실행 주기 (초, 처리할 일이 남았으면 바로 다음 배치 실행)
+            max_files: 배치 1번에 처리할 최대 결과 파일 수
+        """
+        self.engine = engine
+        self.interval = interval
+        self.max_files = max_files
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RetentionWorker":
+        """작업 스레드를 시작합니다."""
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """현재 배치가 끝나면 종료합니다."""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                busy = self.engine.run_once(max_files=self.max_files) >= self.max_files
+            except Exception as e:
+                print(f"⚠️  보존 정책 실행 실패: {e}")
+                busy = False
+            # 남은 일이 있으면 잠깐 쉬고 이어서, 없으면 다음 주기까지 대기
+            self._stopping.wait(1.0 if busy else self.interval)
+
+
+def main():
+    """보존 정책을 한 번 (또는 남은 일이 없을 때까지) 적용합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='검색 결과 보존 정책 적용')
+    parser.add_argument('--dir', default='.', help='결과 파일 디렉터리')
+    parser.add_argument('--archive', default='archive', help='보관 파일 디렉터리')
+    parser.add_argument('--snapshots', default='snapshots', help='델타 스냅샷 저장소 디렉터리')
+    parser.add_argument('--raw-days', type=float, default=1, help='모두 보관하는 기간 (일)')
+    parser.add_argument('--hourly-days', type=float, default=30, help='시간당 1개 보관하는 기간 (일)')
+    parser.add_argument('--dry-run', action='store_true', help='변경하지 않고 계획만 출력')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.snapshots) if os.path.isdir(args.snapshots) else None
+    engine = RetentionEngine(
+        directory=args.dir,
+        archive_dir=args.archive,
+        store=store,
+        policy=RetentionPolicy(timedelta(days=args.raw_days), timedelta(days=args.hourly_days)),
+        dry_run=args.dry_run
+    )
+
+    print("🧹 보존 정책 적용 중...")
+    engine.run_all(batch=10 ** 9 if args.dry_run else 200)
+    print(f"✅ 완료: {engine.stats}")
+
+
+if __name__ == "__main__":
+    main()
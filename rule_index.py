@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+감시 규칙 색인 모듈
+
+수천 개의 감시 규칙을 차량마다 일일이 검사하지 않도록, 규칙 조건을
+역색인(필드값 → 규칙)과 가격 상한 정렬 색인으로 미리 컴파일합니다.
+차량 1대를 매칭할 때는 해당 차량 값에 걸린 후보 규칙만 확인합니다.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Any, Iterable
+
+from car import parse_amount
+
+
+# 색인 대상 필드 (API 응답 차량 정보의 키)
+INDEXED_FIELDS = (
+    "carCode",
+    "exteriorColorCode",
+    "exteriorColorName",
+    "carTrimName",
+    "deliveryCenterCode",
+    "deliveryCenterName",
+)
+
+
+class RuleIndex:
+    """
+    규칙 매칭용 색인
+
+    규칙 객체는 다음을 제공해야 합니다.
+        - constraints(): {필드명: 값} (INDEXED_FIELDS 중 조건이 있는 필드)
+        - max_price: 최종 금액 상한 (없으면 None)
+    """
+
+    def __init__(self, rules: Iterable[Any]):
+        self.rules: List[Any] = list(rules)
+        # 필드 → 값 → 규칙 번호 리스트
+        self.inverted: Dict[str, Dict[Any, List[int]]] = {
+            field: defaultdict(list) for field in INDEXED_FIELDS
+        }
+        # 규칙 번호 → 조건 개수
+        self.required: List[int] = []
+        # 필드 조건이 없는 규칙: 가격 상한 오름차순 (상한 없는 규칙은 별도)
+        self._price_only: List[tuple] = []
+        self._price_only_keys: List[int] = []
+        self._unconstrained: List[int] = []
+
+        for rule_id, rule in enumerate(self.rules):
+            constraints = rule.constraints()
+            unknown = set(constraints) - set(INDEXED_FIELDS)
+            if unknown:
+                raise ValueError(f"색인할 수 없는 필드: {', '.join(sorted(unknown))}")
+
+            self.required.append(len(constraints))
+            for field, value in constraints.items():
+                self.inverted[field][value].append(rule_id)
+
+            if not constraints:
+                if rule.max_price is None:
+                    self._unconstrained.append(rule_id)
+                else:
+                    self._price_only.append((rule.max_price, rule_id))
+
+        self._price_only.sort()
+        self._price_only_keys = [price for price, _ in self._price_only]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match_ids(self, car: Dict[str, Any]) -> List[int]:
+        """차량 조건을 만족하는 규칙 번호 리스트를 반환합니다."""
+        price = parse_amount(car.get("finalAmount"))
+        matched = list(self._unconstrained)
+
+        # 필드 조건 없이 가격 상한만 있는 규칙: 상한 >= 가격 인 구간
+        if price is not None and self._price_only:
+            start = bisect_left(self._price_only_keys, price)
+            matched.extend(rule_id for _, rule_id in self._price_only[start:])
+
+        # 필드 조건이 있는 규칙: 모든 조건이 일치한 후보만 가격 확인
+        hits: Dict[int, int] = defaultdict(int)
+        for field in INDEXED_FIELDS:
+            value = car.get(field)
+            if value is None:
+                continue
+            for rule_id in self.inverted[field].get(value, ()):
+                hits[rule_id] += 1
+
+        for rule_id, count in hits.items():
+            if count != self.required[rule_id]:
+                continue
+            max_price = self.rules[rule_id].max_price
+            if max_price is not None and (price is None or price > max_price):
+                continue
+            matched.append(rule_id)
+
+        return matched
+
+    def match(self, car: Dict[str, Any]) -> List[Any]:
+        """차량 조건을 만족하는 규칙 리스트를 반환합니다."""
+        return [self.rules[rule_id] for rule_id in self.match_ids(car)]
+
+    def assign(self, cars: Iterable[Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        차량들을 규칙별로 분배합니다.
+
+        Returns:
+            {규칙 번호: 일치 차량 리스트} (일치 차량이 없는 규칙도 빈 리스트로 포함)
+        """
+        assigned: Dict[int, List[Dict[str, Any]]] = {i: [] for i in range(len(self.rules))}
+        for car in cars:
+            for rule_id in self.match_ids(car):
+                assigned[rule_id].append(car)
+        return assigned
@@ -6,23 +6,56 @@
 """
 
 import time
+import sqlite3
+import argparse
 from datetime import datetime
 from casper_checker import CasperChecker, CarModel
-from region_helper import RegionHelper
-from typing import Dict, List
+from region_helper import get_region_helper
+from history_store import get_history_store
+from snapshot_stream import write_results
+from snapshot_store import get_snapshot_store, build_snapshot
+from retention import RetentionEngine, RetentionWorker
+from sweep_planner import estimate_sweep, print_plan, get_latency_history, sigun_queries_needed, count_region_queries, PAGE_SIZES
+from inventory_diff import InventoryDiff, index_cars, summarize, print_events
+from monitor_scheduler import AdaptiveInterval, describe_interval
+from change_log import ChangeLog
+from monitor_state import MonitorState
+from inventory_frame import InventoryFrame
+from typing import Dict, List, Optional, Tuple
 
 
-def check_all_regions(model: CarModel) -> Dict[str, List]:
+def _search(checker, model, sido: str, sigun: Optional[str], failed: Optional[list]) -> Optional[List]:
+    """
+    지역 1곳을 조회합니다.
+    
+    Returns:
+        차량 리스트, 요청이 실패하면 None (failed 에 (시도, 시군구) 추가)
+    """
+    params = checker.region_params(model, sido, sigun)
+    count, cars = checker.get_count_and_cars(custom_params=params) if params else (None, [])
+    if count is None:
+        print(f"  ⚠️  {sigun or sido:<20} 조회 실패")
+        if failed is not None:
+            failed.append((sido, sigun))
+        return None
+    return cars
+
+
+def check_all_regions(
+    model: CarModel,
+    failed: Optional[List[Tuple[str, Optional[str]]]] = None
+) -> Dict[str, List]:
     """
     전국 모든 지역의 재고를 검색합니다.
     
     Args:
         model: 검색할 차량 모델
+        failed: 조회에 실패한 (시도, 시군구)를 추가할 리스트 (시도 단위 조회는 시군구 None)
     
     Returns:
-        지역별 재고 딕셔너리
+        지역별 재고 딕셔너리 (실패한 지역은 빠지므로 재고 없음과 구분하려면 failed 확인)
     """
-    helper = RegionHelper()
+    helper = get_region_helper()
     checker = CasperChecker()
     
     if not helper.is_available():
@@ -38,6 +71,9 @@ def check_all_regions(model: CarModel) -> Dict[str, List]:
     
     sidos = helper.list_sidos()
     
+    # 시군구가 차량 집합에 영향이 없다고 분석되었으면 시도 단위로만 조회
+    per_sigun = sigun_queries_needed("R0003")
+    
     for i, sido in enumerate(sidos, 1):
         print(f"\n[{i:2d}/17] {sido} ", end="")
         print("-"*70)
@@ -48,33 +84,27 @@ def check_all_regions(model: CarModel) -> Dict[str, List]:
         sido_total = 0
         sido_results = {}
         
-        if len(siguns) > 1:
+        if per_sigun and len(siguns) > 1:
             # 시군구별로 검색
             for sigun in siguns:
-                try:
-                    cars = checker.search_by_region(model, sido, sigun)
-                    if cars:
-                        sido_results[sigun] = cars
-                        sido_total += len(cars)
-                        print(f"  ✅ {sigun:<20} {len(cars):>3}대")
-                except Exception as e:
-                    pass
+                cars = _search(checker, model, sido, sigun, failed)
+                if cars:
+                    sido_results[sigun] = cars
+                    sido_total += len(cars)
+                    print(f"  ✅ {sigun:<20} {len(cars):>3}대")
                 time.sleep(0.1)  # API 부담 줄이기
             
             if sido_total == 0:
                 print(f"  ❌ 재고 없음")
         else:
             # 시도 전체 검색
-            try:
-                cars = checker.search_by_region(model, sido)
-                if cars:
-                    sido_results[sido] = cars
-                    sido_total = len(cars)
-                    print(f"  ✅ {sido:<20} {sido_total:>3}대")
-                else:
-                    print(f"  ❌ 재고 없음")
-            except Exception as e:
-                print(f"  ❌ 오류")
+            cars = _search(checker, model, sido, None, failed)
+            if cars:
+                sido_results[sido] = cars
+                sido_total = len(cars)
+                print(f"  ✅ {sido:<20} {sido_total:>3}대")
+            elif cars is not None:
+                print(f"  ❌ 재고 없음")
         
         results[sido] = sido_results
         total_cars += sido_total
@@ -85,6 +115,8 @@ def check_all_regions(model: CarModel) -> Dict[str, List]:
         
         time.sleep(0.2)  # 요청 간 지연
     
+    get_latency_history().save()
+
     print("\n" + "="*80)
     print(f"✅ 검색 완료! 전국 총 재고: {total_cars}대\n")
     
@@ -101,37 +133,23 @@ def print_summary(results: Dict[str, Dict[str, List]], model: CarModel):
     print(f"📊 전국 재고 요약 - {model.value['name']}")
     print("="*80)
     
-    # 재고가 있는 지역만 추출
-    regions_with_stock = []
-    for sido, sigun_dict in results.items():
-        if sigun_dict:
-            for sigun, cars in sigun_dict.items():
-                if cars:
-                    regions_with_stock.append((sido, sigun, cars))
-    
-    if not regions_with_stock:
+    # 열 단위 프레임으로 지역별 재고/가격을 한 번에 집계
+    frame = InventoryFrame.from_results(results)
+    if not len(frame):
         print("\n❌ 전국에 재고가 없습니다.")
         return
     
-    # 재고 많은 순으로 정렬
-    regions_with_stock.sort(key=lambda x: len(x[2]), reverse=True)
+    regions = frame.groupby(("sido", "sigun"), "price", ("count", "min", "max"))
+    sido_totals = frame.counts("sido")
     
     print(f"\n{'시도':<8} {'시군구':<20} {'재고':<8} {'최저가':<15} {'최고가':<15}")
     print("-"*80)
     
-    sido_totals = {}
-    
-    for sido, sigun, cars in regions_with_stock:
-        count = len(cars)
-        min_price = min(int(float(car['finalAmount'])) for car in cars)
-        max_price = max(int(float(car['finalAmount'])) for car in cars)
-        
-        print(f"{sido:<8} {sigun:<20} {count:<8} {min_price:>12,}원 {max_price:>12,}원")
-        
-        # 시도별 합계 계산
-        if sido not in sido_totals:
-            sido_totals[sido] = 0
-        sido_totals[sido] += count
+    # 재고 많은 순으로 정렬
+    for (sido, sigun), agg in sorted(regions.items(), key=lambda x: x[1]["count"], reverse=True):
+        min_price = agg["min"] or 0
+        max_price = agg["max"] or 0
+        print(f"{sido:<8} {sigun:<20} {agg['count']:<8} {min_price:>12,}원 {max_price:>12,}원")
     
     # 시도별 합계
     print("-"*80)
@@ -173,88 +191,167 @@ def print_detail(results: Dict[str, Dict[str, List]], max_per_region: int = 3):
             print("  " + "-"*76)
             
             for i, car in enumerate(cars[:max_per_region], 1):
-                print(f"  {i}. {car['exteriorColorName']:<15} | "
-                      f"{car['carTrimName']:<12} | "
-                      f"{int(float(car['finalAmount'])):>12,}원 | "
-                      f"할인 {int(float(car['discountPrice'])):>10,}원")
-                print(f"     출고: {car['deliveryCenterName']}")
+                print(f"  {i}. {car.color:<15} | "
+                      f"{car.trim:<12} | "
+                      f"{car.price or 0:>12,}원 | "
+                      f"할인 {car.discount or 0:>10,}원")
+                print(f"     출고: {car.center}")
             
             if len(cars) > max_per_region:
                 print(f"     ... 외 {len(cars) - max_per_region}대")
 
 
 def save_results(results: Dict[str, Dict[str, List]], model: CarModel, filename: str = None):
-    """결과를 JSON 파일로 저장"""
-    import json
+    """
+    결과를 NDJSON 스냅샷 파일로 저장합니다. (차량 1대씩 바로 기록, .gz면 압축)
     
+    읽을 때는 snapshot_stream.SnapshotReader를 사용하세요.
+    """
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"casper_stock_{model.value['carCode']}_{timestamp}.json"
-    
-    # 총 재고 계산
-    total_count = 0
-    for sigun_dict in results.values():
-        for cars in sigun_dict.values():
-            total_count += len(cars)
-    
-    data = {
-        "timestamp": datetime.now().isoformat(),
-        "model": model.value['name'],
-        "model_code": model.value['carCode'],
-        "total_count": total_count,
-        "regions": {}
-    }
-    
-    # 시도별로 데이터 구성
+        filename = f"casper_stock_{model.value['carCode']}_{timestamp}.jsonl.gz"
+    
+    write_results(
+        results,
+        filename,
+        exhibition_no="R0003",
+        model=model.value['name'],
+        model_code=model.value['carCode']
+    )
+    
+    print(f"\n💾 결과 저장: {filename}")
+    record_history(results, model)
+
+
+def record_history(results: Dict[str, Dict[str, List]], model: CarModel):
+    """결과를 이력 저장소에 기록 (차량/지역/가격 단위로 조회 가능)"""
+    try:
+        sweep_id = get_history_store().record_sweep(
+            results, "R0003", model.value['carCode'], model.value['name']
+        )
+        print(f"🗄️  이력 저장: 스윕 #{sweep_id}")
+    except sqlite3.Error as e:
+        print(f"⚠️  이력 저장 실패: {e}")
+
+
+def save_snapshot(results: Dict[str, Dict[str, List]], model: CarModel) -> str:
+    """
+    결과를 델타 스냅샷 저장소에 기록합니다.
+    
+    직전 스윕과 같으면 색인 한 줄만, 다르면 변경분만 저장됩니다.
+    
+    Returns:
+        스냅샷 해시
+    """
+    snapshot = build_snapshot(results)
+    try:
+        digest = get_snapshot_store().put(
+            f"R0003_{model.value['carCode']}", snapshot, total_count=len(snapshot)
+        )
+        print(f"\n💾 스냅샷 저장: {digest[:12]}")
+        return digest
+    except OSError as e:
+        print(f"⚠️  스냅샷 저장 실패: {e}")
+        return ""
+
+
+def index_results(
+    results: Dict[str, Dict[str, List]],
+    failed: Optional[List] = None
+) -> Tuple[Dict[str, Dict], bool]:
+    """
+    전국 검색 결과를 차대번호 기준 스냅샷으로 변환합니다.
+    
+    Args:
+        results: check_all_regions 결과
+        failed: check_all_regions 가 채운 조회 실패 지역 리스트
+    
+    Returns:
+        (스냅샷, 완전성) 튜플. 조회에 실패한 지역이 있거나, 어떤 지역이든 페이지 크기만큼
+        꽉 찬 응답이 있으면 일부 차량이 누락되었을 수 있으므로 완전성은 False입니다.
+    """
+    snapshot = {}
+    complete = not failed
+    page_size = PAGE_SIZES["R0003"]
+    
     for sido, sigun_dict in results.items():
-        if not sigun_dict:
-            continue
-        
-        data["regions"][sido] = {}
-        
         for sigun, cars in sigun_dict.items():
-            if not cars:
-                continue
-            
-            data["regions"][sido][sigun] = [
-                {
-                    "color": car['exteriorColorName'],
-                    "interior": car['interiorColorName'],
-                    "trim": car['carTrimName'],
-                    "price": car['finalAmount'],
-                    "discount": car['discountPrice'],
-                    "discount_rate": car['discountRate'],
-                    "center": car['deliveryCenterName'],
-                    "production_date": car.get('prdnDt', ''),
-                }
-                for car in cars
-            ]
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+            if len(cars) >= page_size:
+                complete = False
+            for number, car in index_cars(cars, sido=sido, sigun=sigun).items():
+                snapshot.setdefault(number, car)
     
-    print(f"\n💾 결과 저장: {filename}")
+    return snapshot, complete
 
 
-def monitor_mode(model: CarModel, interval: int = 300):
+def monitor_mode(
+    model: CarModel,
+    interval: int = 300,
+    adaptive: bool = False,
+    min_interval: Optional[float] = None,
+    max_interval: Optional[float] = None,
+    max_requests_per_hour: Optional[int] = None,
+    change_log: Optional[ChangeLog] = None,
+    state_file: Optional[str] = "monitor_mode_state.json",
+    retention: bool = False
+):
     """
     주기적으로 전국 재고를 모니터링합니다.
     
     Args:
         model: 모니터링할 모델
         interval: 확인 주기 (초 단위, 기본 300초 = 5분)
+        adaptive: 재고 변동/시간대에 따라 주기를 자동 조절할지 여부
+        min_interval: 적응형 최소 주기 (초)
+        max_interval: 적응형 최대 주기 (초)
+        max_requests_per_hour: 적응형 시간당 최대 요청 수
+        change_log: 변동 이벤트 로그 (기본: change_log/ 디렉터리)
+        state_file: 모니터 상태 파일 (재시작 시 이전 스냅샷부터 이어서 비교, None이면 저장 안 함)
+        retention: 백그라운드에서 snapshots/ 의 오래된 스윕을 보존 정책에 따라 정리할지 여부
+            (저장한 결과 파일은 건드리지 않음, 정리하려면 python retention.py)
     """
+    if change_log is None:
+        change_log = ChangeLog()
+    
+    scheduler = None
+    if adaptive:
+        scheduler = AdaptiveInterval(
+            interval,
+            floor=min_interval,
+            ceiling=max_interval,
+            max_requests_per_hour=max_requests_per_hour,
+            requests_per_tick=sum(count_region_queries().values())
+        )
+    
     print("="*80)
     print(f"🔄 전국 재고 모니터링 시작")
     print(f"모델: {model.value['name']}")
-    print(f"주기: {interval}초 ({interval//60}분)")
+    if scheduler:
+        print(f"주기: 적응형 ({describe_interval(scheduler.floor)} ~ {describe_interval(scheduler.ceiling)})")
+    else:
+        print(f"주기: {interval}초 ({interval//60}분)")
     print("="*80)
     print("\n중단하려면 Ctrl+C를 누르세요\n")
     
-    last_total = 0
+    diff = InventoryDiff()
+    state = MonitorState(state_file) if state_file else None
+    if state:
+        state.restore(diff)
+        print(f"💾 {state.describe()}")
+    key = model.value['carCode']
     check_count = 0
     
+    # 오래된 결과 정리는 별도 스레드에서 (스윕을 막지 않음)
+    cleaner = RetentionWorker(RetentionEngine.store_only(get_snapshot_store())).start() if retention else None
+    
     try:
+        # 최근에 확인한 상태라면 남은 주기만큼 기다린 뒤 시작
+        if state:
+            wait = state.remaining_wait(interval)
+            if wait > 0:
+                print(f"⏳ 마지막 확인 후 주기가 지나지 않아 {describe_interval(wait)} 후 시작합니다...")
+                time.sleep(wait)
+        
         while True:
             check_count += 1
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -264,42 +361,139 @@ def monitor_mode(model: CarModel, interval: int = 300):
             print(f"{'='*80}")
             
             # 전국 검색
-            results = check_all_regions(model)
+            failed = []
+            results = check_all_regions(model, failed)
+            
+            # 차대번호 기준 스냅샷 (같은 차량이 여러 지역에 나오면 한 번만)
+            # 조회 실패 지역이 있으면 불완전 스윕: 이전 차량을 제거로 보고하지 않음
+            snapshot, complete = index_results(results, failed)
+            if failed:
+                print(f"⚠️  조회 실패 {len(failed)}곳 - 이번 확인에서는 제거를 판단하지 않습니다.")
             
-            # 총 재고 계산
-            total = 0
-            for sigun_dict in results.values():
-                for cars in sigun_dict.values():
-                    total += len(cars)
+            # 변동 감지 (이전 스냅샷이 있을 때만 비교 결과 표시)
+            known = key in diff.snapshots
+            last_total = diff.count(key)
+            events = diff.update_index(key, snapshot, complete)
+            total = len(snapshot)
+            # 이전 스냅샷이 없으면 기존 재고가 모두 입고로 나오므로 기록하지 않음
+            if events and known:
+                change_log.append_events(events, exhibition_no="R0003")
+            if state:
+                state.save(diff)
             
-            # 변동 감지
-            if check_count > 1:
-                if total > last_total:
-                    print(f"\n🎉 재고 증가! {last_total}대 → {total}대 (+{total - last_total})")
-                elif total < last_total:
-                    print(f"\n📉 재고 감소! {last_total}대 → {total}대 (-{last_total - total})")
+            if known:
+                added, removed, changed = summarize(events)
+                if events:
+                    print(f"\n🎉 재고 변동! {last_total}대 → {total}대 "
+                          f"(입고 {added} · 출고 {removed} · 변경 {changed})")
+                    print_events(events)
                 else:
                     print(f"\n📊 재고 변동 없음 ({total}대)")
             
-            last_total = total
-            
             # 요약 출력
             print_summary(results, model)
             
-            # 결과 저장
-            save_results(results, model)
+            # 결과 저장 (전체 JSON 대신 델타 스냅샷 + 이력 DB)
+            save_snapshot(results, model)
+            record_history(results, model)
             
             # 다음 확인까지 대기
-            print(f"\n⏳ {interval}초 후 다시 확인합니다...")
-            time.sleep(interval)
+            wait = interval
+            if scheduler:
+                scheduler.record_requests()
+                wait = scheduler.next_interval(bool(events) and known)
+            print(f"\n⏳ {describe_interval(wait)} 후 다시 확인합니다...")
+            time.sleep(wait)
     
     except KeyboardInterrupt:
         print("\n\n✋ 모니터링을 종료합니다.")
         print(f"총 {check_count}번 확인했습니다.")
+    finally:
+        if cleaner:
+            cleaner.stop()
+
+
+def parse_args():
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description='캐스퍼 전국 재고 검색')
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='요청을 보내지 않고 스윕 계획(요청 수, 전송량, 소요 시간)만 출력'
+    )
+    parser.add_argument(
+        '--model', '-m',
+        choices=[m.value['carCode'] for m in CarModel],
+        help='드라이런 대상 모델 (없으면 전체 모델)'
+    )
+    parser.add_argument('--rate', type=float, help='초당 최대 요청 수 (예상 소요 시간 계산에만 사용)')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시 요청 수 (예상 소요 시간 계산에만 사용)')
+    parser.add_argument(
+        '--budget', type=int,
+        help='스윕 1회 요청 예산 (드라이런은 초과 여부 표시, 검색은 예상 요청 수가 넘으면 실행하지 않음)'
+    )
+    parser.add_argument(
+        '--retention',
+        action='store_true',
+        help='모니터링 중 snapshots/ 의 오래된 스윕을 보존 정책에 따라 정리'
+    )
+    return parser.parse_args()
+
+
+def dry_run(args):
+    """스윕 계획만 출력합니다."""
+    helper = get_region_helper()
+    if not helper.is_available():
+        print("❌ 지역 데이터가 없습니다.")
+        print("먼저 실행: python fetch_regions.py")
+        return
+    
+    models = 1 if args.model else len(CarModel)
+    plan = estimate_sweep(
+        exhibition_no="R0003",
+        models=len(models),
+        rate_limit=args.rate,
+        concurrency=args.concurrency,
+        helper=helper
+    )
+    print_plan(plan, budget=args.budget)
+
+
+def check_budget(args, models: List[CarModel]) -> bool:
+    """
+    --budget 이 지정되었으면 스윕 1회의 예상 요청 수가 예산 이내인지 확인합니다.
+    
+    Args:
+        args: 명령줄 인자
+        models: 실제로 검색할 모델 리스트
+    
+    Returns:
+        검색해도 되면 True (예산을 넘으면 계획을 출력하고 False)
+    """
+    if args.budget is None:
+        return True
+    
+    plan = estimate_sweep(
+        exhibition_no="R0003",
+        models=len(models),
+        rate_limit=args.rate,
+        concurrency=args.concurrency
+    )
+    if plan["total_requests"] <= args.budget:
+        return True
+    
+    print_plan(plan, budget=args.budget)
+    print(f"❌ 요청 예산을 넘어 검색하지 않습니다. (--budget 을 늘리거나 모델 수를 줄이세요)")
+    return False
 
 
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+    if args.dry_run:
+        dry_run(args)
+        return
+    
     print("="*70)
     print("🚗 캐스퍼 전국 재고 검색")
     print("="*70)
@@ -338,15 +532,19 @@ def main():
     print("2. 주기적 모니터링 (5분마다)")
     print("3. 주기적 모니터링 (10분마다)")
     print("4. 주기적 모니터링 (30분마다)")
+    print("5. 적응형 모니터링 (5분~1시간, 변동 시 빠르게)")
     
     try:
-        mode = input("\n모드 번호 (1-4, Enter=1): ").strip() or "1"
+        mode = input("\n모드 번호 (1-5, Enter=1): ").strip() or "1"
     except KeyboardInterrupt:
         print("\n중단됨")
         return
     
     if mode == "1":
         # 한 번만 검색
+        if not check_budget(args, selected_models):
+            return
+        
         if search_all_models:
             # 모든 모델 검색
             print("\n" + "="*70)
@@ -416,7 +614,7 @@ def main():
             if save == 'y':
                 save_results(results, selected_models[0])
     
-    elif mode in ["2", "3", "4"]:
+    elif mode in ["2", "3", "4", "5"]:
         if search_all_models:
             print("\n⚠️  모니터링 모드는 단일 모델만 지원합니다.")
             print("모델을 하나 선택해주세요:")
@@ -438,9 +636,23 @@ def main():
         else:
             selected_model = selected_models[0]
         
+        # 모니터링은 모델 1개만 조회
+        if not check_budget(args, [selected_model]):
+            return
+        
         # 모니터링 시작
-        intervals = {"2": 300, "3": 600, "4": 1800}
-        monitor_mode(selected_model, interval=intervals[mode])
+        if mode == "5":
+            monitor_mode(
+                selected_model,
+                interval=600,
+                adaptive=True,
+                min_interval=300,
+                max_interval=3600,
+                retention=args.retention
+            )
+        else:
+            intervals = {"2": 300, "3": 600, "4": 1800}
+            monitor_mode(selected_model, interval=intervals[mode], retention=args.retention)
     else:
         print("잘못된 선택입니다.")
 
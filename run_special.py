@@ -7,23 +7,50 @@
 """
 
 import time
+import sqlite3
+import argparse
 from datetime import datetime
 from special_checker import SpecialChecker, SpecialCarModel
-from region_helper import RegionHelper
-from typing import Dict, List
+from region_helper import get_region_helper
+from snapshot_stream import write_results
+from history_store import get_history_store
+from sweep_planner import estimate_sweep, print_plan, get_latency_history, sigun_queries_needed
+from inventory_frame import InventoryFrame
+from typing import Dict, List, Optional, Tuple
 
 
-def check_all_regions(model: SpecialCarModel) -> Dict[str, Dict[str, List]]:
+def _search(checker, model, sido: str, sigun: Optional[str], failed: Optional[list]) -> Optional[List]:
+    """
+    지역 1곳을 조회합니다.
+
+    Returns:
+        차량 리스트, 요청이 실패하면 None (failed 에 (시도, 시군구) 추가)
+    """
+    params = checker.region_params(model, sido, sigun)
+    count, cars = checker.get_count_and_cars(custom_params=params) if params else (None, [])
+    if count is None:
+        print(f"  [!] {sigun or sido:<20} 조회 실패")
+        if failed is not None:
+            failed.append((sido, sigun))
+        return None
+    return cars
+
+
+def check_all_regions(
+    model: SpecialCarModel,
+    failed: Optional[List[Tuple[str, Optional[str]]]] = None
+) -> Dict[str, Dict[str, List]]:
     """
     전국 모든 지역의 특별기획전 재고를 검색합니다.
 
     Args:
         model: 검색할 차량 모델
+        failed: 조회에 실패한 (시도, 시군구)를 추가할 리스트 (시도 단위 조회는 시군구 None)
 
     Returns:
-        지역별 재고 딕셔너리
+        지역별 재고 딕셔너리 (실패한 지역은 빠지므로 재고 없음과 구분하려면 failed 확인)
     """
-    helper = RegionHelper()
+    helper = get_region_helper()
     checker = SpecialChecker()
 
     if not helper.is_available():
@@ -39,6 +66,9 @@ def check_all_regions(model: SpecialCarModel) -> Dict[str, Dict[str, List]]:
 
     sidos = helper.list_sidos()
 
+    # 시군구가 차량 집합에 영향이 없다고 분석되었으면 시도 단위로만 조회
+    per_sigun = sigun_queries_needed(SpecialChecker.EXHIBITION_NO)
+
     for i, sido in enumerate(sidos, 1):
         print(f"\n[{i:2d}/17] {sido} ", end="")
         print("-"*70)
@@ -48,31 +78,25 @@ def check_all_regions(model: SpecialCarModel) -> Dict[str, Dict[str, List]]:
         sido_total = 0
         sido_results = {}
 
-        if len(siguns) > 1:
+        if per_sigun and len(siguns) > 1:
             for sigun in siguns:
-                try:
-                    cars = checker.search_by_region(model, sido, sigun)
-                    if cars:
-                        sido_results[sigun] = cars
-                        sido_total += len(cars)
-                        print(f"  [O] {sigun:<20} {len(cars):>3}대")
-                except Exception:
-                    pass
+                cars = _search(checker, model, sido, sigun, failed)
+                if cars:
+                    sido_results[sigun] = cars
+                    sido_total += len(cars)
+                    print(f"  [O] {sigun:<20} {len(cars):>3}대")
                 time.sleep(0.1)
 
             if sido_total == 0:
                 print(f"  [X] 재고 없음")
         else:
-            try:
-                cars = checker.search_by_region(model, sido)
-                if cars:
-                    sido_results[sido] = cars
-                    sido_total = len(cars)
-                    print(f"  [O] {sido:<20} {sido_total:>3}대")
-                else:
-                    print(f"  [X] 재고 없음")
-            except Exception:
-                print(f"  [!] 오류")
+            cars = _search(checker, model, sido, None, failed)
+            if cars:
+                sido_results[sido] = cars
+                sido_total = len(cars)
+                print(f"  [O] {sido:<20} {sido_total:>3}대")
+            elif cars is not None:
+                print(f"  [X] 재고 없음")
 
         results[sido] = sido_results
         total_cars += sido_total
@@ -83,6 +107,8 @@ def check_all_regions(model: SpecialCarModel) -> Dict[str, Dict[str, List]]:
 
         time.sleep(0.2)
 
+    get_latency_history().save()
+
     print("\n" + "="*80)
     print(f"[완료] 전국 총 재고: {total_cars}대\n")
 
@@ -99,34 +125,23 @@ def print_summary(results: Dict[str, Dict[str, List]], model: SpecialCarModel):
     print(f"[특별기획전] 전국 재고 요약 - {model.value['name']}")
     print("="*80)
 
-    regions_with_stock = []
-    for sido, sigun_dict in results.items():
-        if sigun_dict:
-            for sigun, cars in sigun_dict.items():
-                if cars:
-                    regions_with_stock.append((sido, sigun, cars))
-
-    if not regions_with_stock:
+    # 열 단위 프레임으로 지역별 재고/가격을 한 번에 집계
+    frame = InventoryFrame.from_results(results)
+    if not len(frame):
         print("\n전국에 재고가 없습니다.")
         return
 
-    regions_with_stock.sort(key=lambda x: len(x[2]), reverse=True)
+    regions = frame.groupby(("sido", "sigun"), "price", ("count", "min", "max"))
+    sido_totals = frame.counts("sido")
 
     print(f"\n{'시도':<8} {'시군구':<20} {'재고':<8} {'최저가':<15} {'최고가':<15}")
     print("-"*80)
 
-    sido_totals = {}
-
-    for sido, sigun, cars in regions_with_stock:
-        count = len(cars)
-        min_price = min(int(float(car['finalAmount'])) for car in cars)
-        max_price = max(int(float(car['finalAmount'])) for car in cars)
-
-        print(f"{sido:<8} {sigun:<20} {count:<8} {min_price:>12,}원 {max_price:>12,}원")
-
-        if sido not in sido_totals:
-            sido_totals[sido] = 0
-        sido_totals[sido] += count
+    # 재고 많은 순으로 정렬
+    for (sido, sigun), agg in sorted(regions.items(), key=lambda x: x[1]["count"], reverse=True):
+        min_price = agg["min"] or 0
+        max_price = agg["max"] or 0
+        print(f"{sido:<8} {sigun:<20} {agg['count']:<8} {min_price:>12,}원 {max_price:>12,}원")
 
     print("-"*80)
     print("\n시도별 합계:")
@@ -167,11 +182,11 @@ def print_detail(results: Dict[str, Dict[str, List]], max_per_region: int = 3):
             print("  " + "-"*76)
 
             for i, car in enumerate(cars[:max_per_region], 1):
-                exterior = car.get('exteriorColorName', 'N/A')
-                trim = car.get('carTrimName', 'N/A')
-                final = int(float(car.get('finalAmount', 0)))
-                discount = int(float(car.get('discountPrice', 0)))
-                center = car.get('deliveryCenterName', 'N/A')
+                exterior = car.color or 'N/A'
+                trim = car.trim or 'N/A'
+                final = car.price or 0
+                discount = car.discount or 0
+                center = car.center or 'N/A'
 
                 print(f"  {i}. {exterior:<15} | {trim:<12} | {final:>12,}원 | 할인 {discount:>10,}원")
                 print(f"     출고: {center}")
@@ -181,60 +196,112 @@ def print_detail(results: Dict[str, Dict[str, List]], max_per_region: int = 3):
 
 
 def save_results(results: Dict[str, Dict[str, List]], model: SpecialCarModel, filename: str = None):
-    """결과를 JSON 파일로 저장"""
-    import json
+    """
+    결과를 NDJSON 스냅샷 파일로 저장합니다. (차량 1대씩 바로 기록, .gz면 압축)
 
+    읽을 때는 snapshot_stream.SnapshotReader를 사용하세요.
+    """
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"special_stock_{model.value['carCode']}_{timestamp}.json"
-
-    total_count = 0
-    for sigun_dict in results.values():
-        for cars in sigun_dict.values():
-            total_count += len(cars)
-
-    data = {
-        "timestamp": datetime.now().isoformat(),
-        "exhibition_type": "특별기획전",
-        "exhibition_no": SpecialChecker.EXHIBITION_NO,
-        "model": model.value['name'],
-        "model_code": model.value['carCode'],
-        "total_count": total_count,
-        "regions": {}
-    }
+        filename = f"special_stock_{model.value['carCode']}_{timestamp}.jsonl.gz"
 
-    for sido, sigun_dict in results.items():
-        if not sigun_dict:
-            continue
+    write_results(
+        results,
+        filename,
+        exhibition_type="특별기획전",
+        exhibition_no=SpecialChecker.EXHIBITION_NO,
+        model=model.value['name'],
+        model_code=model.value['carCode']
+    )
 
-        data["regions"][sido] = {}
+    print(f"\n결과 저장: {filename}")
 
-        for sigun, cars in sigun_dict.items():
-            if not cars:
-                continue
+    # 이력 저장소에도 기록 (차량/지역/가격 단위로 조회 가능)
+    try:
+        sweep_id = get_history_store().record_sweep(
+            results, SpecialChecker.EXHIBITION_NO, model.value['carCode'], model.value['name']
+        )
+        print(f"🗄️  이력 저장: 스윕 #{sweep_id}")
+    except sqlite3.Error as e:
+        print(f"⚠️  이력 저장 실패: {e}")
+
+
+def parse_args():
+    """명령줄 인자 파싱"""
+    parser = argparse.ArgumentParser(description='캐스퍼 특별기획전 전국 재고 검색')
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='요청을 보내지 않고 스윕 계획(요청 수, 전송량, 소요 시간)만 출력'
+    )
+    parser.add_argument(
+        '--model', '-m',
+        choices=[m.value['carCode'] for m in SpecialCarModel],
+        help='드라이런 대상 모델 (없으면 전체 모델)'
+    )
+    parser.add_argument('--rate', type=float, help='초당 최대 요청 수 (예상 소요 시간 계산에만 사용)')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시 요청 수 (예상 소요 시간 계산에만 사용)')
+    parser.add_argument(
+        '--budget', type=int,
+        help='스윕 1회 요청 예산 (드라이런은 초과 여부 표시, 검색은 예상 요청 수가 넘으면 실행하지 않음)'
+    )
+    return parser.parse_args()
+
+
+def dry_run(args):
+    """스윕 계획만 출력합니다."""
+    helper = get_region_helper()
+    if not helper.is_available():
+        print("지역 데이터가 없습니다.")
+        print("먼저 실행: python fetch_regions.py")
+        return
 
-            data["regions"][sido][sigun] = [
-                {
-                    "color": car.get('exteriorColorName', ''),
-                    "interior": car.get('interiorColorName', ''),
-                    "trim": car.get('carTrimName', ''),
-                    "price": car.get('finalAmount', ''),
-                    "discount": car.get('discountPrice', ''),
-                    "discount_rate": car.get('discountRate', ''),
-                    "center": car.get('deliveryCenterName', ''),
-                    "production_date": car.get('prdnDt', ''),
-                }
-                for car in cars
-            ]
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    models = 1 if args.model else len(SpecialCarModel)
+    plan = estimate_sweep(
+        exhibition_no=SpecialChecker.EXHIBITION_NO,
+        models=len(models),
+        rate_limit=args.rate,
+        concurrency=args.concurrency,
+        helper=helper
+    )
+    print_plan(plan, budget=args.budget)
 
-    print(f"\n결과 저장: {filename}")
+
+def check_budget(args, models: List[SpecialCarModel]) -> bool:
+    """
+    --budget 이 지정되었으면 스윕 1회의 예상 요청 수가 예산 이내인지 확인합니다.
+
+    Args:
+        args: 명령줄 인자
+        models: 실제로 검색할 모델 리스트
+
+    Returns:
+        검색해도 되면 True (예산을 넘으면 계획을 출력하고 False)
+    """
+    if args.budget is None:
+        return True
+
+    plan = estimate_sweep(
+        exhibition_no=SpecialChecker.EXHIBITION_NO,
+        models=len(models),
+        rate_limit=args.rate,
+        concurrency=args.concurrency
+    )
+    if plan["total_requests"] <= args.budget:
+        return True
+
+    print_plan(plan, budget=args.budget)
+    print(f"요청 예산을 넘어 검색하지 않습니다. (--budget 을 늘리거나 모델 수를 줄이세요)")
+    return False
 
 
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+    if args.dry_run:
+        dry_run(args)
+        return
+
     print("="*70)
     print("캐스퍼 특별기획전 전국 재고 검색")
     print(f"기획전 번호: {SpecialChecker.EXHIBITION_NO}")
@@ -268,6 +335,9 @@ def main():
         print("\n중단됨")
         return
 
+    if not check_budget(args, selected_models):
+        return
+
     if search_all_models:
         print("\n" + "="*70)
         print("[특별기획전] 모든 모델 전국 재고 검색")
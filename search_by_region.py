@@ -23,30 +23,53 @@ def main():
     print("🗺️  지역별 캐스퍼 재고 검색")
     print("="*70)
     
-    # 1. 시도 선택
+    # 1. 시도 선택 (번호 또는 지역명/초성 입력)
     print("\n[1단계] 시도 선택")
     print("-"*70)
     sidos = helper.list_sidos()
     for i, sido in enumerate(sidos, 1):
         print(f"{i:2}. {sido}")
     
+    sigun_name = None
     try:
-        choice = input("\n시도 번호 선택 (1-17): ").strip()
-        sido_idx = int(choice) - 1
-        
-        if sido_idx < 0 or sido_idx >= len(sidos):
-            print("잘못된 선택입니다.")
-            sys.exit(1)
+        choice = input("\n시도 번호 또는 지역명 입력 (예: 15, 포항, ㅍㅎ): ").strip()
         
-        sido_name = sidos[sido_idx]
+        if choice.isdigit():
+            sido_idx = int(choice) - 1
+            
+            if sido_idx < 0 or sido_idx >= len(sidos):
+                print("잘못된 선택입니다.")
+                sys.exit(1)
+            
+            sido_name = sidos[sido_idx]
+        else:
+            candidates = helper.suggest(choice, 9)
+            if not candidates:
+                print(f"'{choice}'에 해당하는 지역이 없습니다.")
+                sys.exit(1)
+            
+            if len(candidates) == 1 or candidates[0]['score'] > candidates[1]['score']:
+                picked = candidates[0]
+            else:
+                print("\n후보:")
+                for i, r in enumerate(candidates, 1):
+                    print(f"{i}. {r['sido']} {r['sigun']}")
+                idx = int(input(f"\n번호 선택 (1-{len(candidates)}): ").strip()) - 1
+                if idx < 0 or idx >= len(candidates):
+                    print("잘못된 선택입니다.")
+                    sys.exit(1)
+                picked = candidates[idx]
+            
+            sido_name = picked['sido']
+            sigun_name = picked['sigun']
+            print(f"→ {sido_name} {sigun_name}")
         
     except (ValueError, KeyboardInterrupt):
         print("\n중단됨")
         sys.exit(0)
     
-    # 2. 시군구 선택 (있는 경우)
-    sigun_name = None
-    siguns = helper.list_siguns(sido_name)
+    # 2. 시군구 선택 (있는 경우, 1단계에서 정해지지 않았을 때)
+    siguns = helper.list_siguns(sido_name) if sigun_name is None else []
     
     if len(siguns) > 1:
         print(f"\n[2단계] {sido_name} 시군구 선택")
@@ -110,10 +133,10 @@ def main():
         if count > 0:
             for i, car in enumerate(cars, 1):
                 print(f"[{i}]")
-                print(f"  색상: {car['exteriorColorName']} / {car['interiorColorName']}")
-                print(f"  가격: {int(float(car['finalAmount'])):,}원 (할인 {int(float(car['discountPrice'])):,}원)")
-                print(f"  트림: {car['carTrimName']}")
-                print(f"  출고: {car['deliveryCenterName']}")
+                print(f"  색상: {car.color} / {car.interior}")
+                print(f"  가격: {car.price:,}원 (할인 {car.discount:,}원)")
+                print(f"  트림: {car.trim}")
+                print(f"  출고: {car.center}")
                 print()
         else:
             print("현재 해당 지역에 재고가 없습니다.")
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+스냅샷 카탈로그
+
+저장된 검색 결과가 어느 파일의 어느 위치에 있는지 기록합니다.
+보관(압축) 파일로 옮겨진 스냅샷도 카탈로그로 찾아서 바로 읽을 수 있습니다.
+
+작업 디렉터리의 casper_stock_* / special_stock_* 결과 파일을 한 번 훑어
+시각, 모델, 총 대수, 시도별 위치를 기록해 두면, 이후에는 파일을 열지 않고
+"최근 1주일 AX05 재고 추이" 같은 질문에 답할 수 있습니다. 다시 훑을 때는
+새로 생기거나 바뀐 파일만 읽습니다.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+from snapshot_stream import SnapshotReader
+
+
+# 결과 파일 이름: casper_stock_AX05_20260101_120000.json(.jsonl.gz)
+RESULT_FILE = re.compile(r"^(casper|special)_stock_(\w+?)_(\d{8}_\d{6})\.(json|jsonl\.gz|jsonl)$")
+
+EXHIBITIONS = {
+    "casper": "R0003",
+    "special": "E20260133",
+}
+
+# 이전 save_results 형식(indent=2)의 시도 키 줄:     "서울특별시": {
+LEGACY_SIDO_LINE = re.compile(rb'^    "(.+)": \{\s*$')
+LEGACY_FIELD_LINE = re.compile(rb'^  "(timestamp|model_code|exhibition_no|total_count)": (.+?),?\s*$')
+
+
+def parse_result_filename(name: str) -> Optional[Tuple[str, str, datetime]]:
+    """
+    결과 파일 이름에서 (기획전 번호, 모델 코드, 시각)을 읽습니다.
+
+    Returns:
+        결과 파일이 아니면 None
+    """
+    match = RESULT_FILE.match(os.path.basename(name))
+    if not match:
+        return None
+    prefix, model_code, stamp, _ = match.groups()
+    return EXHIBITIONS[prefix], model_code, datetime.strptime(stamp, "%Y%m%d_%H%M%S")
+
+
+def scan_legacy_file(path: str) -> Dict[str, Any]:
+    """
+    이전 JSON 형식 결과 파일의 메타데이터와 시도별 위치를 읽습니다.
+
+    전체를 json.load 하지 않고 줄 단위로 훑습니다. 들여쓰기가 다른 파일은
+    전체를 읽어 메타데이터만 구합니다. (시도별 위치 없음)
+
+    Returns:
+        {"timestamp", "model_code", "exhibition_no", "total_count", "sidos": {시도: 바이트 위치}}
+    """
+    meta: Dict[str, Any] = {"sidos": {}}
+    in_regions = False
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if in_regions:
+                match = LEGACY_SIDO_LINE.match(line)
+                if match:
+                    meta["sidos"][match.group(1).decode('utf-8')] = offset
+            elif line.startswith(b'  "regions": {'):
+                in_regions = True
+            else:
+                match = LEGACY_FIELD_LINE.match(line)
+                if match:
+                    meta[match.group(1).decode()] = json.loads(match.group(2))
+            offset += len(line)
+
+    if "total_count" not in meta:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        meta.update({k: data[k] for k in ("timestamp", "model_code", "exhibition_no", "total_count") if k in data})
+    return meta
+
+
+def scan_stream_file(path: str) -> Dict[str, Any]:
+    """
+    NDJSON 결과 파일의 메타데이터와 시도별 위치를 읽습니다. (.idx 색인이 있으면 색인만)
+    """
+    reader = SnapshotReader(path)
+    meta = {k: v for k, v in reader.header.items() if k != "type"}
+    meta["total_count"] = reader.total_count()
+    meta["sidos"] = reader.index.get("sidos", {})
+    return meta
+
+
+def load_sido(entry: Dict[str, Any], sido: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    카탈로그 항목에서 시도 1곳의 결과만 읽습니다.
+
+    Returns:
+        {시군구: [레코드, ...]}
+    """
+    if entry["path"].endswith(".json"):
+        offset = entry["sidos"].get(sido)
+        if offset is None:
+            if entry["sidos"]:
+                return {}
+            with open(entry["path"], 'r', encoding='utf-8') as f:
+                return json.load(f).get("regions", {}).get(sido, {})
+        # 시도 키 줄부터 같은 들여쓰기의 닫는 괄호까지
+        lines = []
+        with open(entry["path"], 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                lines.append(line)
+                if line.rstrip() in (b'    }', b'    },'):
+                    break
+        text = b"".join(lines).decode('utf-8').rstrip().rstrip(',')
+        return json.loads("{" + text + "}")[sido]
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for record in SnapshotCatalog.open(entry).iter_sido(sido):
+        results.setdefault(record["sigun"], []).append(record)
+    return results
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    path          TEXT    NOT NULL,
+    offset        INTEGER NOT NULL DEFAULT 0,
+    timestamp     TEXT    NOT NULL,
+    exhibition_no TEXT    NOT NULL,
+    model_code    TEXT    NOT NULL,
+    total_count   INTEGER NOT NULL DEFAULT 0,
+    sidos         TEXT,
+    archived      INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (path, offset)
+);
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_model ON snapshots (exhibition_no, model_code, timestamp);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time  ON snapshots (timestamp);
+
+CREATE TABLE IF NOT EXISTS scanned_files (
+    path  TEXT PRIMARY KEY,
+    size  INTEGER NOT NULL,
+    mtime REAL    NOT NULL
+);
+"""
+
+
+class SnapshotCatalog:
+    """
+    스냅샷 위치 카탈로그 (SQLite)
+
+    Examples:
+        >>> catalog = SnapshotCatalog()
+        >>> for entry in catalog.find(model_code="AX05", since="2026-01-01"):
+        ...     reader = catalog.open(entry)
+    """
+
+    def __init__(self, path: str = "snapshot_catalog.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """데이터베이스 연결을 닫습니다."""
+        self.conn.close()
+
+    def add(
+        self,
+        path: str,
+        timestamp: str,
+        exhibition_no: str,
+        model_code: str,
+        total_count: int = 0,
+        offset: int = 0,
+        sidos: Optional[Dict[str, int]] = None,
+        archived: bool = False
+    ):
+        """
+        스냅샷 위치를 기록합니다. (같은 파일/위치면 덮어씀)
+
+        Args:
+            path: 파일 경로
+            timestamp: 스윕 시각 (ISO 형식)
+            exhibition_no: 기획전 번호
+            model_code: 모델 코드
+            total_count: 총 차량 수
+            offset: 파일 안의 시작 위치
+            sidos: {시도: 시작 위치}
+            archived: 보관 파일 여부
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots "
+                "(path, offset, timestamp, exhibition_no, model_code, total_count, sidos, archived) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, offset, timestamp, exhibition_no, model_code, total_count,
+                 json.dumps(sidos or {}, ensure_ascii=False), int(archived))
+            )
+
+    def remove(self, path: str, offset: Optional[int] = None):
+        """파일(또는 파일 안의 스냅샷 1개)의 기록을 지웁니다."""
+        with self._lock, self.conn:
+            if offset is None:
+                self.conn.execute("DELETE FROM snapshots WHERE path = ?", (path,))
+            else:
+                self.conn.execute("DELETE FROM snapshots WHERE path = ? AND offset = ?", (path, offset))
+
+    def find(
+        self,
+        model_code: Optional[str] = None,
+        exhibition_no: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 스냅샷을 시간순으로 찾습니다.
+
+        Args:
+            model_code: 모델 코드
+            exhibition_no: 기획전 번호
+            since: 시작 시각 (ISO 형식, 포함)
+            until: 종료 시각 (ISO 형식, 미포함)
+            path: 파일 경로
+        """
+        where, params = [], []
+        if path:
+            where.append("path = ?")
+            params.append(path)
+        if exhibition_no:
+            where.append("exhibition_no = ?")
+            params.append(exhibition_no)
+        if model_code:
+            where.append("model_code = ?")
+            params.append(model_code)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+
+        sql = "SELECT * FROM snapshots"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp"
+
+        entries = []
+        for row in self.conn.execute(sql, params):
+            entry = dict(row)
+            entry["sidos"] = json.loads(entry["sidos"] or "{}")
+            entries.append(entry)
+        return entries
+
+    def scan(self, directory: str = ".", verbose: bool = False) -> Dict[str, int]:
+        """
+        디렉터리의 결과 파일을 카탈로그에 등록합니다.
+
+        이전에 등록한 뒤 크기/수정 시각이 바뀌지 않은 파일은 건너뛰고,
+        사라진 파일은 카탈로그에서 지웁니다.
+
+        Returns:
+            {"added": 새로 등록, "skipped": 변경 없음, "removed": 삭제, "failed": 실패}
+        """
+        counts = {"added": 0, "skipped": 0, "removed": 0, "failed": 0}
+        known = {row["path"]: (row["size"], row["mtime"])
+                 for row in self.conn.execute("SELECT * FROM scanned_files")}
+        seen = set()
+
+        for name in sorted(os.listdir(directory)):
+            info = parse_result_filename(name)
+            if info is None:
+                continue
+            path = os.path.join(directory, name)
+            seen.add(path)
+            stat = os.stat(path)
+            if known.get(path) == (stat.st_size, stat.st_mtime):
+                counts["skipped"] += 1
+                continue
+
+            exhibition_no, model_code, ts = info
+            try:
+                meta = scan_legacy_file(path) if name.endswith(".json") else scan_stream_file(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  카탈로그 등록 실패 ({name}): {e}")
+                counts["failed"] += 1
+                continue
+
+            self.add(
+                path,
+                timestamp=meta.get("timestamp") or ts.isoformat(),
+                exhibition_no=meta.get("exhibition_no") or exhibition_no,
+                model_code=meta.get("model_code") or model_code,
+                total_count=meta.get("total_count", 0),
+                sidos=meta.get("sidos")
+            )
+            with self._lock, self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO scanned_files VALUES (?, ?, ?)",
+                                  (path, stat.st_size, stat.st_mtime))
+            counts["added"] += 1
+            if verbose and counts["added"] % 500 == 0:
+                print(f"  ... {counts['added']}개 등록")
+
+        for path in known:
+            if path not in seen and os.path.dirname(path) == directory:
+                self.remove(path)
+                with self._lock, self.conn:
+                    self.conn.execute("DELETE FROM scanned_files WHERE path = ?", (path,))
+                counts["removed"] += 1
+        return counts
+
+    def stock_history(
+        self,
+        model_code: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        exhibition_no: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        모델의 시각별 총 재고를 반환합니다. (파일을 열지 않음)
+
+        Returns:
+            [(시각, 총 대수), ...] 시간순
+        """
+        where, params = ["model_code = ?"], [model_code]
+        if exhibition_no:
+            where.append("exhibition_no = ?")
+            params.append(exhibition_no)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        rows = self.conn.execute(
+            "SELECT timestamp, total_count FROM snapshots WHERE " + " AND ".join(where) + " ORDER BY timestamp",
+            params
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    @staticmethod
+    def open(entry: Dict[str, Any]) -> SnapshotReader:
+        """카탈로그 항목의 스냅샷 리더를 반환합니다. (NDJSON 형식만, 이전 JSON은 load_sido 사용)"""
+        index = {"total_count": entry["total_count"], "sidos": entry["sidos"]} if entry.get("sidos") else None
+        return SnapshotReader(entry["path"], offset=entry["offset"], index=index)
+
+
+def main():
+    """결과 파일을 카탈로그에 등록하고 재고 추이를 출력합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='검색 결과 카탈로그')
+    parser.add_argument('model', nargs='?', help='재고 추이를 볼 모델 코드 (예: AX05)')
+    parser.add_argument('--db', default='snapshot_catalog.db', help='카탈로그 파일')
+    parser.add_argument('--dir', default='.', help='결과 파일 디렉터리')
+    parser.add_argument('--days', type=float, default=7, help='최근 며칠')
+    parser.add_argument('--no-scan', action='store_true', help='파일을 새로 훑지 않음')
+    args = parser.parse_args()
+
+    catalog = SnapshotCatalog(args.db)
+    if not args.no_scan:
+        counts = catalog.scan(args.dir, verbose=True)
+        print(f"📚 카탈로그: 새로 등록 {counts['added']} · 변경 없음 {counts['skipped']} · "
+              f"삭제 {counts['removed']} · 실패 {counts['failed']}")
+
+    if args.model:
+        since = (datetime.now() - timedelta(days=args.days)).isoformat()
+        history = catalog.stock_history(args.model, since=since)
+        print(f"\n📈 {args.model} 최근 {args.days:g}일 재고 ({len(history)}개 스냅샷)")
+        for timestamp, total in history:
+            print(f"  {timestamp[:19]}  {total:>4}대  {'█' * min(total, 60)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+델타 압축 스냅샷 저장소
+
+연속된 스윕 결과는 대부분 몇 대만 다르므로, 매번 전체 결과를 저장하지 않고
+주기적인 전체 스냅샷(키프레임)과 직전 스냅샷 대비 변경분(델타)만 저장합니다.
+
+스냅샷은 내용 해시(sha256)로 식별됩니다. 내용이 같은 스윕은 객체를 새로
+만들지 않고 색인에 해시 한 줄만 추가합니다.
+
+디렉터리 구조:
+    snapshots/
+        R0003_AX05.jsonl          # 스트림 색인: {"ts": ..., "hash": ...} 한 줄씩
+        objects/ab/abcd....json.gz  # 키프레임 또는 델타 (해시 = 스냅샷 내용 해시)
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+
+# 스냅샷 = {차대번호: 차량 레코드}
+Snapshot = Dict[str, Dict[str, Any]]
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+
+def car_record(car: Dict[str, Any]) -> Dict[str, Any]:
+    """API 차량 정보를 저장용 레코드로 변환합니다. (save_results 와 같은 필드)"""
+    return {
+        "color": car.get('exteriorColorName', ''),
+        "interior": car.get('interiorColorName', ''),
+        "trim": car.get('carTrimName', ''),
+        "price": car.get('finalAmount', ''),
+        "discount": car.get('discountPrice', ''),
+        "discount_rate": car.get('discountRate', ''),
+        "center": car.get('deliveryCenterName', ''),
+        "production_date": car.get('prdnDt', ''),
+    }
+
+
+def build_snapshot(results: Dict[str, Dict[str, List[Dict[str, Any]]]]) -> Snapshot:
+    """
+    전국 검색 결과를 차대번호 기준 스냅샷으로 변환합니다.
+
+    같은 차량이 여러 지역에서 조회되면 레코드 하나에 지역 목록을 모읍니다.
+
+    Returns:
+        {차대번호: {..., "regions": [[시도, 시군구], ...]}}
+    """
+    snapshot: Snapshot = {}
+    for sido, sigun_dict in results.items():
+        for sigun, cars in (sigun_dict or {}).items():
+            for car in cars:
+                number = car.get("carProductionNumber")
+                if not number:
+                    continue
+                record = snapshot.get(number)
+                if record is None:
+                    record = snapshot[number] = dict(car_record(car), regions=[])
+                record["regions"].append([sido, sigun])
+    return snapshot
+
+
+def to_regions(snapshot: Snapshot) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """스냅샷을 save_results 형식의 {시도: {시군구: [레코드, ...]}} 로 되돌립니다."""
+    regions: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for number, record in snapshot.items():
+        car = {k: v for k, v in record.items() if k != "regions"}
+        car["carProductionNumber"] = number
+        for sido, sigun in record.get("regions", []):
+            regions.setdefault(sido, {}).setdefault(sigun, []).append(car)
+    return regions
+
+
+def content_hash(snapshot: Snapshot) -> str:
+    """스냅샷 내용 해시 (키 순서와 무관)"""
+    encoded = json.dumps(snapshot, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def make_delta(previous: Snapshot, current: Snapshot) -> Tuple[Snapshot, List[str]]:
+    """
+    두 스냅샷의 차이를 계산합니다.
+
+    Returns:
+        (추가/변경된 레코드, 삭제된 차대번호 리스트)
+    """
+    upserts = {number: record for number, record in current.items() if previous.get(number) != record}
+    removed = [number for number in previous if number not in current]
+    return upserts, removed
+
+
+def apply_delta(base: Snapshot, upserts: Snapshot, removed: List[str]) -> Snapshot:
+    """기준 스냅샷에 델타를 적용한 새 스냅샷을 반환합니다."""
+    snapshot = dict(base)
+    for number in removed:
+        snapshot.pop(number, None)
+    snapshot.update(upserts)
+    return snapshot
+
+
+class SnapshotStore:
+    """
+    키프레임 + 델타 방식의 내용 주소 스냅샷 저장소
+
+    Examples:
+        >>> store = SnapshotStore("snapshots")
+        >>> store.put("R0003_AX05", build_snapshot(results))
+        >>> entries = store.history("R0003_AX05")
+        >>> snapshot = store.get(entries[-1]["hash"])
+    """
+
+    def __init__(self, directory: str = "snapshots", keyframe_every: int = 48, cache_size: int = 8):
+        """
+        Args:
+            directory: 저장 디렉터리
+            keyframe_every: 델타가 몇 개 이어지면 키프레임을 새로 저장할지
+                (복원 시 적용할 최대 델타 수)
+            cache_size: 복원한 스냅샷을 메모리에 보관할 개수
+        """
+        self.directory = directory
+        self.keyframe_every = max(1, keyframe_every)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._last: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.json.gz")
+
+    def _index_path(self, stream: str) -> str:
+        return os.path.join(self.directory, f"{stream}.jsonl")
+
+    def has(self, digest: str) -> bool:
+        """해당 해시의 스냅샷이 저장되어 있는지 여부"""
+        return os.path.exists(self._object_path(digest))
+
+    def _read_object(self, digest: str) -> Dict[str, Any]:
+        with gzip.open(self._object_path(digest), 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_object(self, digest: str, obj: Dict[str, Any]):
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def _remember(self, digest: str, snapshot: Snapshot):
+        self._cache[digest] = snapshot
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def depth(self, digest: str) -> int:
+        """키프레임까지 거슬러 올라가야 하는 델타 수"""
+        return self._read_object(digest).get("depth", 0)
+
+    def get(self, digest: str) -> Snapshot:
+        """
+        해시로 스냅샷을 복원합니다. (키프레임부터 델타를 차례로 적용)
+
+        Raises:
+            FileNotFoundError: 해당 해시의 객체가 없을 때
+        """
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+
+            # 키프레임 또는 캐시된 스냅샷까지 거슬러 올라감
+            chain = []
+            cursor = digest
+            base: Optional[Snapshot] = None
+            while True:
+                if cursor in self._cache:
+                    base = self._cache[cursor]
+                    break
+                obj = self._read_object(cursor)
+                if obj["type"] == KEYFRAME:
+                    base = obj["cars"]
+                    break
+                chain.append(obj)
+                cursor = obj["base"]
+
+            snapshot = base
+            for obj in reversed(chain):
+                snapshot = apply_delta(snapshot, obj["upserts"], obj["removed"])
+            self._remember(digest, snapshot)
+            return snapshot
+
+    def last_hash(self, stream: str) -> Optional[str]:
+        """스트림의 마지막 스냅샷 해시"""
+        if stream not in self._last:
+            entries = self.history(stream)
+            if not entries:
+                return None
+            self._last[stream] = entries[-1]["hash"]
+        return self._last[stream]
+
+    def put(self, stream: str, snapshot: Snapshot, timestamp: Optional[str] = None, **meta) -> str:
+        """
+        스냅샷을 저장하고 스트림 색인에 기록합니다.
+
+        내용이 이미 저장된 스냅샷과 같으면 객체를 새로 쓰지 않습니다.
+
+        Args:
+            stream: 스트림 이름 (예: "R0003_AX05")
+            snapshot: 저장할 스냅샷
+            timestamp: 스윕 시각 (ISO 형식, 기본 현재)
+            **meta: 색인에 함께 기록할 정보 (예: total_count)
+
+        Returns:
+            스냅샷 해시
+        """
+        digest = content_hash(snapshot)
+
+        with self._lock:
+            return self._put(stream, snapshot, digest, timestamp, meta)
+
+    def _put(self, stream: str, snapshot: Snapshot, digest: str, timestamp: Optional[str], meta: Dict[str, Any]) -> str:
+        if not self.has(digest):
+            previous_hash = self.last_hash(stream)
+            obj = None
+            if previous_hash and self.has(previous_hash):
+                depth = self.depth(previous_hash) + 1
+                if depth < self.keyframe_every:
+                    upserts, removed = make_delta(self.get(previous_hash), snapshot)
+                    # 변경분이 절반을 넘으면 키프레임이 더 작고 복원도 빠름
+                    if len(upserts) + len(removed) <= max(len(snapshot) // 2, 1):
+                        obj = {"type": DELTA, "base": previous_hash, "depth": depth,
+                               "upserts": upserts, "removed": removed}
+            if obj is None:
+                obj = {"type": KEYFRAME, "depth": 0, "cars": snapshot}
+            self._write_object(digest, obj)
+
+        entry = dict(meta, ts=timestamp or datetime.now().isoformat(timespec="seconds"), hash=digest)
+        with open(self._index_path(stream), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+        self._last[stream] = digest
+        self._remember(digest, snapshot)
+        return digest
+
+    def streams(self) -> List[str]:
+        """저장된 스트림 이름 리스트"""
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(self.directory) if name.endswith(".jsonl"))
+
+    def history(self, stream: str) -> List[Dict[str, Any]]:
+        """스트림 색인 항목 리스트 (시간순)"""
+        path = self._index_path(stream)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def at(self, stream: str, timestamp: str) -> Optional[Snapshot]:
+        """
+        주어진 시각 당시의 스냅샷을 반환합니다. (그 시각 이전 마지막 스윕)
+
+        Args:
+            stream: 스트림 이름
+            timestamp: ISO 형식 시각
+        """
+        found = None
+        for entry in self.history(stream):
+            if entry["ts"] > timestamp:
+                break
+            found = entry["hash"]
+        return self.get(found) if found else None
+
+    def retain(self, stream: str, select: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> int:
+        """
+        스트림 색인을 select 가 고른 항목만 남기도록 다시 씁니다.
+
+        색인 읽기, 선택, 다시 쓰기를 모두 잠금 안에서 하므로 그 사이에 put()으로
+        추가된 항목을 잃지 않습니다. 객체는 지우지 않으므로 이후 gc()로 정리하세요.
+
+        Args:
+            stream: 스트림 이름
+            select: 색인 항목 리스트(시간순) → 남길 항목 리스트
+
+        Returns:
+            제거된 색인 항목 수
+        """
+        with self._lock:
+            entries = self.history(stream)
+            keep = select(entries)
+            if len(keep) == len(entries):
+                return 0
+            path = self._index_path(stream)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for entry in keep:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + "\n")
+            os.replace(tmp, path)
+            self._last.pop(stream, None)
+            return len(entries) - len(keep)
+
+    def gc(self) -> int:
+        """
+        어느 색인에서도 참조되지 않는 객체를 지웁니다.
+
+        남은 스냅샷을 복원하는 데 필요한 델타/키프레임 체인은 유지합니다.
+
+        Returns:
+            지운 객체 수
+        """
+        with self._lock:
+            reachable = set()
+            for stream in self.streams():
+                for entry in self.history(stream):
+                    cursor = entry["hash"]
+                    while cursor and cursor not in reachable and self.has(cursor):
+                        reachable.add(cursor)
+                        cursor = self._read_object(cursor).get("base")
+
+            removed = 0
+            objects = os.path.join(self.directory, "objects")
+            for root, _, files in os.walk(objects):
+                for name in files:
+                    if name.endswith(".json.gz") and name[:-len(".json.gz")] not in reachable:
+                        os.remove(os.path.join(root, name))
+                        self._cache.pop(name[:-len(".json.gz")], None)
+                        removed += 1
+            return removed
+
+    def disk_usage(self) -> int:
+        """저장소 전체 크기 (바이트)"""
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store(directory: str = "snapshots") -> SnapshotStore:
+    """전역 SnapshotStore 인스턴스를 반환합니다."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore(directory)
+    return _store
+
+
+def main():
+    """저장된 스트림을 요약하거나 특정 시각의 스냅샷을 출력합니다."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='스냅샷 저장소 조회')
+    parser.add_argument('--dir', default='snapshots', help='저장 디렉터리')
+    parser.add_argument('--stream', help='스트림 이름 (예: R0003_AX05)')
+    parser.add_argument('--at', help='이 시각 당시의 스냅샷 출력 (ISO 형식)')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+
+    if args.stream and args.at:
+        snapshot = store.at(args.stream, args.at)
+        if snapshot is None:
+            print("❌ 해당 시각 이전의 스냅샷이 없습니다.")
+            return
+        print(json.dumps(to_regions(snapshot), ensure_ascii=False, indent=2))
+        return
+
+    streams = [args.stream] if args.stream else store.streams()
+    for stream in streams:
+        entries = store.history(stream)
+        unique = len({entry["hash"] for entry in entries})
+        span = f"{entries[0]['ts']} ~ {entries[-1]['ts']}" if entries else "-"
+        print(f"📦 {stream}: 스윕 {len(entries)}회 (고유 {unique}개) {span}")
+    print(f"💾 저장소 크기: {store.disk_usage():,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+스트리밍 스냅샷 파일 (NDJSON)
+
+검색 결과 전체를 딕셔너리로 만든 뒤 한 번에 json.dump 하지 않고,
+차량 1대씩 한 줄로 바로 기록합니다. 읽을 때도 한 줄씩 읽으므로
+결과가 아무리 커도 메모리 사용량이 일정합니다.
+
+파일 형식 (한 줄에 JSON 하나):
+    {"type": "header", "timestamp": ..., "model": ..., ...}
+    {"type": "car", "sido": ..., "sigun": ..., "carProductionNumber": ..., "color": ..., ...}
+    ...
+    {"type": "footer", "total_count": ...}
+
+파일 이름이 .gz 로 끝나면 gzip으로 압축하며, 시도마다 gzip 멤버를 새로
+시작합니다. 옆에 생기는 색인 파일(.idx)에 시도별 시작 위치를 기록하므로
+특정 시도만 읽을 때 앞부분을 건너뛸 수 있습니다.
+"""
+
+import gzip
+import json
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional
+
+from snapshot_store import car_record
+
+
+HEADER = "header"
+CAR = "car"
+FOOTER = "footer"
+
+INDEX_SUFFIX = ".idx"
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+class SnapshotWriter:
+    """
+    결과를 한 줄씩 기록하는 스냅샷 작성기
+
+    Examples:
+        >>> with SnapshotWriter("casper_stock_AX05.jsonl.gz", model="캐스퍼 일렉트릭") as writer:
+        ...     for sido, sigun_dict in results.items():
+        ...         for sigun, cars in sigun_dict.items():
+        ...             writer.write_cars(sido, sigun, cars)
+    """
+
+    def __init__(self, filename: str, compress: Optional[bool] = None, append: bool = False, **meta):
+        """
+        Args:
+            filename: 저장할 파일 이름
+            compress: gzip 압축 여부 (기본: 파일 이름이 .gz 로 끝나면 압축)
+            append: 기존 파일 뒤에 이어서 기록 (여러 스냅샷을 담는 보관 파일용,
+                색인 파일은 만들지 않으며 offset/sidos 속성으로 위치를 알려줌)
+            **meta: 헤더에 기록할 정보 (model, model_code, exhibition_no 등)
+        """
+        self.filename = filename
+        self.compress = filename.endswith(".gz") if compress is None else compress
+        self.append = append
+        self.total_count = 0
+        self.sidos: Dict[str, int] = {}
+        self._sido: Optional[str] = None
+        self._raw = open(filename, 'ab' if append else 'wb')
+        self._out = self._raw
+        self.offset = self._start_member()
+        self._write(dict(meta, type=HEADER, timestamp=meta.get("timestamp") or datetime.now().isoformat()))
+
+    def _write(self, record: Dict[str, Any]):
+        self._out.write(_encode(record))
+
+    def _start_member(self):
+        """현재 위치에서 새 구간을 시작합니다. (압축 시 새 gzip 멤버)"""
+        if self.compress:
+            if self._out is not self._raw:
+                self._out.close()
+            offset = self._raw.tell()
+            self._out = gzip.GzipFile(fileobj=self._raw, mode='wb')
+            return offset
+        return self._raw.tell()
+
+    def write_record(self, sido: str, sigun: str, record: Dict[str, Any]):
+        """
+        저장용 레코드 1개를 그대로 기록합니다. 같은 시도의 레코드는 이어서 기록해야 합니다.
+        """
+        if sido != self._sido:
+            if sido in self.sidos:
+                raise ValueError(f"시도 '{sido}'의 차량이 이어서 기록되지 않았습니다.")
+            self.sidos[sido] = self._start_member()
+            self._sido = sido
+        self._write(dict(record, type=CAR, sido=sido, sigun=sigun))
+        self.total_count += 1
+
+    def write_car(self, sido: str, sigun: str, car: Dict[str, Any]):
+        """API 차량 정보 1대를 저장용 레코드로 변환하여 기록합니다."""
+        record = car_record(car)
+        record["carProductionNumber"] = car.get("carProductionNumber", "")
+        self.write_record(sido, sigun, record)
+
+    def write_cars(self, sido: str, sigun: str, cars: List[Dict[str, Any]]):
+        """지역 1곳의 차량들을 기록합니다."""
+        for car in cars:
+            self.write_car(sido, sigun, car)
+
+    def close(self):
+        """푸터와 색인 파일을 기록하고 파일을 닫습니다."""
+        if self._raw.closed:
+            return
+        self._start_member()
+        self._write({"type": FOOTER, "total_count": self.total_count})
+        if self._out is not self._raw:
+            self._out.close()
+        self._raw.close()
+
+        if self.append:
+            return
+        with open(self.filename + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump({"total_count": self.total_count, "sidos": self.sidos}, f, ensure_ascii=False)
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_results(results: Dict[str, Dict[str, List[Dict[str, Any]]]], filename: str, **meta) -> int:
+    """
+    {시도: {시군구: [차량, ...]}} 결과를 스트리밍 형식으로 저장합니다.
+
+    Returns:
+        기록한 차량 수
+    """
+    with SnapshotWriter(filename, **meta) as writer:
+        for sido, sigun_dict in results.items():
+            for sigun, cars in (sigun_dict or {}).items():
+                writer.write_cars(sido, sigun, cars)
+    return writer.total_count
+
+
+class SnapshotReader:
+    """
+    스트리밍 스냅샷 파일을 한 줄씩 읽는 리더
+
+    Examples:
+        >>> reader = SnapshotReader("casper_stock_AX05.jsonl.gz")
+        >>> reader.header["model"]
+        >>> for car in reader.iter_sido("서울특별시"):
+        ...     print(car["sigun"], car["price"])
+    """
+
+    def __init__(self, filename: str, offset: int = 0, index: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            filename: 파일 이름
+            offset: 스냅샷 시작 위치 (보관 파일 안의 스냅샷을 읽을 때)
+            index: 색인 ({"total_count": ..., "sidos": {시도: 위치}}, 기본: .idx 파일)
+        """
+        self.filename = filename
+        self.offset = offset
+        self.compressed = filename.endswith(".gz")
+        self._header: Optional[Dict[str, Any]] = None
+        self._index: Optional[Dict[str, Any]] = index
+
+    def _lines(self, offset: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """레코드를 한 줄씩 읽습니다. 푸터를 만나면 멈춥니다."""
+        with open(self.filename, 'rb') as raw:
+            raw.seek(self.offset if offset is None else offset)
+            stream = gzip.GzipFile(fileobj=raw, mode='rb') if self.compressed else raw
+            for line in stream:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 비정상 종료로 잘린 마지막 줄
+                    return
+                yield record
+                if record.get("type") == FOOTER:
+                    return
+
+    @property
+    def header(self) -> Dict[str, Any]:
+        """헤더 (모델, 시각 등)"""
+        if self._header is None:
+            first = next(self._lines(), {})
+            self._header = first if first.get("type") == HEADER else {}
+        return self._header
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """색인 파일 내용 (없으면 빈 딕셔너리)"""
+        if self._index is None:
+            if self.offset:
+                self._index = {}
+                return self._index
+            try:
+                with open(self.filename + INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """모든 차량 레코드를 순서대로 읽습니다."""
+        for record in self._lines():
+            if record.get("type") == CAR:
+                yield record
+
+    def sidos(self) -> List[str]:
+        """파일에 기록된 시도 리스트"""
+        if self.index:
+            return list(self.index.get("sidos", {}))
+        seen = []
+        for record in self:
+            if not seen or seen[-1] != record["sido"]:
+                seen.append(record["sido"])
+        return seen
+
+    def iter_sido(self, sido: str) -> Iterator[Dict[str, Any]]:
+        """
+        특정 시도의 차량만 읽습니다.
+
+        색인이 있으면 해당 위치로 바로 이동하고, 다음 시도가 나오면 멈춥니다.
+        """
+        offsets = self.index.get("sidos", {})
+        if offsets and sido not in offsets:
+            return
+        started = False
+        for record in self._lines(offsets.get(sido, self.offset)):
+            if record.get("type") != CAR:
+                if started:
+                    return
+                continue
+            if record["sido"] == sido:
+                started = True
+                yield record
+            elif started:
+                return
+
+    def total_count(self) -> int:
+        """총 차량 수 (색인이 없으면 파일을 끝까지 읽음)"""
+        if "total_count" in self.index:
+            return self.index["total_count"]
+        return sum(1 for _ in self)
+
+    def to_results(self) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """파일 전체를 {시도: {시군구: [레코드, ...]}} 로 읽습니다."""
+        results: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for record in self:
+            results.setdefault(record["sido"], {}).setdefault(record["sigun"], []).append(record)
+        return results
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+전국 재고 검색(스윕) 비용 추정 및 드라이런 계획 모듈
+
+실제 요청을 보내기 전에 스윕이 발생시킬 HTTP 요청 수, 예상 전송량,
+예상 소요 시간을 계산합니다.
+"""
+
+import os
+import json
+import time
+import statistics
+from typing import Dict, List, Optional, Any
+
+
+# 지연 시간 기록이 없을 때 사용하는 기본값
+DEFAULT_LATENCY = 0.35          # 요청당 응답 시간 (초)
+DEFAULT_REQUEST_BYTES = 480     # 요청 본문 크기 (바이트)
+DEFAULT_BASE_BYTES = 600        # 차량이 없는 응답의 크기 (바이트)
+DEFAULT_BYTES_PER_CAR = 2400    # 차량 1대당 응답 크기 (바이트)
+
+# run_search / run_special 의 check_all_regions 지연 설정
+SIGUN_DELAY = 0.1
+SIDO_DELAY = 0.2
+
+# 모니터링 루프에서 지연 기록을 저장하는 최소 간격 (초, 종료 시에는 항상 저장)
+LATENCY_SAVE_INTERVAL = 300.0
+
+# 기획전별 페이지 크기
+PAGE_SIZES = {
+    "R0003": 18,
+    "E20260133": 100,
+}
+
+
+class LatencyHistory:
+    """요청 지연 시간 및 응답 크기 기록"""
+
+    def __init__(self, filename: str = "latency_history.json", max_samples: int = 500):
+        self.filename = filename
+        self.max_samples = max_samples
+        self.samples: List[Dict[str, float]] = []
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._load()
+
+    def _load(self):
+        """기록 파일을 로드합니다."""
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                self.samples = json.load(f)[-self.max_samples:]
+        except (OSError, ValueError):
+            self.samples = []
+
+    def record(self, elapsed: float, response_bytes: int, exhibition_no: str = ""):
+        """
+        요청 1건의 결과를 기록합니다.
+
+        Args:
+            elapsed: 응답 시간 (초)
+            response_bytes: 응답 본문 크기 (바이트)
+            exhibition_no: 기획전 번호
+        """
+        self.samples.append({
+            "t": round(time.time(), 3),
+            "elapsed": round(elapsed, 4),
+            "bytes": response_bytes,
+            "exhbNo": exhibition_no,
+        })
+        if len(self.samples) > self.max_samples:
+            del self.samples[:len(self.samples) - self.max_samples]
+        self._dirty = True
+
+    def save(self, min_interval: float = 0.0):
+        """
+        변경된 기록을 파일에 저장합니다.
+
+        Args:
+            min_interval: 마지막 저장 후 이 시간(초)이 지나지 않았으면 저장하지 않음
+                          (모니터링 루프에서 주기적으로 호출할 때)
+        """
+        if not self._dirty or time.monotonic() - self._saved_at < min_interval:
+            return
+        try:
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(list(self.samples), f)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except OSError as e:
+            print(f"⚠️  지연 기록 저장 실패: {e}")
+
+    def _select(self, exhibition_no: Optional[str]) -> List[Dict[str, float]]:
+        if exhibition_no:
+            selected = [s for s in self.samples if s.get("exhbNo") == exhibition_no]
+            if selected:
+                return selected
+        return self.samples
+
+    def latency(self, exhibition_no: Optional[str] = None) -> float:
+        """응답 시간 중앙값 (기록이 없으면 기본값)"""
+        samples = self._select(exhibition_no)
+        if not samples:
+            return DEFAULT_LATENCY
+        return statistics.median(s["elapsed"] for s in samples)
+
+    def latency_p90(self, exhibition_no: Optional[str] = None) -> float:
+        """응답 시간 90 백분위수 (기록이 없으면 기본값의 2배)"""
+        samples = self._select(exhibition_no)
+        if len(samples) < 2:
+            return self.latency(exhibition_no) * 2
+        values = sorted(s["elapsed"] for s in samples)
+        return values[min(len(values) - 1, int(len(values) * 0.9))]
+
+    def response_bytes(self, exhibition_no: Optional[str] = None) -> Optional[float]:
+        """평균 응답 크기 (기록이 없으면 None)"""
+        samples = self._select(exhibition_no)
+        if not samples:
+            return None
+        return statistics.mean(s["bytes"] for s in samples)
+
+
+# 전역 인스턴스
+_latency_history = None
+
+
+def get_latency_history() -> LatencyHistory:
+    """LatencyHistory 싱글톤 인스턴스를 반환합니다."""
+    global _latency_history
+    if _latency_history is None:
+        _latency_history = LatencyHistory()
+    return _latency_history
+
+
+def sigun_queries_needed(exhibition_no: str = "R0003") -> bool:
+    """
+    시군구별로 따로 조회해야 하는지 여부
+
+    param_profiler 분석에서 deliveryLocalAreaCode 가 차량 집합에 영향이 없다고
+    확인되면 시도 단위 1건으로 충분합니다. (분석 전이면 True)
+    """
+    from param_profiler import get_param_influence
+    return get_param_influence().affects_membership(exhibition_no, "deliveryLocalAreaCode")
+
+
+def count_region_queries(helper=None, exhibition_no: str = "R0003") -> Dict[str, int]:
+    """
+    check_all_regions가 시도별로 보내는 요청 수를 계산합니다.
+
+    시군구가 2개 이상인 시도는 시군구마다 1건, 나머지는 시도 단위 1건입니다.
+    (sigun_queries_needed 가 False면 모든 시도가 1건)
+
+    Returns:
+        {시도명: 요청 수} 딕셔너리
+    """
+    if helper is None:
+        from region_helper import get_region_helper
+        helper = get_region_helper()
+
+    per_sigun = sigun_queries_needed(exhibition_no)
+    queries = {}
+    for sido in helper.list_sidos():
+        siguns = helper.list_siguns(sido)
+        queries[sido] = len(siguns) if per_sigun and len(siguns) > 1 else 1
+    return queries
+
+
+def estimate_sweep(
+    exhibition_no: str = "R0003",
+    models: int = 1,
+    rate_limit: Optional[float] = None,
+    concurrency: int = 1,
+    expected_cars_per_query: float = 0.0,
+    history: Optional[LatencyHistory] = None,
+    helper=None
+) -> Dict[str, Any]:
+    """
+    전국 스윕의 비용을 추정합니다.
+
+    Args:
+        exhibition_no: 기획전 번호 ("R0003" 또는 "E20260133")
+        models: 검색할 모델 수
+        rate_limit: 초당 최대 요청 수 (None이면 제한 없음)
+        concurrency: 동시 요청 수 (1이면 기존 순차 스윕과 동일한 지연 적용)
+        expected_cars_per_query: 응답 크기 기록이 없을 때 가정할 요청당 차량 수
+        history: 지연 시간 기록 (없으면 전역 기록 사용)
+        helper: RegionHelper (없으면 전역 인스턴스 사용)
+
+    Returns:
+        요청 수, 예상 바이트, 예상 소요 시간 등이 담긴 딕셔너리
+    """
+    if history is None:
+        history = get_latency_history()
+
+    per_sido = count_region_queries(helper, exhibition_no)
+    requests_per_model = sum(per_sido.values())
+    total_requests = requests_per_model * models
+    page_size = PAGE_SIZES.get(exhibition_no, 18)
+
+    # 응답 크기: 기록 평균 → 없으면 페이지 크기 기반 추정
+    measured = history.response_bytes(exhibition_no)
+    if measured is not None:
+        response_bytes = measured
+    else:
+        cars = min(expected_cars_per_query, page_size)
+        response_bytes = DEFAULT_BASE_BYTES + cars * DEFAULT_BYTES_PER_CAR
+    max_response_bytes = DEFAULT_BASE_BYTES + page_size * DEFAULT_BYTES_PER_CAR
+
+    latency = history.latency(exhibition_no)
+    latency_p90 = history.latency_p90(exhibition_no)
+
+    # 순차 스윕은 check_all_regions의 고정 지연을 그대로 포함
+    if concurrency <= 1:
+        sigun_requests = sum(n for n in per_sido.values() if n > 1)
+        pacing = (sigun_requests * SIGUN_DELAY + len(per_sido) * SIDO_DELAY) * models
+        network = total_requests * latency
+        wall_time = network + pacing
+        wall_time_p90 = total_requests * latency_p90 + pacing
+    else:
+        throughput = concurrency / latency
+        throughput_p90 = concurrency / latency_p90
+        if rate_limit:
+            throughput = min(throughput, rate_limit)
+            throughput_p90 = min(throughput_p90, rate_limit)
+        wall_time = total_requests / throughput
+        wall_time_p90 = total_requests / throughput_p90
+
+    if concurrency <= 1 and rate_limit:
+        wall_time = max(wall_time, total_requests / rate_limit)
+        wall_time_p90 = max(wall_time_p90, total_requests / rate_limit)
+
+    return {
+        "exhibition_no": exhibition_no,
+        "models": models,
+        "requests_per_model": requests_per_model,
+        "total_requests": total_requests,
+        "per_sido": per_sido,
+        "page_size": page_size,
+        "request_bytes": total_requests * DEFAULT_REQUEST_BYTES,
+        "response_bytes": int(total_requests * response_bytes),
+        "max_response_bytes": total_requests * max_response_bytes,
+        "latency": latency,
+        "latency_samples": len(history.samples),
+        "rate_limit": rate_limit,
+        "concurrency": concurrency,
+        "wall_time": wall_time,
+        "wall_time_p90": wall_time_p90,
+    }
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:,.1f}{unit}"
+        n /= 1024
+    return f"{n:,.1f}GB"
+
+
+def print_plan(plan: Dict[str, Any], budget: Optional[int] = None):
+    """
+    드라이런 계획을 출력합니다.
+
+    Args:
+        plan: estimate_sweep() 결과
+        budget: 요청 예산 (지정하면 초과 여부 표시)
+    """
+    print("\n" + "="*80)
+    print(f"🧮 스윕 계획 (드라이런) - 기획전 {plan['exhibition_no']}")
+    print("="*80)
+
+    print(f"\n{'시도':<8} {'요청 수':>8}")
+    print("-"*80)
+    for sido, n in plan["per_sido"].items():
+        print(f"{sido:<8} {n:>8}")
+
+    print("-"*80)
+    print(f"모델 수:            {plan['models']}")
+    print(f"모델당 요청 수:     {plan['requests_per_model']}")
+    print(f"총 요청 수:         {plan['total_requests']}")
+    print(f"페이지 크기:        {plan['page_size']}")
+    print(f"예상 송신량:        {_format_bytes(plan['request_bytes'])}")
+    print(f"예상 수신량:        {_format_bytes(plan['response_bytes'])} "
+          f"(최대 {_format_bytes(plan['max_response_bytes'])})")
+    source = f"기록 {plan['latency_samples']}건" if plan['latency_samples'] else "기본값"
+    print(f"요청당 응답 시간:   {plan['latency']:.3f}초 ({source})")
+    rate = f"{plan['rate_limit']}건/초" if plan['rate_limit'] else "제한 없음"
+    print(f"속도 제한:          {rate}, 동시 요청 {plan['concurrency']}개")
+    print(f"예상 소요 시간:     {plan['wall_time']:.1f}초 (p90 {plan['wall_time_p90']:.1f}초)")
+
+    if budget is not None:
+        if plan["total_requests"] > budget:
+            print(f"\n⚠️  요청 예산 초과: {plan['total_requests']}건 > {budget}건")
+        else:
+            print(f"\n✅ 요청 예산 이내: {plan['total_requests']}건 / {budget}건")
+    print("="*80)
+    print("※ 드라이런: 실제 요청은 보내지 않았습니다.")
+
+
+if __name__ == "__main__":
+    print_plan(estimate_sweep())
@@ -0,0 +1,73 @@
+from inventory_diff import (
+    InventoryDiff, diff_index, index_cars, summarize,
+    EVENT_ADDED, EVENT_REMOVED, EVENT_CHANGED,
+)
+
+
+def car(number, price="36000000", center="울산", **extra):
+    return dict(carProductionNumber=number, finalAmount=price, discountPrice="0",
+                deliveryCenterName=center, **extra)
+
+
+def types(events):
+    return sorted((e["type"], e["carProductionNumber"]) for e in events)
+
+
+def test_index_cars_keeps_first_and_skips_missing_number():
+    index = index_cars([car("A", "1"), car("A", "2"), {"finalAmount": "3"}], sido="서울")
+    assert list(index) == ["A"]
+    assert index["A"]["finalAmount"] == "1"
+    assert index["A"]["sido"] == "서울"
+
+
+def test_added_removed_changed():
+    previous = index_cars([car("A"), car("B"), car("C", center="울산")])
+    current = index_cars([car("A"), car("C", center="아산"), car("D")])
+    events = diff_index(previous, current)
+    assert types(events) == [(EVENT_ADDED, "D"), (EVENT_CHANGED, "C"), (EVENT_REMOVED, "B")]
+    changed = next(e for e in events if e["type"] == EVENT_CHANGED)
+    assert changed["changes"] == {"center": ("울산", "아산")}
+    assert summarize(events) == (1, 1, 1)
+
+
+def test_numeric_representation_is_not_a_change():
+    previous = index_cars([car("A", "36000000.0")])
+    current = index_cars([car("A", 36000000)])
+    assert diff_index(previous, current) == []
+
+
+def test_incomplete_snapshot_reports_no_removals_and_keeps_previous():
+    diff = InventoryDiff()
+    diff.update("AX05", [car("A"), car("B")])
+    events = diff.update_index("AX05", index_cars([car("A"), car("C")]), complete=False)
+    assert types(events) == [(EVENT_ADDED, "C")]
+    assert sorted(diff.snapshots["AX05"]) == ["A", "B", "C"]
+
+    # 다음 전체 조회에서 실제로 빠진 차량만 출고
+    events = diff.update("AX05", [car("A"), car("C")])
+    assert types(events) == [(EVENT_REMOVED, "B")]
+
+
+def test_update_treats_truncated_page_as_incomplete():
+    diff = InventoryDiff()
+    diff.update("AX05", [car("A"), car("B")], total_count=2)
+    events = diff.update("AX05", [car("A")], total_count=2)
+    assert events == []
+    assert diff.count("AX05") == 2
+
+
+def test_first_update_reports_everything_as_added():
+    # 호출한 쪽은 키가 없던 첫 갱신을 기준 스냅샷으로 취급해야 함 (monitor.py, run_search.py)
+    diff = InventoryDiff()
+    assert "AX05" not in diff.snapshots
+    events = diff.update("AX05", [car("A"), car("B")])
+    assert summarize(events) == (2, 0, 0)
+    assert diff.update("AX05", [car("A"), car("B")]) == []
+
+
+def test_failed_regions_make_sweep_incomplete():
+    from run_search import index_results
+
+    results = {"서울": {"서울특별시": [car("A")]}}
+    assert index_results(results, [])[1] is True
+    assert index_results(results, [("부산", None)])[1] is False
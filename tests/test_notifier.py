@@ -0,0 +1,93 @@
+import time
+
+from notifier import Notifier, event_key
+
+
+def event(number, kind="added", **extra):
+    return dict(type=kind, carProductionNumber=number, car={}, **extra)
+
+
+class RecordingSink:
+    """fail_times 번 실패한 뒤 성공하는 알림 대상"""
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.calls = 0
+        self.delivered = []
+
+    def __call__(self, events):
+        self.calls += 1
+        if self.calls <= self.fail_times:
+            raise RuntimeError("down")
+        self.delivered.extend(events)
+
+
+def make(sink, **kwargs):
+    options = dict(batch_window=0.01, retry_delay=0.001, max_retries=2, workers=1)
+    options.update(kwargs)
+    return Notifier([sink], **options)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_event_key_distinguishes_changes_and_rule():
+    assert event_key(event("A")) == event_key(event("A"))
+    assert event_key(event("A", rule="r1")) != event_key(event("A", rule="r2"))
+    changed = event("A", "changed", changes={"price": (1, 2)})
+    assert event_key(changed) != event_key(event("A", "changed", changes={"price": (2, 3)}))
+
+
+def test_duplicate_is_sent_once():
+    sink = RecordingSink()
+    notifier = make(sink).start()
+    assert notifier.publish([event("A"), event("B")]) == 2
+    assert notifier.publish([event("A")]) == 0
+    notifier.stop()
+    assert sorted(e["carProductionNumber"] for e in sink.delivered) == ["A", "B"]
+    assert notifier.stats["duplicate"] == 1
+    assert notifier.stats["published"] == 2
+    assert notifier.stats["delivered"] == 2
+
+
+def test_retry_then_deliver():
+    sink = RecordingSink(fail_times=2)
+    notifier = make(sink).start()
+    notifier.publish([event("A")])
+    notifier.stop()
+    assert sink.calls == 3
+    assert [e["carProductionNumber"] for e in sink.delivered] == ["A"]
+    assert notifier.stats["failed"] == 0
+
+
+def test_failed_delivery_can_be_sent_again():
+    sink = RecordingSink(fail_times=3)  # max_retries=2 → 첫 알림은 3번 모두 실패
+    notifier = make(sink).start()
+    notifier.publish([event("A")])
+    assert wait_until(lambda: notifier.stats["failed"] == 1)
+
+    # 실패한 알림은 dedup_ttl 안이라도 다시 보낼 수 있어야 함
+    assert notifier.publish([event("A")]) == 1
+    notifier.stop()
+    assert [e["carProductionNumber"] for e in sink.delivered] == ["A"]
+
+
+def test_dropped_event_is_not_remembered():
+    notifier = make(RecordingSink(), max_queue=1)  # 시작하지 않아 큐가 비워지지 않음
+    assert notifier.publish([event("A"), event("B")]) == 1
+    assert notifier.stats["dropped"] == 1
+    notifier.queue.get_nowait()
+    assert notifier.publish([event("B")]) == 1
+
+
+def test_extra_fields_are_attached_and_part_of_key():
+    sink = RecordingSink()
+    notifier = make(sink).start()
+    notifier.publish([event("A")], rule="싼 차")
+    notifier.publish([event("A")], rule="흰색")
+    notifier.stop()
+    assert sorted(e["rule"] for e in sink.delivered) == ["싼 차", "흰색"]
@@ -0,0 +1,115 @@
+import pytest
+
+import query_cache
+from query_cache import QueryCache, covers, split_params
+
+SCOPE = "https://example.invalid/R0003"
+
+
+class NoInfluence:
+    """param_influence.json 과 무관하게 파라미터를 그대로 키로 사용"""
+
+    def canonical(self, params):
+        return params
+
+
+@pytest.fixture(autouse=True)
+def no_influence(monkeypatch):
+    monkeypatch.setattr(query_cache, "get_param_influence", lambda: NoInfluence())
+
+
+def params(color="", center="", page=1, size=3, **extra):
+    return dict(carCode="AX05", deliveryAreaCode="B", exteriorColorCode=color,
+                deliveryCenterCode=center, pageNo=page, pageSize=size, **extra)
+
+
+def car(number, color, center):
+    return {"carProductionNumber": number, "exteriorColorCode": color, "deliveryCenterCode": center}
+
+
+CARS = [car("1", "WW", "C1"), car("2", "BK", "C1"), car("3", "WW", "C2"), car("4", "WW", "C1")]
+
+
+def store_pages(cache, cars, size=3, **filters):
+    for page in range(1, (len(cars) + size - 1) // size + 1):
+        chunk = cars[(page - 1) * size:page * size]
+        cache.store(SCOPE, params(page=page, size=size, **filters),
+                    {"data": {"totalCount": len(cars), "discountsearchcars": chunk}})
+
+
+def numbers(response):
+    return [c["carProductionNumber"] for c in response["data"]["discountsearchcars"]]
+
+
+def test_split_params_separates_filters_and_paging():
+    base, filters, page, size = split_params(params(color="WW", page=2))
+    assert filters == ("WW", "")
+    assert (page, size) == (2, 3)
+    assert "pageNo" not in base and "exteriorColorCode" not in base
+
+
+def test_covers():
+    assert covers(("", ""), ("WW", "C1"))
+    assert covers(("WW", ""), ("WW", "C1"))
+    assert not covers(("WW", ""), ("BK", ""))
+    assert not covers(("WW", "C1"), ("WW", ""))
+
+
+def test_exact_hit_returns_same_page():
+    cache = QueryCache()
+    store_pages(cache, CARS)
+    assert numbers(cache.lookup(SCOPE, params(page=2))) == ["4"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_narrow_query_is_filtered_from_complete_broad_result():
+    cache = QueryCache()
+    store_pages(cache, CARS)
+    response = cache.lookup(SCOPE, params(color="WW", center="C1"))
+    assert numbers(response) == ["1", "4"]
+    assert response["data"]["totalCount"] == 2
+    assert cache.stats()["local_hits"] == 1
+
+    # 좁힌 결과도 요청한 페이지 크기로 나눠서 응답
+    response = cache.lookup(SCOPE, params(color="WW", page=2, size=2))
+    assert numbers(response) == ["4"] and response["data"]["totalCount"] == 3
+
+
+def test_incomplete_broad_result_is_not_used():
+    cache = QueryCache()
+    cache.store(SCOPE, params(), {"data": {"totalCount": 4, "discountsearchcars": CARS[:3]}})
+    assert cache.lookup(SCOPE, params(color="WW")) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_narrow_result_does_not_answer_broader_or_other_query():
+    cache = QueryCache()
+    store_pages(cache, [c for c in CARS if c["exteriorColorCode"] == "WW"], color="WW")
+    assert cache.lookup(SCOPE, params()) is None
+    assert cache.lookup(SCOPE, params(color="BK")) is None
+    assert numbers(cache.lookup(SCOPE, params(color="WW", center="C2"))) == ["3"]
+
+
+def test_other_base_params_do_not_match():
+    cache = QueryCache()
+    store_pages(cache, CARS)
+    assert cache.lookup(SCOPE, params(color="WW", maxSalePrice=1000)) is None
+    assert cache.lookup(SCOPE + "/other", params(color="WW")) is None
+
+
+def test_expired_results_are_ignored(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: clock[0])
+    cache = QueryCache(ttl=30)
+    store_pages(cache, CARS)
+    clock[0] += 31
+    assert cache.lookup(SCOPE, params()) is None
+    assert cache.lookup(SCOPE, params(color="WW")) is None
+
+
+def test_least_recently_used_base_is_evicted():
+    cache = QueryCache(max_queries=1)
+    store_pages(cache, CARS)
+    cache.store(SCOPE, params(deliveryLocalAreaCode="B1"),
+                {"data": {"totalCount": 0, "discountsearchcars": []}})
+    assert cache.lookup(SCOPE, params()) is None
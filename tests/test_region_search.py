@@ -0,0 +1,96 @@
+import pytest
+
+import region_search
+from region_index import RegionIndex
+from region_search import RegionSearchIndex, choseong, edit_distance
+
+REGIONS = {
+    "강원": ("G", [("강릉시", "GA"), ("고성군", "GB")]),
+    "경남": ("K", [("고성군", "KA"), ("창원시", "KB")]),
+    "경북": ("N", [("포항시", "NL"), ("경주시", "NK")]),
+    "경기": ("B", [("광주시", "BA"), ("수원시", "BB")]),
+    "광주": ("L", [("광주광역시", "LA")]),
+    "세종": ("S", [("세종특별자치시", "SA")]),
+    "충남": ("C", [("세종특별자치시", "CS"), ("공주시", "CA")]),
+}
+
+
+@pytest.fixture
+def search():
+    index = RegionIndex()
+    for sido, (code, siguns) in REGIONS.items():
+        index.add_sido(sido, code)
+        for sigun, sigun_code in siguns:
+            index.add_sigun(sido, sigun, sigun_code)
+    return RegionSearchIndex(index)
+
+
+def ranked(search, query):
+    return [(r['sido'], r['sigun'], r['score']) for r in search.suggest(query)]
+
+
+def test_helpers():
+    assert choseong("포항시") == "ㅍㅎㅅ"
+    assert edit_distance("abc", "abd", 2) == 1
+    assert edit_distance("abc", "xyz", 1) > 1
+
+
+@pytest.mark.parametrize("query, score", [
+    ("포항시", 100),   # 이름 일치
+    ("포항", 100),     # 어간 일치
+    ("포하", 90),      # 입력 중인 글자
+    ("ㅍㅎ", 85),      # 초성 앞부분
+    ("ㅎㅅ", 75),      # 초성 중간
+    ("포항시청", 70),  # 입력에 이름이 포함됨
+    ("표항시", 60),    # 오타 1개
+])
+def test_match_kinds(search, query, score):
+    assert ranked(search, query)[0] == ("경북", "포항시", score)
+
+
+def test_exact_match_does_not_pull_in_weaker_matches(search):
+    assert ranked(search, "경주") == [("경북", "경주시", 100)]
+    assert ranked(search, "없는지역이름") == []
+    assert ranked(search, "") == []
+
+
+def test_ambiguous_name_ties(search):
+    assert ranked(search, "고성") == [("강원", "고성군", 100), ("경남", "고성군", 100)]
+
+
+@pytest.mark.parametrize("query", ["강원 고성", "강원고성", "강원도 고성군"])
+def test_sido_qualifier_prefers_that_sido(search, query):
+    results = ranked(search, query)
+    assert results[0] == ("강원", "고성군", 105)
+    assert results[1][:2] == ("경남", "고성군") and results[1][2] < 105
+
+
+def test_sido_name_alone_prefers_its_own_sigun(search):
+    assert ranked(search, "광주")[:2] == [("광주", "광주광역시", 105), ("경기", "광주시", 100)]
+    assert ranked(search, "세종")[:2] == [("세종", "세종특별자치시", 105), ("충남", "세종특별자치시", 100)]
+    assert ranked(search, "경기 수원")[0] == ("경기", "수원시", 105)
+
+
+def test_sido_without_matching_sigun_finds_nothing(search):
+    assert ranked(search, "경남") == []
+
+
+def test_limit_and_best(search):
+    assert len(search.suggest("고성", 1)) == 1
+    assert search.best("ㅍㅎ")['sigun_code'] == "NL"
+    assert search.best("없는지역이름") is None
+
+
+def test_rank_cache_is_per_instance_and_bounded(search, monkeypatch):
+    monkeypatch.setattr(region_search, "RANK_CACHE_SIZE", 3)
+    other = RegionSearchIndex(search.index)
+    # 시도명으로 시작하지 않는 입력 (시도 한정어 확인 중 나머지 입력도 캐시되므로)
+    for query in ("포항", "고성", "수원", "창원"):
+        search.suggest(query)
+    assert list(search._rank_cache) == ["고성", "수원", "창원"]
+    assert not other._rank_cache
+
+    # 최근 사용한 입력은 뒤로 옮겨져 밀려나지 않음
+    search.suggest("고성")
+    search.suggest("공주")
+    assert list(search._rank_cache) == ["창원", "고성", "공주"]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+스트리밍 상위 k개 선택
+
+차량을 리스트로 모아 정렬하지 않고, 크기 k의 힙만 유지하면서 페이지/스윕
+스트림을 한 대씩 소비합니다. (n대 기준 O(n log k) 시간, O(k) 메모리)
+
+정렬 기준:
+- discount_rate: 할인율 높은 순
+- discount: 할인 금액 큰 순
+- price: 최종 가격 낮은 순
+
+Car, API 응답 dict, 저장 파일 레코드(SnapshotReader) 모두 받을 수 있습니다.
+
+Examples:
+    >>> best = TopK(3, key="discount_rate")
+    >>> for model in CarModel:
+    ...     best.extend(checker.iter_cars(model), tag="리퍼브")
+    >>> for car, tag in best.entries():
+    ...     print(tag, car.car_name, car.discount_rate)
+"""
+
+import heapq
+import itertools
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from car import Car, parse_amount, parse_rate
+
+
+# 정렬 기준 이름 → (Car 속성 / 레코드 키, API 키, 변환 함수, 큰 값이 좋은지)
+KEYS = {
+    "discount_rate": ("discount_rate", "discountRate", parse_rate, True),
+    "discount": ("discount", "discountPrice", parse_amount, True),
+    "price": ("price", "finalAmount", parse_amount, False),
+}
+
+
+def key_getter(key: str) -> Callable[[Any], Any]:
+    """정렬 기준 이름으로 차량에서 값을 읽는 함수를 만듭니다."""
+    if key not in KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준: {key} (가능: {', '.join(KEYS)})")
+    name, api_key, parse, _ = KEYS[key]
+
+    def get(car: Any) -> Any:
+        if isinstance(car, Car):
+            return getattr(car, name)
+        value = car.get(name)
+        if value is None or value == "":
+            value = car.get(api_key)
+        return parse(value)
+
+    return get
+
+
+class TopK:
+    """
+    크기 k의 힙으로 상위 차량을 유지하는 스트림 집계기
+
+    값이 같으면 먼저 들어온 차량이 앞섭니다. 값이 없는 차량은 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        k: int = 3,
+        key: Union[str, Callable[[Any], Any]] = "discount_rate",
+        largest: Optional[bool] = None
+    ):
+        """
+        Args:
+            k: 유지할 차량 수
+            key: "discount_rate", "discount", "price" 또는 값 함수
+            largest: 큰 값이 좋은지 (없으면 정렬 기준의 기본값, 함수면 True)
+        """
+        self.k = k
+        if callable(key):
+            self.get = key
+            self.largest = True if largest is None else largest
+        else:
+            self.get = key_getter(key)
+            self.largest = KEYS[key][3] if largest is None else largest
+        self.heap: List[Tuple[Any, int, Any, Any]] = []
+        self.seen = 0
+        self._order = itertools.count()
+
+    def push(self, car: Any, tag: Any = None) -> bool:
+        """
+        차량 1대를 넣습니다.
+
+        Args:
+            car: 차량
+            tag: 결과와 함께 돌려줄 값 (기획전 이름 등)
+
+        Returns:
+            현재 상위 k개에 들어갔으면 True
+        """
+        self.seen += 1
+        value = self.get(car)
+        if value is None or self.k <= 0:
+            return False
+        # 힙의 맨 앞이 가장 약한 항목이 되도록 (값, 늦게 들어온 순서) 로 비교
+        rank = value if self.largest else -value
+        item = (rank, -next(self._order), car, tag)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+            return True
+        if item[:2] <= self.heap[0][:2]:
+            return False
+        heapq.heapreplace(self.heap, item)
+        return True
+
+    def extend(self, cars: Iterable[Any], tag: Any = None) -> "TopK":
+        """차량 스트림을 소비합니다. (제너레이터를 그대로 넘기면 됨)"""
+        for car in cars:
+            self.push(car, tag)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def entries(self) -> List[Tuple[Any, Any]]:
+        """좋은 순서대로 (차량, tag) 리스트"""
+        ordered = sorted(self.heap, key=lambda item: item[:2], reverse=True)
+        return [(car, tag) for _, _, car, tag in ordered]
+
+    def result(self) -> List[Any]:
+        """좋은 순서대로 차량 리스트"""
+        return [car for car, _ in self.entries()]
+
+
+def top_k(
+    cars: Iterable[Any],
+    k: int = 3,
+    key: Union[str, Callable[[Any], Any]] = "discount_rate",
+    largest: Optional[bool] = None
+) -> List[Any]:
+    """
+    차량 스트림에서 상위 k대를 고릅니다.
+
+    Examples:
+        >>> top_k(checker.iter_cars(model), 5, key="price")   # 가장 싼 5대
+    """
+    return TopK(k, key, largest).extend(cars).result()
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+캐스퍼 재고 감시 데몬
+
+여러 감시 규칙(모델, 기획전, 지역, 색상, 출고센터, 가격 상한)을 한 프로세스에서
+처리합니다. 규칙들을 덮는 최소한의 API 조회 집합을 계산하여 주기마다 한 번씩만
+조회하고, 결과를 그 조회에 의존하는 모든 규칙에 전달합니다.
+
+규칙 파일 예시 (watch_rules.json):
+    [
+        {"name": "포항 화이트", "model": "AX05", "sido": "경북", "sigun": "포항시",
+         "color": "SAW", "max_price": 36000000},
+        {"name": "특별기획전 캐스퍼", "model": "AX06", "exhibition": "E20260133"},
+        {"name": "인스퍼레이션", "model": "AX05", "trim": "인스퍼레이션",
+         "center_name": "울산출고센터"}
+    ]
+
+색상/트림/출고센터는 코드(color, center) 또는 이름(color_name, trim, center_name)으로
+지정할 수 있습니다.
+"""
+
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Any, Optional, Tuple
+
+from casper_checker import CasperChecker, CarModel
+from special_checker import SpecialChecker, SpecialCarModel
+from inventory_diff import InventoryDiff, index_cars, summarize, print_events
+from monitor_scheduler import AdaptiveInterval, StaggeredScheduler, describe_interval
+from rule_index import RuleIndex
+from notifier import Notifier, WebhookSink
+from monitor_state import MonitorState
+from car import parse_amount
+from sweep_planner import sigun_queries_needed, get_latency_history, LATENCY_SAVE_INTERVAL
+from request_payload import build_params
+
+
+# 기획전별 체커/모델/기본 배송지 (페이지 크기는 request_payload.EXHIBITION_DEFAULTS)
+EXHIBITIONS = {
+    "R0003": {
+        "checker": CasperChecker,
+        "models": CarModel,
+        "default_region": ("J", "J1"),
+    },
+    SpecialChecker.EXHIBITION_NO: {
+        "checker": SpecialChecker,
+        "models": SpecialCarModel,
+        "default_region": ("H", "H0"),
+    },
+}
+
+
+def find_model(exhibition: str, car_code: str):
+    """기획전과 차종 코드로 모델 enum을 찾습니다."""
+    for model in EXHIBITIONS[exhibition]["models"]:
+        if model.value["carCode"] == car_code:
+            return model
+    raise ValueError(f"알 수 없는 모델 코드: {car_code} (기획전 {exhibition})")
+
+
+def build_query_params(
+    exhibition: str,
+    model,
+    area_code: str,
+    local_code: str,
+    color: str = "",
+    center: str = ""
+) -> Dict[str, Any]:
+    """조회 파라미터를 생성합니다."""
+    return build_params(
+        exhibition, model,
+        deliveryAreaCode=area_code,
+        deliveryLocalAreaCode=local_code,
+        exteriorColorCode=color,
+        deliveryCenterCode=center
+    )
+
+
+class WatchRule:
+    """감시 규칙 1개"""
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        exhibition: str = "R0003",
+        sido: Optional[str] = None,
+        sigun: Optional[str] = None,
+        color: Optional[str] = None,
+        center: Optional[str] = None,
+        max_price: Optional[int] = None,
+        color_name: Optional[str] = None,
+        trim: Optional[str] = None,
+        center_name: Optional[str] = None
+    ):
+        if exhibition not in EXHIBITIONS:
+            raise ValueError(f"알 수 없는 기획전: {exhibition}")
+        self.name = name
+        self.model = find_model(exhibition, model)
+        self.exhibition = exhibition
+        self.sido = sido
+        self.sigun = sigun
+        self.color = color or None
+        self.center = center or None
+        self.max_price = int(max_price) if max_price else None
+        self.color_name = color_name or None
+        self.trim = trim or None
+        self.center_name = center_name or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WatchRule":
+        """딕셔너리(규칙 파일 항목)로부터 규칙을 생성합니다."""
+        return cls(
+            name=data.get("name") or data["model"],
+            model=data["model"],
+            exhibition=data.get("exhibition", "R0003"),
+            sido=data.get("sido"),
+            sigun=data.get("sigun"),
+            color=data.get("color"),
+            center=data.get("center"),
+            max_price=data.get("max_price"),
+            color_name=data.get("color_name"),
+            trim=data.get("trim"),
+            center_name=data.get("center_name"),
+        )
+
+    def region_codes(self) -> Tuple[str, str]:
+        """규칙의 (deliveryAreaCode, deliveryLocalAreaCode)"""
+        if not self.sido:
+            return EXHIBITIONS[self.exhibition]["default_region"]
+        from region_helper import get_codes
+        return get_codes(self.sido, self.sigun)
+
+    def query_key(self) -> Tuple[str, str, str, str]:
+        """
+        이 규칙이 의존하는 조회 키.
+
+        색상/출고센터/가격은 응답에서 직접 걸러낼 수 있으므로 키에 포함하지 않습니다.
+        시군구가 차량 집합에 영향이 없다고 분석되었으면(param_profiler) 같은 시도의
+        규칙은 시도 대표 코드 하나로 묶습니다.
+        """
+        area_code, local_code = self.region_codes()
+        if self.sigun and not sigun_queries_needed(self.exhibition):
+            from region_helper import get_codes
+            area_code, local_code = get_codes(self.sido)
+        return (self.exhibition, self.model.value["carCode"], area_code, local_code)
+
+    def filter_key(self) -> Tuple[str, str]:
+        """서버측 필터로 다시 조회해야 할 때 사용할 (색상, 출고센터)"""
+        return (self.color or "", self.center or "")
+
+    def constraints(self) -> Dict[str, str]:
+        """응답에서 걸러낼 필드 조건 {API 필드명: 값} (RuleIndex 참고)"""
+        fields = {
+            "exteriorColorCode": self.color,
+            "exteriorColorName": self.color_name,
+            "carTrimName": self.trim,
+            "deliveryCenterCode": self.center,
+            "deliveryCenterName": self.center_name,
+        }
+        return {field: value for field, value in fields.items() if value}
+
+    def matches(self, car: Dict[str, Any]) -> bool:
+        """차량이 규칙 조건을 만족하는지 확인합니다."""
+        for field, value in self.constraints().items():
+            if car.get(field) != value:
+                return False
+        if self.max_price is not None:
+            price = parse_amount(car.get("finalAmount"))
+            if price is None or price > self.max_price:
+                return False
+        return True
+
+    def describe(self) -> str:
+        parts = [self.model.value["name"], self.exhibition]
+        if self.sido:
+            parts.append(f"{self.sido} {self.sigun or ''}".strip())
+        if self.color or self.color_name:
+            parts.append(f"색상 {self.color or self.color_name}")
+        if self.trim:
+            parts.append(f"트림 {self.trim}")
+        if self.center or self.center_name:
+            parts.append(f"센터 {self.center or self.center_name}")
+        if self.max_price:
+            parts.append(f"≤{self.max_price:,}원")
+        return " / ".join(parts)
+
+
+class WatchQuery:
+    """여러 규칙이 공유하는 API 조회 1개"""
+
+    def __init__(self, key: Tuple[str, str, str, str], model):
+        self.key = key
+        self.model = model
+        self.rules: List[WatchRule] = []
+        self._index: Optional[RuleIndex] = None
+
+    @property
+    def index(self) -> RuleIndex:
+        """규칙 매칭 색인 (규칙 추가 후 처음 사용할 때 컴파일)"""
+        if self._index is None or len(self._index) != len(self.rules):
+            self._index = RuleIndex(self.rules)
+        return self._index
+
+    @property
+    def exhibition(self) -> str:
+        return self.key[0]
+
+    def params(self, color: str = "", center: str = "") -> Dict[str, Any]:
+        _, _, area_code, local_code = self.key
+        return build_query_params(self.exhibition, self.model, area_code, local_code, color, center)
+
+
+class WatchDaemon:
+    """감시 규칙을 모아 최소 조회로 처리하는 데몬"""
+
+    def __init__(
+        self,
+        rules: List[WatchRule],
+        notifier: Optional[Notifier] = None,
+        state: Optional[MonitorState] = None
+    ):
+        self.rules = rules
+        self.notifier = notifier
+        self.state = state
+        self.checkers = {}
+        self.queries = self.plan_queries(rules)
+        self.diff = InventoryDiff()
+        if state:
+            state.restore(self.diff)
+        self.request_count = 0
+        self.tick_count = 0
+
+    @staticmethod
+    def plan_queries(rules: List[WatchRule]) -> Dict[Tuple, WatchQuery]:
+        """규칙들을 덮는 최소 조회 집합을 계산합니다."""
+        queries: Dict[Tuple, WatchQuery] = {}
+        for rule in rules:
+            try:
+                key = rule.query_key()
+            except ValueError as e:
+                print(f"⚠️  규칙 '{rule.name}' 무시: {e}")
+                continue
+            if key not in queries:
+                queries[key] = WatchQuery(key, rule.model)
+            queries[key].rules.append(rule)
+        return queries
+
+    def _checker(self, exhibition: str):
+        if exhibition not in self.checkers:
+            checker = EXHIBITIONS[exhibition]["checker"]()
+            checker.query_cache = None  # 필터는 규칙 색인으로 직접 처리하고, 매 주기 새 결과 사용
+            self.checkers[exhibition] = checker
+        return self.checkers[exhibition]
+
+    def _fetch(self, query: WatchQuery, color: str = "", center: str = ""):
+        self.request_count += 1
+        return self._checker(query.exhibition).get_count_and_cars(
+            custom_params=query.params(color, center)
+        )
+
+    def poll_query(self, query: WatchQuery) -> Dict[str, Tuple[List[Dict], bool]]:
+        """
+        조회 1건을 실행하고 규칙별 결과를 반환합니다.
+
+        응답이 페이지 크기에 걸려 잘린 경우, 좁은 필터를 가진 규칙은
+        (색상, 출고센터) 조합별로 서버측 필터 조회를 한 번씩 더 보냅니다.
+
+        Returns:
+            {규칙명: (일치 차량 리스트, 전체 수신 여부)}. 조회 실패한 규칙은 제외
+        """
+        total, cars = self._fetch(query)
+        if total is None:
+            return {}
+
+        results = {}
+        truncated = total > len(cars)
+        refetched = {}
+        assigned = query.index.assign(cars)
+
+        for rule_id, rule in enumerate(query.rules):
+            filters = rule.filter_key()
+            if not truncated or filters == ("", ""):
+                results[rule.name] = (assigned[rule_id], not truncated)
+                continue
+
+            if filters not in refetched:
+                refetched[filters] = self._fetch(query, *filters)
+            sub_total, sub_cars = refetched[filters]
+            if sub_total is None:
+                continue
+            matched = [car for car in sub_cars if rule.matches(car)]
+            results[rule.name] = (matched, sub_total <= len(sub_cars))
+
+        return results
+
+    def process_query(self, query: WatchQuery) -> int:
+        """
+        조회 1건을 실행하고 규칙별 변동을 출력합니다.
+
+        Returns:
+            변동 이벤트 개수
+        """
+        total_events = 0
+        for rule_name, (cars, complete) in self.poll_query(query).items():
+            known = rule_name in self.diff.snapshots
+            before = self.diff.count(rule_name)
+            events = self.diff.update_index(rule_name, index_cars(cars), complete)
+            if events:
+                total_events += len(events)
+                added, removed, changed = summarize(events)
+                print(f"🔔 [{rule_name}] {before}대 → {self.diff.count(rule_name)}대 "
+                      f"(입고 {added} · 출고 {removed} · 변경 {changed})")
+                print_events(events, indent="  └─ ", limit=3)
+                # 이전 스냅샷이 없던 규칙의 입고 이벤트는 기존 재고이므로 알리지 않음
+                if self.notifier and known:
+                    self.notifier.publish(events, rule=rule_name)
+        return total_events
+
+    def tick(self, stagger: Optional[StaggeredScheduler] = None) -> int:
+        """
+        모든 조회를 한 번씩 실행합니다.
+
+        Args:
+            stagger: 있으면 조회별 예정 시각까지 기다렸다가 조회 (주기 안에 분산)
+
+        Returns:
+            변동 이벤트 총 개수
+        """
+        self.tick_count += 1
+        total_events = 0
+        for query in list(self.queries.values()):
+            if stagger:
+                key, wait = stagger.next()
+                time.sleep(wait)
+                query = self.queries[key]
+            total_events += self.process_query(query)
+            if stagger:
+                stagger.mark_done(query.key)
+        if self.state:
+            self.state.save(self.diff)
+        get_latency_history().save(LATENCY_SAVE_INTERVAL)
+        return total_events
+
+    def print_plan(self):
+        """규칙과 조회 계획을 출력합니다."""
+        print(f"📋 감시 규칙 {len(self.rules)}개 → 고유 조회 {len(self.queries)}개")
+        print("-"*70)
+        for key, query in self.queries.items():
+            print(f"  {' / '.join(key)}  ← 규칙 {len(query.rules)}개")
+            for rule in query.rules:
+                print(f"     • {rule.name}: {rule.describe()}")
+
+    def run(
+        self,
+        interval: int = 60,
+        adaptive: bool = False,
+        once: bool = False,
+        staggered: bool = True
+    ):
+        """
+        감시 루프를 실행합니다.
+
+        Args:
+            interval: 확인 주기 (초)
+            adaptive: 적응형 주기 사용 여부
+            once: 한 번만 확인하고 종료
+            staggered: 조회들을 주기 안에 고르게 나눠 보낼지 여부
+        """
+        scheduler = None
+        if adaptive:
+            scheduler = AdaptiveInterval(interval, requests_per_tick=len(self.queries))
+
+        stagger = None
+        if staggered and not once and len(self.queries) > 1:
+            stagger = StaggeredScheduler(self.queries.keys(), interval)
+
+        check_count = 0
+        try:
+            # 최근에 확인한 상태라면 남은 주기만큼 기다린 뒤 시작
+            if self.state and not once:
+                wait = self.state.remaining_wait(interval)
+                if wait > 0:
+                    print(f"⏳ 마지막 확인 후 주기가 지나지 않아 {describe_interval(wait)} 후 시작합니다...")
+                    time.sleep(wait)
+
+            while True:
+                check_count += 1
+                sent_before = self.request_count
+                print(f"\n{'='*70}")
+                print(f"[확인 #{check_count}] {time.strftime('%Y-%m-%d %H:%M:%S')}")
+                print(f"{'='*70}")
+
+                events = self.tick(stagger)
+                sent = self.request_count - sent_before
+                if not events:
+                    print("📊 변동 없음")
+                print(f"(요청 {sent}건)")
+
+                if once:
+                    break
+
+                wait = interval
+                if scheduler:
+                    scheduler.record_requests(sent)
+                    wait = scheduler.next_interval(events > 0 and check_count > 1)
+                if stagger:
+                    # 대기는 다음 주기의 조회별 예정 시각에 맞춰 tick() 안에서 처리
+                    stagger.set_interval(wait)
+                else:
+                    print(f"\n⏳ {describe_interval(wait)} 후 다시 확인합니다...")
+                    time.sleep(wait)
+
+        except KeyboardInterrupt:
+            print("\n\n✋ 감시를 종료합니다.")
+            print(f"총 {check_count}번 확인, 요청 {self.request_count}건")
+        finally:
+            get_latency_history().save()
+            if self.notifier:
+                self.notifier.stop()
+
+
+def load_rules(filename: str) -> List[WatchRule]:
+    """규칙 파일(JSON 리스트)을 로드합니다."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    rules = []
+    names = set()
+    for i, item in enumerate(data, 1):
+        try:
+            rule = WatchRule.from_dict(item)
+        except (KeyError, ValueError) as e:
+            print(f"⚠️  {i}번째 규칙 무시: {e}")
+            continue
+        # 규칙명은 변동 추적 키로 쓰이므로 중복되지 않게 함
+        if rule.name in names:
+            rule.name = f"{rule.name}#{i}"
+        names.add(rule.name)
+        rules.append(rule)
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='캐스퍼 재고 감시 데몬')
+    parser.add_argument('rules', nargs='?', default='watch_rules.json', help='감시 규칙 파일 (JSON)')
+    parser.add_argument('--interval', '-i', type=int, default=60, help='확인 주기 (초)')
+    parser.add_argument('--adaptive', action='store_true', help='적응형 주기 사용')
+    parser.add_argument('--once', action='store_true', help='한 번만 확인하고 종료')
+    parser.add_argument('--plan', action='store_true', help='조회 계획만 출력')
+    parser.add_argument('--state', default='watch_state.json', help='감시 상태 파일 (재시작 시 이어서 비교)')
+    parser.add_argument('--burst', action='store_true', help='주기 시작 시 모든 조회를 연달아 보냄 (분산 조회 끔)')
+    parser.add_argument('--webhook', action='append', default=[], help='변동 알림을 보낼 웹훅 URL (여러 번 지정 가능)')
+    args = parser.parse_args()
+
+    try:
+        rules = load_rules(args.rules)
+    except (OSError, ValueError) as e:
+        print(f"❌ 규칙 파일 로드 실패: {e}")
+        sys.exit(1)
+
+    if not rules:
+        print("❌ 유효한 감시 규칙이 없습니다.")
+        sys.exit(1)
+
+    notifier = None
+    if args.webhook:
+        notifier = Notifier([WebhookSink(url) for url in args.webhook]).start()
+
+    state = MonitorState(args.state) if args.state else None
+    if state:
+        print(f"💾 {state.describe()}")
+
+    daemon = WatchDaemon(rules, notifier=notifier, state=state)
+    daemon.print_plan()
+
+    if not args.plan:
+        daemon.run(
+            interval=args.interval,
+            adaptive=args.adaptive,
+            once=args.once,
+            staggered=not args.burst
+        )
+
+
+if __name__ == "__main__":
+    main()